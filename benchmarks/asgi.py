@@ -0,0 +1,103 @@
+"""
+Requests per second of the ASGI interface against the Flask one, on a route waiting 10ms on a downstream call and on
+a route returning right away. Requests are sent in process: Flask through its test client from a thread per
+in-flight request, ASGI by calling the application with a local receive/send pair.
+
+    python -m benchmarks.asgi
+"""
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from time import perf_counter
+from restless.interfaces.asgi import AsgiHandler
+from restless.interfaces.flask_app import FlaskHandler
+
+LATENCY = 0.01
+REQUESTS = 2000
+
+
+def make_flask() -> FlaskHandler:
+    handler = FlaskHandler('Benchmark', '', '0.1')
+
+    @handler.handle('get', '/io')
+    def io() -> {200: dict}:
+        time.sleep(LATENCY)
+        return {'status': 'ok'}
+
+    @handler.handle('get', '/cpu')
+    def cpu() -> {200: dict}:
+        return {'status': 'ok'}
+
+    return handler
+
+
+def make_asgi() -> AsgiHandler:
+    handler = AsgiHandler('Benchmark', '', '0.1')
+
+    @handler.handle('get', '/io')
+    async def io() -> {200: dict}:
+        await asyncio.sleep(LATENCY)
+        return {'status': 'ok'}
+
+    @handler.handle('get', '/cpu')
+    async def cpu() -> {200: dict}:
+        return {'status': 'ok'}
+
+    return handler
+
+
+def bench_flask(handler: FlaskHandler, path: str, concurrency: int) -> float:
+    app = handler.app
+
+    def get(_):
+        out = app.test_client().get(path)
+        assert out.status_code == 200, out.data
+
+    start = perf_counter()
+
+    with ThreadPoolExecutor(concurrency) as pool:
+        list(pool.map(get, range(REQUESTS)))
+
+    return REQUESTS / (perf_counter() - start)
+
+
+async def asgi_get(app, path: str):
+    scope = {'type': 'http', 'method': 'GET', 'path': path, 'query_string': b'', 'headers': []}
+    sent = []
+
+    async def receive():
+        return {'type': 'http.request', 'body': b'', 'more_body': False}
+
+    async def send(message):
+        sent.append(message)
+
+    await app(scope, receive, send)
+    assert sent[0]['status'] == 200, sent
+
+
+def bench_asgi(handler: AsgiHandler, path: str, concurrency: int) -> float:
+    async def run():
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def limited():
+            async with semaphore:
+                await asgi_get(handler.app, path)
+
+        await asyncio.gather(*[limited() for _ in range(REQUESTS)])
+
+    start = perf_counter()
+    asyncio.run(run())
+
+    return REQUESTS / (perf_counter() - start)
+
+
+if __name__ == '__main__':
+    flask, asgi = make_flask(), make_asgi()
+
+    for path in ['/io', '/cpu']:
+        for concurrency in [10, 100, 1000]:
+            results = {
+                'flask': bench_flask(flask, path, concurrency),
+                'asgi': bench_asgi(asgi, path, concurrency)
+            }
+            print(f'{path:>4} x{concurrency:<5}: ' + ', '.join(f'{k} {v:.0f} req/s' for k, v in results.items()))
@@ -0,0 +1,49 @@
+"""
+Throughput of the Azure Response on 10KB and 1MB camelCased bodies, against the previous three pass encoding.
+
+    python -m benchmarks.azure
+"""
+import json
+from timeit import repeat
+from azure.functions import HttpResponse
+from restless.interfaces.azure import Response
+from restless.util import UniversalEncoder, snake_to_camel
+
+
+def legacy_response(body: dict) -> HttpResponse:
+    encoded = json.dumps(body, cls=UniversalEncoder)
+    encoded = json.dumps(snake_to_camel(json.loads(encoded)), cls=UniversalEncoder)
+
+    return HttpResponse(encoded.encode('utf-8'), headers={"Content-Type": "application/json"})
+
+
+def make_body(size: int) -> dict:
+    records, total = [], 0
+
+    while total < size:
+        i = len(records)
+        records.append({'record_id': i, 'display_name': f'record {i}', 'is_active': bool(i % 2), 'tag_list': ['a']})
+        total += len(json.dumps(records[-1])) + 2
+
+    return {'total_count': len(records), 'record_list': records}
+
+
+def bench(size: int) -> dict:
+    body = make_body(size)
+    number = max(1, 2 ** 20 // size)
+    results = {}
+
+    for name, function in [
+        ('before', lambda: legacy_response(body)),
+        ('after', lambda: Response(body=body, status_code=200, headers={}, use_camel_case=True)),
+    ]:
+        best = min(repeat(function, number=number, repeat=5)) / number
+        results[name] = size / best / 2 ** 20
+
+    return results
+
+
+if __name__ == '__main__':
+    for size in [10 * 1024, 2 ** 20]:
+        results = bench(size)
+        print(f'{size // 1024:>5}KB: ' + ', '.join(f'{k} {v:.1f}MB/s' for k, v in results.items()))
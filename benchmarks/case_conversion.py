@@ -0,0 +1,64 @@
+"""
+Key case conversion over a deeply nested ~1MB document, against the previous recursive implementation.
+
+    python -m benchmarks.case_conversion
+"""
+import json
+import re
+from timeit import repeat
+from restless.util import camel_to_snake, snake_to_camel
+
+C2S1 = re.compile('(.)([A-Z][a-z]+)')
+C2S2 = re.compile('([a-z0-9])([A-Z])')
+
+
+def recursive_camel_to_snake(obj):
+    if isinstance(obj, (list, set)):
+        return [recursive_camel_to_snake(i) if not isinstance(i, str) else i for i in obj]
+    elif isinstance(obj, dict):
+        return {
+            recursive_camel_to_snake(k): recursive_camel_to_snake(v) if not isinstance(v, str) else v
+            for k, v in obj.items()
+        }
+    elif isinstance(obj, str):
+        return C2S2.sub(r'\1_\2', C2S1.sub(r'\1_\2', obj)).lower()
+
+    return obj
+
+
+def make_document(size: int = 2 ** 20) -> dict:
+    def node(depth: int) -> dict:
+        item = {
+            'itemId': depth,
+            'displayName': f'name {depth}',
+            'createdAt': '2020-01-01T00:00:00',
+            'isActive': True,
+            'tagList': ['alpha', 'beta'],
+            'ownerInfo': {'firstName': 'Ada', 'lastName': 'Lovelace', 'emailAddress': 'ada@example.com'},
+        }
+
+        if depth:
+            item['childNodes'] = [node(depth - 1), node(depth - 1)]
+
+        return item
+
+    document = {'rootNodes': []}
+
+    while len(json.dumps(document)) < size:
+        document['rootNodes'].append(node(6))
+
+    return document
+
+
+if __name__ == '__main__':
+    document = make_document()
+    snake = camel_to_snake(document)
+    print(f'document: {len(json.dumps(document)) / 2 ** 20:.2f}MB')
+
+    for name, function, argument in [
+        ('recursive camel_to_snake', recursive_camel_to_snake, document),
+        ('camel_to_snake', camel_to_snake, document),
+        ('snake_to_camel', snake_to_camel, snake),
+    ]:
+        best = min(repeat(lambda: function(argument), number=5, repeat=3)) / 5
+        print(f'{name:>25}: {best * 1e3:.1f}ms')
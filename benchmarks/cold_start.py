@@ -0,0 +1,124 @@
+"""
+Cold start of a 500 route API with and without the compiled artifact: importing the app (and registering its
+routes, also reported on their own), then serving its first request and its first spec document, each measured in a
+fresh interpreter. Every route returns its own model.
+
+    python -m benchmarks.cold_start
+"""
+import json
+import os
+import subprocess
+import sys
+from tempfile import TemporaryDirectory
+
+ROUTES = 500
+RUNS = 10
+ENV = {**os.environ, 'PYTHONPATH': os.getcwd()}
+
+APP = '''
+from datetime import datetime
+from enum import Enum
+from typing import List
+from restless.interfaces.flask_app import FlaskHandler
+from restless.parameters import BodyParameter, HeaderParameter, PathParameter, QueryParameter
+
+
+class Color(Enum):
+    red = 'red'
+    blue = 'blue'
+
+
+class Item(BodyParameter):
+    name: str
+    tags: List[str] = []
+    created: datetime = None
+
+
+handler = FlaskHandler('Benchmark', '', '0.1', compiled=COMPILED)
+{routes}
+'''
+
+ROUTE = '''
+
+class Item{i}(Item):
+    rank: int = {i}
+
+
+@handler.handle('get', '/resource{i}/<item_id>')
+def endpoint_{i}(
+        item_id: PathParameter[int], color: QueryParameter[Color] = None, limit: QueryParameter[int] = 10,
+        trace: HeaderParameter = ''
+) -> {{200: Item{i}}}:
+    return Item{i}(name=str(item_id))
+'''
+
+MEASURE = '''
+import json, sys
+from time import perf_counter
+from restless import Handler
+
+registering = [0.0]
+handle = Handler.handle
+
+
+def timed_handle(self, *args, **kwargs):
+    register = handle(self, *args, **kwargs)
+
+    def wrapped(f):
+        start = perf_counter()
+        register(f)
+        registering[0] += perf_counter() - start
+        return f
+
+    return wrapped
+
+
+Handler.handle = timed_handle
+start = perf_counter()
+import app
+imported = perf_counter()
+
+client = app.handler.app.test_client()
+out = client.get('/resource1/1', headers={'Trace': 'x'})
+assert out.status_code == 200, out.data
+served = perf_counter()
+
+out = client.get('/spec/swagger.json')
+assert out.status_code == 200, out.data
+spec = perf_counter()
+
+print(json.dumps({
+    'import_ms': (imported - start) * 1e3,
+    'register_ms': registering[0] * 1e3,
+    'first_request_ms': (served - imported) * 1e3,
+    'first_spec_ms': (spec - served) * 1e3
+}))
+'''
+
+
+def measure(directory: str) -> dict:
+    runs = [
+        json.loads(subprocess.run(
+            [sys.executable, '-c', MEASURE], cwd=directory, capture_output=True, text=True, check=True, env=ENV
+        ).stdout)
+        for _ in range(RUNS)
+    ]
+
+    return {key: min(run[key] for run in runs) for key in runs[0]}
+
+
+if __name__ == '__main__':
+    with TemporaryDirectory() as directory:
+        artifact = os.path.join(directory, 'restless.compiled')
+        routes = ''.join(ROUTE.format(i=i) for i in range(ROUTES))
+
+        with open(os.path.join(directory, 'app.py'), 'w') as dst:
+            dst.write(APP.replace('COMPILED', repr(artifact)).replace('{routes}', routes))
+
+        before = measure(directory)
+        subprocess.run([sys.executable, '-m', 'restless', 'compile', 'app:handler', '-o', artifact], cwd=directory,
+                       check=True, env=ENV)
+        after = measure(directory)
+
+        for name, results in [('without artifact', before), ('with artifact', after)]:
+            print(f'{name:>16}: ' + ', '.join(f'{k} {v:.1f}' for k, v in results.items()))
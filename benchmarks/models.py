@@ -0,0 +1,74 @@
+"""
+Body model validation and response model encoding with the installed pydantic: building the model from the decoded
+dict (the pydantic v1 path) against validating the raw JSON, and encoding through the serializer's default hook
+against the serializer's model fast path. The pydantic-core paths only run with pydantic v2.
+
+    python -m benchmarks.models
+"""
+from timeit import repeat
+from typing import List
+import json
+from pydantic import VERSION
+from restless.compat import PYDANTIC_V2, validate_json
+from restless.parameters import BodyParameter
+from restless.serializers import SERIALIZERS, get_serializer
+
+SIZES = [('1KB', 1024), ('100KB', 100 * 1024)]
+
+
+class Record(BodyParameter):
+    record_id: int
+    display_name: str
+    is_active: bool
+    tag_list: List[str] = []
+
+
+class Batch(BodyParameter):
+    batch_name: str
+    records: List[Record]
+
+
+def batch(size: int) -> bytes:
+    records = [
+        {'record_id': i, 'display_name': f'record {i}', 'is_active': bool(i % 2), 'tag_list': ['a', 'b']}
+        for i in range(max(1, size // 80))
+    ]
+
+    return json.dumps({'batch_name': 'benchmark', 'records': records}).encode()
+
+
+def timed(f, number: int) -> float:
+    return min(repeat(f, number=number, repeat=5)) / number * 1e6
+
+
+def bench(number: int = 50) -> dict:
+    results = {}
+
+    for name in SERIALIZERS:
+        try:
+            serializer = get_serializer(name)
+        except ImportError:
+            continue
+
+        for size_name, size in SIZES:
+            data = batch(size)
+            model = Batch(**serializer.loads(data))
+            cases = {
+                'validate dict': lambda: Batch(**serializer.loads(data)),
+                'encode default': lambda: serializer.dumpb(model),
+            }
+
+            if PYDANTIC_V2:
+                cases['validate json'] = lambda: validate_json(Batch, data)
+                cases['encode model'] = lambda: serializer.dumpb_body(model)
+
+            results[(name, size_name)] = {case: timed(f, number) for case, f in cases.items()}
+
+    return results
+
+
+if __name__ == '__main__':
+    print(f'pydantic {VERSION}')
+
+    for (name, size), timings in bench().items():
+        print(f'{name:>8} {size:>6}: ' + ', '.join(f'{k} {v:.1f}us' for k, v in timings.items()))
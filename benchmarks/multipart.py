@@ -0,0 +1,73 @@
+"""
+Time and peak traced memory of the streaming FormData against the previous regex parser, on a 100MB upload and on
+a form with thousands of small fields.
+
+    python -m benchmarks.multipart
+"""
+import re
+import tracemalloc
+from collections import namedtuple
+from os import urandom
+from time import perf_counter
+from restless.multipart import FormData
+
+BOUNDARY = b'--benchmarkboundary'
+File = namedtuple('File', 'name data content_type')
+
+
+def legacy_form_data(payload: bytes) -> dict:
+    form = {}
+    boundary = re.compile(b'(--.*?)\r\n').match(payload).group(1)
+    data_re = re.compile(boundary + b'\r\nContent-Disposition: form-data; (.*?)\r\n(?=' + boundary + b')', re.DOTALL)
+
+    for part in data_re.findall(payload):
+        names, data = part.split(b'\r\n\r\n', 1)
+        names = names.decode()
+
+        if 'filename' in names:
+            name, filename, content_type = re.search(
+                'name="(.*)"; filename="(.*)"\r\nContent-Type: (.*)', names
+            ).groups()
+            form[name] = File(filename, data, content_type)
+        else:
+            form[re.match('name="(.*)"', names).group(1)] = data.decode()
+
+    return form
+
+
+def encode(fields: dict, files: dict) -> bytes:
+    parts = [
+        BOUNDARY + b'\r\nContent-Disposition: form-data; name="%s"\r\n\r\n%s\r\n' % (k.encode(), v.encode())
+        for k, v in fields.items()
+    ] + [
+        BOUNDARY + b'\r\nContent-Disposition: form-data; name="%s"; filename="%s"\r\n'
+                   b'Content-Type: application/octet-stream\r\n\r\n' % (k.encode(), k.encode()) + v + b'\r\n'
+        for k, v in files.items()
+    ]
+
+    return b''.join(parts) + BOUNDARY + b'--\r\n'
+
+
+def bench(parse, payload: bytes) -> dict:
+    start = perf_counter()
+    parse(payload)
+    elapsed = perf_counter() - start
+
+    tracemalloc.start()
+    parse(payload)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {'ms': elapsed * 1e3, 'peak_mb': peak / 2 ** 20}
+
+
+if __name__ == '__main__':
+    cases = {
+        '100MB upload': encode({'name': 'upload'}, {'file': urandom(100 * 2 ** 20)}),
+        '5000 fields': encode({f'field_{i}': f'value {i}' for i in range(5000)}, {}),
+    }
+
+    for case, payload in cases.items():
+        for name, parse in [('before', legacy_form_data), ('after', FormData)]:
+            results = bench(parse, payload)
+            print(f'{case:>12} {name:>6}: ' + ', '.join(f'{k} {v:.2f}' for k, v in results.items()))
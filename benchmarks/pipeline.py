@@ -0,0 +1,346 @@
+"""
+Throughput and latency percentiles of Handler.__call__ on the AWS, Azure and Flask interfaces, over route table
+sizes, request and response payload sizes, camelCase on and off, multipart and binary bodies, pydantic body
+models and lists of them. Everything runs in process: AWS and Azure handlers are called with their native events,
+Flask handlers inside a test request context, the way its catch-all route calls them.
+
+    python -m benchmarks.pipeline run [-o results.json] [--quick] [-k filter]
+    python -m benchmarks.pipeline compare benchmarks/baseline.json results.json [--threshold 0.25]
+
+`compare` exits with status 1 when a case got slower than the baseline by more than the threshold, on either its
+median latency or its throughput, when a case is not in the baseline, or when either run recorded it as failed: its
+result then only holds what the first call answered instead of 200, or the exception it raised. Regenerate the
+baseline along with the changes adding or fixing cases.
+"""
+import argparse
+import json
+import platform
+import sys
+from base64 import b64encode
+from collections import namedtuple
+from datetime import datetime
+from os import urandom
+from time import perf_counter, perf_counter_ns
+from typing import Callable, List
+from restless import Handler
+from restless.parameters import BinaryParameter, BodyParameter, FormFile, FormParameter, PathParameter, \
+    QueryParameter
+
+BOUNDARY = 'benchmarkboundary'
+Call = namedtuple('Call', 'method path body headers query')
+Case = namedtuple('Case', 'name routes use_camel_case register call')
+
+
+class Record(BodyParameter):
+    record_id: int
+    display_name: str
+    is_active: bool
+    tag_list: List[str] = []
+
+
+class Batch(BodyParameter):
+    batch_name: str
+    records: List[Record]
+
+
+def records(size: int) -> List[dict]:
+    count = max(1, size // 80)
+
+    return [
+        {'record_id': i, 'display_name': f'record {i}', 'is_active': bool(i % 2), 'tag_list': ['a', 'b']}
+        for i in range(count)
+    ]
+
+
+def register_get(handler: Handler, routes: int, response_size: int = 0):
+    body = records(response_size) if response_size else None
+
+    for i in range(routes):
+        @handler.handle('get', f'/resource{i}/<item_id>')
+        def get_item(item_id: PathParameter[int], limit: QueryParameter[int] = 10) -> {200: dict}:
+            return {'item_id': item_id, 'limit': limit, 'records': body}
+
+
+def register_body(handler: Handler, routes: int):
+    @handler.handle('post', '/batches')
+    def post_batch(batch: Batch) -> {200: Batch}:
+        return batch
+
+
+def register_bulk(handler: Handler, routes: int):
+    @handler.handle('post', '/records')
+    def post_records(records: List[Record]) -> {200: dict}:
+        return {'count': len(records)}
+
+
+def register_form(handler: Handler, routes: int):
+    @handler.handle('post', '/uploads')
+    def post_upload(description: FormParameter, upload: FormFile) -> {200: dict}:
+        return {'description': description, 'size': len(upload.data)}
+
+
+def register_binary(handler: Handler, routes: int):
+    @handler.handle('post', '/blobs')
+    def post_blob(blob: BinaryParameter) -> {200: dict}:
+        return {'size': len(blob)}
+
+
+def batch_call(size: int, use_camel_case: bool) -> Call:
+    batch = {'batch_name': 'benchmark', 'records': records(size)}
+
+    if use_camel_case:
+        batch = {
+            'batchName': batch['batch_name'],
+            'records': [
+                {'recordId': r['record_id'], 'displayName': r['display_name'], 'isActive': r['is_active'],
+                 'tagList': r['tag_list']}
+                for r in batch['records']
+            ]
+        }
+
+    return Call('post', '/batches', json.dumps(batch).encode(), {'Content-Type': 'application/json'}, {})
+
+
+def bulk_call(count: int, use_camel_case: bool) -> Call:
+    body = [
+        {'record_id': r['record_id'], 'display_name': r['display_name'], 'is_active': r['is_active'],
+         'tag_list': r['tag_list']}
+        if not use_camel_case else
+        {'recordId': r['record_id'], 'displayName': r['display_name'], 'isActive': r['is_active'],
+         'tagList': r['tag_list']}
+        for r in records(count * 80)
+    ]
+
+    return Call('post', '/records', json.dumps(body).encode(), {'Content-Type': 'application/json'}, {})
+
+
+def form_call(size: int) -> Call:
+    body = (
+        f'--{BOUNDARY}\r\nContent-Disposition: form-data; name="description"\r\n\r\nbenchmark upload\r\n'
+        f'--{BOUNDARY}\r\nContent-Disposition: form-data; name="upload"; filename="upload.bin"\r\n'
+        f'Content-Type: application/octet-stream\r\n\r\n'
+    ).encode() + urandom(size) + f'\r\n--{BOUNDARY}--\r\n'.encode()
+
+    return Call('post', '/uploads', body, {'Content-Type': f'multipart/form-data; boundary={BOUNDARY}'}, {})
+
+
+def get_call(routes: int) -> Call:
+    return Call('get', f'/resource{routes - 1}/42', b'', {'X-Request-Id': 'benchmark'}, {'limit': '5'})
+
+
+CASES = [
+    Case('get/routes=10', 10, False, register_get, get_call(10)),
+    Case('get/routes=1000', 1000, False, register_get, get_call(1000)),
+    Case('get/routes=10/response=100KB', 10, False, lambda h, n: register_get(h, n, 100 * 1024), get_call(10)),
+    Case('get/routes=10/response=100KB/camel', 10, True, lambda h, n: register_get(h, n, 100 * 1024), get_call(10)),
+    Case('body/1KB', 1, False, register_body, batch_call(1024, False)),
+    Case('body/1KB/camel', 1, True, register_body, batch_call(1024, True)),
+    Case('body/100KB', 1, False, register_body, batch_call(100 * 1024, False)),
+    Case('body/100KB/camel', 1, True, register_body, batch_call(100 * 1024, True)),
+    Case('bulk/10k', 1, False, register_bulk, bulk_call(10000, False)),
+    Case('bulk/10k/camel', 1, True, register_bulk, bulk_call(10000, True)),
+    Case('multipart/10KB', 1, False, register_form, form_call(10 * 1024)),
+    Case('multipart/1MB', 1, False, register_form, form_call(2 ** 20)),
+    Case('binary/1MB', 1, False, register_binary,
+         Call('post', '/blobs', urandom(2 ** 20), {'Content-Type': 'application/octet-stream'}, {})),
+]
+
+
+def aws(case: Case) -> Callable[[], int]:
+    from restless.interfaces.aws import Request, Response
+
+    handler = Handler(Request, Response, use_camel_case=case.use_camel_case)
+    case.register(handler, case.routes)
+    call = case.call
+    binary = bool(call.body) and call.headers.get('Content-Type') != 'application/json'
+    event = {
+        'path': call.path,
+        'httpMethod': call.method,
+        'headers': call.headers,
+        'queryStringParameters': call.query,
+        'body': (b64encode(call.body) if binary else call.body).decode() or None,
+        'isBase64Encoded': binary
+    }
+
+    return lambda: handler(event)['statusCode']
+
+
+def azure(case: Case) -> Callable[[], int]:
+    from azure.functions import HttpRequest
+    from restless.interfaces.azure import Request, Response
+
+    handler = Handler(Request, Response, use_camel_case=case.use_camel_case)
+    case.register(handler, case.routes)
+    call = case.call
+
+    def run():
+        event = HttpRequest(
+            method=call.method, url='https://benchmark/api' + call.path, body=call.body, headers=call.headers,
+            params=call.query
+        )
+
+        return handler(event).status_code
+
+    return run
+
+
+def flask(case: Case) -> Callable[[], int]:
+    from flask import request
+    from restless.interfaces.flask_app import FlaskHandler
+
+    handler = FlaskHandler('Benchmark', '', '0.1', camel_case_interface=case.use_camel_case)
+    case.register(handler, case.routes)
+    call = case.call
+
+    def run():
+        with handler.app.test_request_context(
+                call.path, method=call.method.upper(), data=call.body, headers=call.headers, query_string=call.query
+        ):
+            return handler(request).status_code
+
+    return run
+
+
+INTERFACES = {'aws': aws, 'azure': azure, 'flask': flask}
+
+
+def percentile(timings: List[int], q: float) -> float:
+    return timings[min(len(timings) - 1, int(len(timings) * q))] / 1e3
+
+
+def measure(run: Callable[[], int], seconds: float, min_calls: int) -> dict:
+    try:
+        status = run()
+    except Exception as e:
+        status = f'{type(e).__name__}: {e}'
+
+    if status != 200:
+        return {'status': status}
+
+    for _ in range(min(50, min_calls)):
+        run()
+
+    timings = []
+    start = perf_counter()
+
+    while len(timings) < min_calls or perf_counter() - start < seconds:
+        before = perf_counter_ns()
+        run()
+        timings.append(perf_counter_ns() - before)
+
+    timings.sort()
+
+    return {
+        'calls': len(timings),
+        'ops': len(timings) / (sum(timings) / 1e9),
+        'p50_us': percentile(timings, 0.5),
+        'p90_us': percentile(timings, 0.9),
+        'p99_us': percentile(timings, 0.99)
+    }
+
+
+def run_suite(quick=False, pattern: str = None) -> dict:
+    results = {}
+
+    for interface, make in INTERFACES.items():
+        for case in CASES:
+            name = f'{interface}/{case.name}'
+
+            if pattern and pattern not in name:
+                continue
+
+            try:
+                run = make(case)
+            except ImportError as e:
+                print(f'{name:<50} skipped: {e}', file=sys.stderr)
+                continue
+
+            results[name] = result = measure(run, 0.2 if quick else 1.0, 20 if quick else 200)
+
+            if 'status' in result:
+                print(f'{name:<50} unsupported, answered {result["status"]}', file=sys.stderr)
+            else:
+                print(
+                    f'{name:<50} {result["ops"]:>9.0f} ops/s  p50 {result["p50_us"]:>9.1f}us  '
+                    f'p90 {result["p90_us"]:>9.1f}us  p99 {result["p99_us"]:>9.1f}us'
+                )
+
+    return {
+        'created': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'results': results
+    }
+
+
+def compare(baseline: dict, current: dict, threshold: float) -> List[str]:
+    """
+    Prints the change of every case measured in both runs, returns the names of the cases failing the comparison:
+    the regressed ones, those missing from the baseline and those either run recorded as an error.
+    """
+    failures = []
+
+    for name, after in current['results'].items():
+        before = baseline['results'].get(name)
+
+        if before is None:
+            failures.append(name)
+            print(f'{name:<50} missing from the baseline')
+            continue
+        elif 'status' in before or 'status' in after:
+            failures.append(name)
+            print(f'{name:<50} failed: {after.get("status") or before["status"]}')
+            continue
+
+        latency = after['p50_us'] / before['p50_us'] - 1
+        throughput = after['ops'] / before['ops'] - 1
+        regressed = latency > threshold or throughput < -threshold
+
+        if regressed:
+            failures.append(name)
+
+        print(
+            f'{name:<50} p50 {latency:>+7.1%}  ops {throughput:>+7.1%}' + ('  REGRESSION' if regressed else '')
+        )
+
+    for name in sorted(baseline['results'].keys() - current['results'].keys()):
+        print(f'{name:<50} not run')
+
+    return failures
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m benchmarks.pipeline')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    run = commands.add_parser('run', help='run the suite and save its results as JSON')
+    run.add_argument('-o', '--output', default='benchmark-results.json')
+    run.add_argument('-k', dest='pattern', help='only run the cases whose name contains this')
+    run.add_argument('--quick', action='store_true', help='fewer calls per case, for a smoke test')
+
+    diff = commands.add_parser('compare', help='compare results against a baseline')
+    diff.add_argument('baseline')
+    diff.add_argument('results')
+    diff.add_argument('--threshold', type=float, default=0.25, help='tolerated relative slowdown')
+
+    args = parser.parse_args(argv)
+
+    if args.command == 'run':
+        results = run_suite(args.quick, args.pattern)
+
+        with open(args.output, 'w') as dst:
+            json.dump(results, dst, indent=2, sort_keys=True)
+    else:
+        with open(args.baseline) as baseline, open(args.results) as results:
+            failures = compare(json.load(baseline), json.load(results), args.threshold)
+
+        if failures:
+            print(
+                f'{len(failures)} case(s) regressed over {args.threshold:.0%}, failed or are missing from the baseline',
+                file=sys.stderr
+            )
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
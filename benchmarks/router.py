@@ -0,0 +1,53 @@
+"""
+Dispatch latency of Handler.select_handler for growing route tables.
+
+    python -m benchmarks.router
+"""
+from timeit import repeat
+from restless import Handler
+from restless.interfaces.aws import Request, Response
+
+
+def make_handler(size: int) -> Handler:
+    handler = Handler(Request, Response)
+
+    for i in range(size):
+        path = f'/resource{i % 50}/<id>/child{i}' if i % 2 else f'/resource{i % 50}/static{i}'
+
+        @handler.handle('get', path)
+        def endpoint(id: str = None) -> {200: dict}:
+            return {}
+
+    return handler
+
+
+def bench(size: int, number: int = 20000) -> dict:
+    handler = make_handler(size)
+    static = (size - 1) // 2 * 2
+    parameter = size - 1 if size % 2 == 0 else size - 2
+    results = {}
+
+    for name, path in [
+        ('static', f'/resource{static % 50}/static{static}'),
+        ('parameter', f'/resource{parameter % 50}/123/child{parameter}'),
+        ('missing', '/resource1/nope/nope/nope'),
+    ]:
+        req = Request({'path': path, 'httpMethod': 'get'}, use_camel_case=False)
+
+        def dispatch():
+            try:
+                handler.select_handler(req)
+            except Exception:
+                pass
+
+        dispatch()
+        best = min(repeat(dispatch, number=number, repeat=5))
+        results[name] = best / number * 1e6
+
+    return results
+
+
+if __name__ == '__main__':
+    for size in [10, 100, 5000]:
+        results = bench(size)
+        print(f'{size:>5} routes: ' + ', '.join(f'{k} {v:.2f}us' for k, v in results.items()))
@@ -0,0 +1,73 @@
+"""
+Encoding and parsing speed of the installed JSON backends on realistic payloads.
+
+    python -m benchmarks.serializers
+"""
+from datetime import datetime, timedelta
+from timeit import repeat
+from typing import List, Optional
+from restless.parameters import BodyParameter
+from restless.serializers import SERIALIZERS, get_serializer
+
+
+class Address(BodyParameter):
+    street: str
+    city: str
+    zip_code: str
+
+
+class User(BodyParameter):
+    id: int
+    name: str
+    email: str
+    signup_ts: datetime
+    score: float
+    tags: List[str]
+    address: Address
+    manager_id: Optional[int] = None
+
+
+def payloads() -> dict:
+    start = datetime(2020, 1, 1)
+    records = [
+        {
+            'id': i,
+            'name': f'User {i}',
+            'email': f'user{i}@example.com',
+            'signup_ts': start + timedelta(minutes=i),
+            'score': i / 7,
+            'tags': ['admin', 'beta'] if i % 3 else [],
+            'address': {'street': f'{i} Main St', 'city': 'Lisbon', 'zip_code': '1000-001'},
+            'manager_id': i // 10 or None
+        }
+        for i in range(1000)
+    ]
+
+    return {
+        'small dict': records[0],
+        '1k dicts': records,
+        '1k models': [User(**record) for record in records],
+    }
+
+
+def bench(number: int = 20) -> dict:
+    results = {}
+
+    for name in SERIALIZERS:
+        try:
+            serializer = get_serializer(name)
+        except ImportError:
+            continue
+
+        for payload_name, payload in payloads().items():
+            encoded = serializer.dumpb(payload)
+            dumps = min(repeat(lambda: serializer.dumpb(payload), number=number, repeat=5)) / number
+            loads = min(repeat(lambda: serializer.loads(encoded), number=number, repeat=5)) / number
+            results[(name, payload_name)] = {'dumps_us': dumps * 1e6, 'loads_us': loads * 1e6}
+
+    return results
+
+
+if __name__ == '__main__':
+    for (name, payload), timings in bench().items():
+        print(f'{name:>8} {payload:>10}: ' + ', '.join(f'{k} {v:.1f}' for k, v in timings.items()))
@@ -0,0 +1,61 @@
+"""
+Time to build the spec of an API as the number of routes and models grows. Every model nests a shared one and each
+route reads and returns one of the models, so schemas are referenced from many operations.
+
+    python -m benchmarks.spec
+"""
+from time import perf_counter
+from typing import List
+from pydantic import create_model
+from restless import Handler
+from restless.interfaces.aws import Request, Response
+from restless.openapi import build_spec, dump_spec
+from restless.parameters import BodyParameter, PathParameter, QueryParameter
+from restless.util import Formats
+
+SIZES = [(100, 20), (500, 100), (2000, 300)]
+
+
+class Address(BodyParameter):
+    street_name: str
+    postal_code: str = None
+
+
+def make_handler(routes: int, models: int) -> Handler:
+    handler = Handler(Request, Response, use_camel_case=True)
+    classes = [
+        create_model(
+            f'Model{i}', __base__=BodyParameter, item_name=(str, ...), tags=(List[str], []), address=(Address, None),
+            previous_addresses=(List[Address], [])
+        )
+        for i in range(models)
+    ]
+
+    for i in range(routes):
+        model = classes[i % models]
+
+        def endpoint(item_id: PathParameter[int], item: model, limit: QueryParameter[int] = 10) -> {200: model}:
+            return item
+
+        endpoint.__name__ = f'endpoint_{i}'
+        handler.handle('put', f'/resource{i}/<item_id>')(endpoint)
+
+    return handler
+
+
+def bench(routes: int, models: int) -> dict:
+    handler = make_handler(routes, models)
+
+    start = perf_counter()
+    spec = build_spec('Benchmark', '', '0.1', handler)
+    built = perf_counter()
+    data = dump_spec(spec, Formats.json)
+    dumped = perf_counter()
+
+    return {'build_ms': (built - start) * 1e3, 'json_ms': (dumped - built) * 1e3, 'size_kb': len(data) / 1024}
+
+
+if __name__ == '__main__':
+    for routes, models in SIZES:
+        results = bench(routes, models)
+        print(f'{routes:>5} routes, {models:>3} models: ' + ', '.join(f'{k} {v:.1f}' for k, v in results.items()))
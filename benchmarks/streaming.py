@@ -0,0 +1,54 @@
+"""
+Time to first byte and peak traced memory of streamed vs buffered list endpoints.
+
+    python -m benchmarks.streaming
+"""
+import tracemalloc
+from time import perf_counter
+from restless.interfaces.flask_app import FlaskHandler
+
+
+def make_handler() -> FlaskHandler:
+    handler = FlaskHandler('Benchmark', '', '0.1', camel_case_interface=False)
+
+    def records(count: int):
+        for i in range(count):
+            yield {'id': i, 'name': f'record {i}', 'tags': ['a', 'b', 'c'], 'score': i * 0.5}
+
+    @handler.handle('get', '/buffered/<count>')
+    def buffered(count: str) -> {200: [dict]}:
+        return records(int(count))
+
+    @handler.handle('get', '/streamed/<count>', stream=True)
+    def streamed(count: str) -> {200: [dict]}:
+        return records(int(count))
+
+    return handler
+
+
+def bench(client, path: str) -> dict:
+    tracemalloc.start()
+    start = perf_counter()
+    out = client.get(path, buffered=False)
+    chunks = iter(out.response)
+    next(chunks)
+    first_byte = perf_counter() - start
+
+    for _ in chunks:
+        pass
+
+    total = perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    out.close()
+
+    return {'ttfb_ms': first_byte * 1e3, 'total_ms': total * 1e3, 'peak_mb': peak / 2 ** 20}
+
+
+if __name__ == '__main__':
+    client = make_handler().app.test_client()
+
+    for count in [1000, 10000, 100000]:
+        for mode in ['buffered', 'streamed']:
+            results = bench(client, f'/{mode}/{count}')
+            print(f'{count:>6} records {mode:>8}: ' + ', '.join(f'{k} {v:.2f}' for k, v in results.items()))
@@ -1,78 +1,128 @@
-import re
-from collections import defaultdict
-from typing import Callable, ClassVar, Iterable, List
-from inspect import signature
+from typing import TYPE_CHECKING, Callable, ClassVar, List, Tuple, Union
+from inspect import Signature, iscoroutinefunction, signature
+from functools import cached_property, partial
 from restless.interfaces import BaseRequest
-from restless.util import FormData
-from restless.parameters import BinaryParameter, BodyParameter, AuthorizerParameter
-from restless.errors import Forbidden, Unauthorized, Missing, BadRequest
-from pydantic.error_wrappers import ValidationError
+from restless.binding import BODY, BINARY, FORM, Binding, make_plan, bind
+from restless.errors import Forbidden, Unauthorized, Missing, BadRequest, HeadersTooLarge, PayloadTooLarge
+from restless.compat import ValidationError, error_details
+from restless.limits import Limits
 from restless.security import Security
+from restless.router import Router
+from restless.validation import Validation, Validator
+from restless.serializers import Serializer, get_serializer
+from restless.parameters import PathParameter
+from restless.util import Formats, warm_aliases
+from restless.timing import BIND, ENDPOINT, REQUEST, RESPONSE, ROUTE, VALIDATE, Timings
 from pydantic import BaseModel
 
+if TYPE_CHECKING:
+    from concurrent.futures import ThreadPoolExecutor
+    from restless.openapi import SpecDocument
+
 
 class PathHandler:
-    def __init__(self, path, path_regex, method, http_method, tags=None, security=list):
+    def __init__(
+            self, path, method, http_method, tags=None, security=list, validator: Validator = None, stream=False,
+            plan: Tuple[Binding, ...] = None, limits: Limits = None, restore: Callable = None
+    ):
         self.path = path.replace('<', '{').replace('>', '}')
-        self.path_regex = path_regex
         self.method = method
         self.http_method = http_method
         self.tags = tags or []
         self.security = security
+        self.validator = validator
+        self.stream = stream
+        self.limits = limits
+        self.is_async = iscoroutinefunction(method)
+        self.restore = restore
 
-        self.sig = signature(method)
-        self.parameters = {k: v.annotation or type(v.default) for k, v in self.sig.parameters.items()}
+        if plan is None and restore is None:
+            plan = self.make_plan()
 
-    def process_request(self, req: BaseRequest):
-        params = {}
-        method_params = {}
-        match = self.path_regex.search(req.path)
+        if plan is not None:
+            self.plan = plan
 
-        if match:
-            params.update(match.groupdict().items())
+    def make_plan(self) -> Tuple[Binding, ...]:
+        plan = make_plan(self.sig.parameters)
 
-        if req.headers:
-            params.update(req.headers)
+        if isinstance(self.sig.return_annotation, dict):
+            for model in self.sig.return_annotation.values():
+                model = model[0] if isinstance(model, list) else model
 
-        if req.query:
-            params.update(req.query)
+                if isinstance(model, type) and issubclass(model, BaseModel):
+                    warm_aliases(model)
 
-        if isinstance(req.body, bytes):
-            try:
-                params.update(
-                    FormData(req.body)
-                )
-            except AttributeError:
-                params["body"] = req.body
+        return plan
 
-        for param, value in params.items():
-            if param not in self.parameters:
-                continue
-            else:
-                if getattr(self.parameters[param], 'ENUM', None):
-                    if not re.match(r'[a-zA-Z_].*', value):
-                        value = "_" + value
-
-                    if value in self.parameters[param].ENUM.__members__:
-                        method_params[param] = self.parameters[param].ENUM.__members__[value]
-                    else:
-                        raise BadRequest(
-                            f"The value for {param} must be one of {self.parameters[param].enum_keys()}"
-                        )
-                else:
-                    method_params[param] = value if isinstance(value, FormData.File) else self.parameters[param](
-                        value)
-
-        for param, type_ in self.parameters.items():
-            if type_ == BinaryParameter:
-                method_params[param] = params.get('body')
-            elif issubclass(type_, BodyParameter):
-                method_params[param] = type_(**req.body)
-            elif issubclass(type_, AuthorizerParameter):
-                method_params[param] = req.authorizer
-
-        result = self.method(**method_params)
+    @cached_property
+    def plan(self) -> Tuple[Binding, ...]:
+        # Routes of a compiled artifact restore their plan on their first request, or plan it from their signature
+        # when their endpoint changed since
+        plan = self.restore()
+
+        return self.make_plan() if plan is None else plan
+
+    @cached_property
+    def sig(self) -> Signature:
+        # Routes restored from a compiled artifact only inspect their signature when it is first needed
+        return signature(self.method)
+
+    @cached_property
+    def reads_body(self) -> bool:
+        return any(binding.source in (BODY, FORM, BINARY) for binding in self.plan)
+
+    @cached_property
+    def parameters(self) -> dict:
+        return {k: v.annotation or type(v.default) for k, v in self.sig.parameters.items()}
+
+    def process_request(
+            self, req: BaseRequest, path_params: dict = None, validator: Validator = None, timings: Timings = None
+    ):
+        if self.limits is not None:
+            self.limits.check(req, self.reads_body)
+
+        method_params = bind(self.plan, req, path_params or {}, self.method.__name__, self.limits)
+
+        if timings is not None:
+            timings.mark(BIND)
+
+        if self.is_async:
+            from restless.aio import run
+
+            result = run(self.method(**method_params))
+        else:
+            result = self.method(**method_params)
+
+        if timings is not None:
+            timings.mark(ENDPOINT)
+
+        return self.process_result(result, validator, timings)
 
+    async def process_request_async(
+            self, req: BaseRequest, path_params: dict = None, validator: Validator = None,
+            executor: 'ThreadPoolExecutor' = None, timings: Timings = None
+    ):
+        if self.limits is not None:
+            self.limits.check(req, self.reads_body)
+
+        method_params = bind(self.plan, req, path_params or {}, self.method.__name__, self.limits)
+
+        if timings is not None:
+            timings.mark(BIND)
+
+        if self.is_async:
+            result = await self.method(**method_params)
+        else:
+            from asyncio import get_running_loop
+
+            result = await get_running_loop().run_in_executor(executor, partial(self.method, **method_params))
+
+        if timings is not None:
+            timings.mark(ENDPOINT)
+
+        return self.process_result(result, validator, timings)
+
+    def process_result(self, result, validator: Validator = None, timings: Timings = None):
         if isinstance(result, tuple):
             if len(result) == 2:
                 body, status, headers = result[0], result[1], {}
@@ -81,133 +131,242 @@ class PathHandler:
         else:
             body, status, headers = result, 200, {}
 
-        expected_type = self.sig.return_annotation[status]
+        body = (self.validator or validator or Validator())(self, body, status)
 
-        if isinstance(body, Iterable) and not isinstance(body, (dict, str, BaseModel, bytes)):
-            body = list(body)
-
-            assert all(
-                isinstance(rec, expected_type[0]) for rec in body
-            ), f"All records should be of type '{expected_type.__name__e}'"
-        else:
-            assert isinstance(body, expected_type), f"The body should be of type '{expected_type.__name__}'"
+        if timings is not None:
+            timings.mark(VALIDATE)
 
         return body, status, headers
 
 
 class Handler:
-    REGEX = re.compile(r'(<[^/]+?>)')
-
-    def __init__(self, request: ClassVar, response: ClassVar, use_camel_case=False):
-        self.handlers = defaultdict(dict)
+    def __init__(
+            self, request: ClassVar, response: ClassVar, use_camel_case=False, freeze_on_first_request=False,
+            validation: Validation = Validation.full, on_invalid_response: Callable = None,
+            serializer: Union[str, Serializer] = 'json', max_workers: int = None, compiled: str = None,
+            timing_hooks: List[Callable] = None, server_timing=False, limits: Limits = None
+    ):
+        self.router = Router()
         self.Request = request
         self.Response = response
         self.use_camel_case = use_camel_case
-
-    def handle(self, method: str, path: str, tags=None, security=None) -> Callable:
-        tokens = path.split('/')[1:]
-        path_expressions = []
-        target = self.handlers[len(tokens)]
-
-        for token in tokens:
-            if self.REGEX.search(token):
-                path_expressions.append(
-                    self.REGEX.sub('(?P\\1[^/]+)', token)
-                )
-                token = ''
-            else:
-                path_expressions.append(token)
-
-            if token not in target:
-                target[token] = {}
-
-            target = target[token]
-
+        self.freeze_on_first_request = freeze_on_first_request
+        self.validator = Validator(validation, on_invalid=on_invalid_response)
+        self.serializer = get_serializer(serializer)
+        self.max_workers = max_workers
+        self._executor = None
+        self.compiled = None
+        self.timing_hooks = list(timing_hooks or [])
+        self.server_timing = server_timing
+        self.limits = limits
+
+        if compiled:
+            from restless.compiled import load
+
+            self.compiled = load(compiled)
+
+    @property
+    def executor(self) -> 'ThreadPoolExecutor':
+        """
+        Bounded pool running the synchronous endpoints of `call_async`, created on first use.
+        """
+        if self._executor is None:
+            from concurrent.futures import ThreadPoolExecutor
+
+            self._executor = ThreadPoolExecutor(self.max_workers, thread_name_prefix='restless')
+
+        return self._executor
+
+    @property
+    def stale(self) -> List[Tuple[str, str]]:
+        """
+        Method and path of the routes whose endpoint changed since the compiled artifact was built.
+        """
+        if not self.compiled:
+            return []
+
+        from restless.compiled import stale_routes
+
+        return stale_routes(self.compiled, self)
+
+    @property
+    def handlers(self) -> List[PathHandler]:
+        return list(self.router)
+
+    def handle(
+            self, method: str, path: str, tags=None, security=None, validation: Validation = None, stream=False,
+            limits: Limits = None
+    ) -> Callable:
         def wrapped(f: Callable):
-            path_regex = re.compile('/'.join(path_expressions) + '$')
-            assert method.upper() not in target, f"'{path}' already has the '{method}' method"
-            target[method.upper()] = PathHandler(
-                path=path,
-                path_regex=path_regex,
-                method=f,
-                http_method=method,
-                tags=tags,
-                security=security
+            restore = None
+
+            if self.compiled:
+                from restless.compiled import restore_plan
+
+                restore = partial(restore_plan, self.compiled, method, path, f)
+
+            self.router.add(
+                path,
+                method,
+                PathHandler(
+                    path=path,
+                    method=f,
+                    http_method=method,
+                    tags=tags,
+                    security=security,
+                    validator=Validator(
+                        validation, on_invalid=self.validator.on_invalid
+                    ) if validation else None,
+                    stream=stream,
+                    restore=restore,
+                    limits=(self.limits or Limits()).merge(limits) if self.limits or limits else None
+                )
             )
             return f
 
         return wrapped
 
-    def select_handler(self, req: BaseRequest):
-        tokens = req.path.split('/')[1:]
-        target = self.handlers[len(tokens)]
+    def freeze(self):
+        self.router.freeze()
 
-        for token in tokens:
-            if token in target:
-                target = target[token]
-            elif '' in target:
-                target = target['']
+    def route(self, path: str, method: str) -> tuple:
+        if self.freeze_on_first_request and not self.router.frozen:
+            self.freeze()
 
-        try:
-            return target[req.method.upper()]
-        except KeyError:
+        return self.router.match(path, method)
+
+    def select_handler(self, req: BaseRequest, match: tuple = None):
+        # `match` is what `route` answered for the request, when the interface had to route it already
+        path_handler, path_params = match or self.route(req.path, req.method)
+
+        if path_handler is None:
             raise Missing(f"Missing '{req.method}' on '{req.path}'")
 
+        return path_handler, path_params
+
+    def make_response(self, body, status_code=200, headers=None):
+        return self.Response(
+            body=body,
+            status_code=status_code,
+            headers=headers,
+            use_camel_case=self.use_camel_case,
+            serializer=self.serializer
+        )
+
+    def error_response(self, e: Exception):
+        if isinstance(e, (TypeError, AssertionError)):
+            if e.args and 'missing' in e.args[0]:
+                return self.make_response({"error": str(e)}, status_code=400)
+        elif isinstance(e, ValidationError):
+            return self.make_response({"error": "Validation Error", "details": error_details(e)}, status_code=400)
+        elif isinstance(e, Unauthorized):
+            return self.make_response({"error": e.args[0]}, status_code=401)
+        elif isinstance(e, Forbidden):
+            return self.make_response({"error": e.args[0]}, status_code=403)
+        elif isinstance(e, Missing):
+            return self.make_response({"error": e.args[0]}, status_code=404)
+        elif isinstance(e, PayloadTooLarge):
+            return self.make_response({"error": e.args[0]}, status_code=413)
+        elif isinstance(e, HeadersTooLarge):
+            return self.make_response({"error": e.args[0]}, status_code=431)
+        elif isinstance(e, BadRequest):
+            return self.make_response({"error": e.args[0]}, status_code=400)
+
+        raise e
+
+    def start_timings(self) -> Timings:
+        # Untimed handlers skip every stage mark
+        return Timings() if self.timing_hooks or self.server_timing else None
+
+    def finish_timings(self, timings: Timings, req: BaseRequest, response):
+        """
+        Completes the timings of a request with its status and sizes, adds the Server-Timing header when enabled
+        and passes them to every timing hook.
+        """
+        timings.mark(RESPONSE)
+        timings.status = response.status_code
+        timings.request_size = req.size
+        timings.response_size = getattr(response, 'size', None)
+
+        if self.server_timing:
+            response.headers['Server-Timing'] = timings.server_timing()
+
+        for hook in self.timing_hooks:
+            hook(timings)
+
+        return response
+
     def __call__(self, event):
-        req = self.Request(event, use_camel_case=self.use_camel_case)
+        timings = self.start_timings()
+        req = self.Request(event, use_camel_case=self.use_camel_case, serializer=self.serializer)
+
+        if timings is not None:
+            timings.mark(REQUEST)
 
         try:
-            path_handler = self.select_handler(req)
+            path_handler, path_params = self.select_handler(req)
 
-            body, status, headers = path_handler.process_request(req)
+            if timings is not None:
+                timings.path_handler = path_handler
+                timings.mark(ROUTE)
 
-            return self.Response(
-                body=body,
-                status_code=status,
-                headers=headers,
-                use_camel_case=self.use_camel_case
-            )
+            body, status, headers = path_handler.process_request(req, path_params, self.validator, timings)
 
-        except (TypeError, AssertionError) as e:
-            if e.args and 'missing' in e.args[0]:
-                return self.Response(
-                    {"error": str(e)},
-                    status_code=400,
-                    use_camel_case=self.use_camel_case
-                )
-            raise e
+            response = self.make_response(body, status, headers)
+        except (TypeError, AssertionError, ValidationError, Unauthorized, Forbidden, Missing, BadRequest) as e:
+            response = self.error_response(e)
 
-        except ValidationError as e:
-            return self.Response(
-                {"error": "Validation Error", "details": e.errors()},
-                status_code=400,
-                use_camel_case=self.use_camel_case
-            )
+        return response if timings is None else self.finish_timings(timings, req, response)
 
-        except Unauthorized as e:
-            return self.Response(
-                {"error": e.args[0]},
-                status_code=401,
-                use_camel_case=self.use_camel_case
-            )
+    async def call_async(self, event, match: tuple = None):
+        """
+        Awaitable counterpart of `__call__`: `async def` endpoints are awaited on the running loop and the others
+        run in `executor`, so I/O bound routes can serve concurrent requests from a single process. Interfaces that
+        routed the request already pass what `route` answered as `match`.
+        """
+        timings = self.start_timings()
+        req = self.Request(event, use_camel_case=self.use_camel_case, serializer=self.serializer)
 
-        except Forbidden as e:
-            return self.Response(
-                {"error": e.args[0]},
-                status_code=403,
-                use_camel_case=self.use_camel_case
-            )
+        if timings is not None:
+            timings.mark(REQUEST)
 
-        except Missing as e:
-            return self.Response(
-                {"error": e.args[0]},
-                status_code=404,
-                use_camel_case=self.use_camel_case
-            )
+        try:
+            path_handler, path_params = self.select_handler(req, match)
+
+            if timings is not None:
+                timings.path_handler = path_handler
+                timings.mark(ROUTE)
 
-        except BadRequest as e:
-            return self.Response(
-                {"error": e.args[0]},
-                status_code=400,
-                use_camel_case=self.use_camel_case
+            body, status, headers = await path_handler.process_request_async(
+                req, path_params, self.validator, self.executor, timings
             )
+
+            response = self.make_response(body, status, headers)
+        except (TypeError, AssertionError, ValidationError, Unauthorized, Forbidden, Missing, BadRequest) as e:
+            response = self.error_response(e)
+
+        return response if timings is None else self.finish_timings(timings, req, response)
+
+
+class SpecMixin:
+    """
+    Serves the spec of a handler's routes at /spec/swagger.json and /spec/swagger.yaml, for interfaces running as an
+    application of their own. Handlers using it set `name`, `description`, `version` and their security schemes.
+    """
+    _spec_cache = None
+
+    def add_spec_route(self):
+        @self.handle("get", "/spec/swagger.<extension>")
+        def spec(extension: PathParameter.enum(Formats)) -> {200: str}:
+            return self.spec_document(extension).data.decode()
+
+    def spec_document(self, data_format: Formats) -> 'SpecDocument':
+        """
+        Returns the cached spec document, it is rebuilt after new routes are registered.
+        """
+        if self._spec_cache is None:
+            from restless.openapi import SpecCache
+
+            self._spec_cache = SpecCache(self)
+
+        return self._spec_cache.get(data_format)
@@ -0,0 +1,29 @@
+import argparse
+import os
+import sys
+from importlib import import_module
+from restless.compiled import COMPILED, save
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='restless')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    compile_parser = commands.add_parser(
+        'compile', help='Writes the binding recipes and spec of a handler, load it with Handler(compiled=...)'
+    )
+    compile_parser.add_argument('target', help="Handler to compile as 'module:attribute', ex: app:handler")
+    compile_parser.add_argument('-o', '--output', default=COMPILED, help=f"Artifact path, '{COMPILED}' by default")
+
+    args = parser.parse_args(argv)
+    sys.path.insert(0, os.getcwd())
+
+    module, _, attribute = args.target.partition(':')
+    api_handler = getattr(import_module(module), attribute or 'handler')
+
+    save(api_handler, args.output)
+    print(f"Compiled {len(api_handler.router.routes)} routes to {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,26 @@
+import asyncio
+from typing import Awaitable
+
+_loop: asyncio.AbstractEventLoop = None
+
+
+def get_loop() -> asyncio.AbstractEventLoop:
+    """
+    Returns the event loop shared by every synchronous entry point of the process.
+
+    It is created once and kept open, so warm Lambda and Azure Functions invocations reuse it (and whatever clients
+    the endpoints bound to it) instead of starting a new loop per request.
+    """
+    global _loop
+
+    if _loop is None or _loop.is_closed():
+        _loop = asyncio.new_event_loop()
+
+    return _loop
+
+
+def run(awaitable: Awaitable):
+    """
+    Runs `awaitable` to completion on the shared loop, for synchronous callers only.
+    """
+    return get_loop().run_until_complete(awaitable)
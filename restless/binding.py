@@ -0,0 +1,333 @@
+import re
+from collections import namedtuple
+from collections.abc import Iterable, Iterator
+from datetime import date, datetime
+from decimal import Decimal
+from enum import Enum
+from functools import lru_cache
+from inspect import Parameter, _empty
+from typing import Callable, Dict, List, Tuple, get_args, get_origin
+from uuid import UUID
+from restless.interfaces import BaseRequest, header_spellings
+from restless.compat import iter_models, validate_models
+from restless.files import BUFFERS
+from restless.limits import Limits
+from restless.multipart import FormData
+from restless.util import from_camel, to_camel, warm_aliases
+from restless.parameters import BinaryParameter, BodyParameter, AuthorizerParameter, FormFile
+from restless.errors import BadRequest
+
+PATH = 'path'
+HEADER = 'header'
+QUERY = 'query'
+FORM = 'formData'
+BODY = 'body'
+BINARY = 'binary'
+AUTHORIZER = 'authorizer'
+ANY = 'any'
+
+IDENTITY = 'identity'
+MODEL = 'model'
+MODELS = 'models'
+RECORDS = 'records'
+ENUM = 'enum'
+TYPED = 'typed'
+TYPE = 'type'
+
+Binding = namedtuple('Binding', 'name source key convert default many aliases')
+Recipe = namedtuple('Recipe', 'name source kind many')
+
+TRUE = {'true', '1', 'yes', 'on'}
+FALSE = {'false', '0', 'no', 'off'}
+
+
+def identity(value):
+    return value
+
+
+def to_bool(value: str) -> bool:
+    value = value.lower()
+
+    if value in TRUE:
+        return True
+    elif value in FALSE:
+        return False
+
+    raise ValueError(value)
+
+
+def to_datetime(value: str) -> datetime:
+    return datetime.fromisoformat(value[:-1] + '+00:00' if value.endswith('Z') else value)
+
+
+CONVERTERS = {
+    str: str,
+    int: int,
+    float: float,
+    Decimal: Decimal,
+    bool: to_bool,
+    UUID: UUID,
+    datetime: to_datetime,
+    date: date.fromisoformat
+}
+
+
+def list_type(type_) -> bool:
+    return type_ in (list, List) or get_origin(type_) is list
+
+
+def body_models(type_):
+    """
+    Model and kind of a `List[Model]` body parameter (validated as a whole) or of an `Iterator[Model]` or
+    `Iterable[Model]` one (validated record by record as the endpoint reads it), None for other annotations.
+    """
+    args = get_args(type_)
+
+    if len(args) != 1 or not isinstance(args[0], type) or not issubclass(args[0], BodyParameter):
+        return None
+    elif list_type(type_):
+        return args[0], MODELS
+    elif get_origin(type_) in (Iterator, Iterable):
+        return args[0], RECORDS
+
+    return None
+
+
+@lru_cache(maxsize=256)
+def enum_table(enum: Enum) -> dict:
+    table = dict(enum.__members__)
+
+    for key, member in enum.__members__.items():
+        if key.startswith('_') and not re.match(r'[a-zA-Z_].*', key[1:]):
+            table[key[1:]] = member
+
+    return table
+
+
+def enum_converter(name: str, type_) -> Callable:
+    table = enum_table(type_.ENUM)
+    error = f"The value for {name} must be one of {type_.enum_keys()}"
+
+    def convert(value):
+        try:
+            return table[value]
+        except KeyError:
+            raise BadRequest(error)
+
+    return convert
+
+
+def typed_converter(name: str, type_) -> Callable:
+    many = list_type(type_)
+    item_type = (get_args(type_) or (str,))[0] if many else type_
+    error = f"The value for {name} must be {'a list of ' if many else 'a valid '}" \
+            f"{getattr(item_type, '__name__', item_type)}"
+
+    if isinstance(item_type, type) and issubclass(item_type, Enum):
+        convert = enum_table(item_type).__getitem__
+    else:
+        convert = CONVERTERS.get(item_type, item_type)
+
+    def convert_one(value):
+        try:
+            return convert(value)
+        except (ValueError, TypeError, KeyError, ArithmeticError):
+            raise BadRequest(error)
+
+    def convert_many(values):
+        try:
+            return [convert(value) for value in values]
+        except (ValueError, TypeError, KeyError, ArithmeticError):
+            raise BadRequest(error)
+
+    return convert_many if many else convert_one
+
+
+def make_recipe(name: str, type_) -> Recipe:
+    """
+    Works out where a parameter is read from and how it is converted, without building the converter.
+    """
+    if body_models(type_):
+        return Recipe(name, BODY, body_models(type_)[1], True)
+    elif type_ is _empty or not isinstance(type_, type):
+        return Recipe(name, ANY, IDENTITY, False)
+    elif type_ == BinaryParameter:
+        return Recipe(name, BINARY, IDENTITY, False)
+    elif issubclass(type_, BodyParameter):
+        return Recipe(name, BODY, MODEL, False)
+    elif issubclass(type_, AuthorizerParameter):
+        return Recipe(name, AUTHORIZER, IDENTITY, False)
+    elif issubclass(type_, FormFile):
+        return Recipe(name, FORM, IDENTITY, False)
+    elif getattr(type_, 'ENUM', None):
+        kind = ENUM
+    elif getattr(type_, 'TYPE', None) is not None:
+        kind = TYPED
+    else:
+        kind = TYPE
+
+    return Recipe(name, getattr(type_, 'LOCATION', ANY), kind, list_type(getattr(type_, 'TYPE', None)))
+
+
+def query_spellings(name: str) -> Tuple[str, ...]:
+    # camelCase requests send page_size as pageSize, the declared spelling is still accepted
+    return tuple(dict.fromkeys([to_camel(name), name]))
+
+
+def first(values, keys: Tuple[str, ...]):
+    if values:
+        for key in keys:
+            value = values.get(key)
+
+            if value is not None:
+                return value
+
+    return None
+
+
+def restore_binding(recipe: Recipe, type_, default) -> Binding:
+    if recipe.kind == IDENTITY:
+        convert = identity
+    elif recipe.kind == MODEL:
+        convert = type_
+        warm_aliases(type_)
+    elif recipe.kind in (MODELS, RECORDS):
+        convert = models_reader(get_args(type_)[0], recipe.kind == RECORDS)
+    elif recipe.kind == ENUM:
+        convert = enum_converter(recipe.name, type_)
+    elif recipe.kind == TYPED:
+        convert = typed_converter(recipe.name, type_.TYPE)
+    else:
+        convert = type_
+
+    key = header_spellings(recipe.name) if recipe.source == HEADER else recipe.name
+    aliases = query_spellings(recipe.name) if recipe.source in (QUERY, ANY) else None
+
+    return Binding(recipe.name, recipe.source, key, convert, default, recipe.many, aliases)
+
+
+def make_binding(name: str, parameter: Parameter) -> Binding:
+    return restore_binding(make_recipe(name, parameter.annotation), parameter.annotation, parameter.default)
+
+
+def make_plan(parameters: Dict[str, Parameter]) -> Tuple[Binding, ...]:
+    return tuple(make_binding(name, parameter) for name, parameter in parameters.items())
+
+
+def form_data(body, limits: Limits = None) -> dict:
+    if isinstance(body, BUFFERS) or hasattr(body, 'read'):
+        try:
+            if limits is None:
+                return FormData(body)
+
+            return FormData(body, max_parts=limits.max_form_parts, max_file_size=limits.max_file_size)
+        except ValueError:
+            pass
+
+    return {}
+
+
+def read_model(model, req: BaseRequest):
+    """
+    Body model of a request, camelCase bodies are renamed to the field names first. Bodies that are not a JSON object
+    are a BadRequest. Validating the raw JSON text with pydantic-core is no faster than building the model from the
+    decoded dict (see benchmarks/models.py).
+    """
+    body = req.payload
+
+    if body is None:
+        return model()
+    elif not isinstance(body, dict):
+        raise BadRequest('The request body must be a JSON object')
+
+    return model(**(from_camel(model, body) if req.use_camel_case else body))
+
+
+def models_reader(model, lazy: bool) -> Callable:
+    """
+    Reads a body of records into a list of `model`, validated by an adapter cached per model, or with `lazy` into an
+    iterator validating them as they are consumed. Returns None when there is no body.
+    """
+    warm_aliases(model)
+
+    def read(req: BaseRequest):
+        records = req.payload
+
+        if records is None:
+            return None
+        elif not isinstance(records, list):
+            return validate_models(model, records)
+        elif lazy:
+            return iter_models(model, (from_camel(model, r) for r in records) if req.use_camel_case else records)
+
+        return validate_models(model, [from_camel(model, r) for r in records] if req.use_camel_case else records)
+
+    return read
+
+
+def bind(
+        plan: Tuple[Binding, ...], req: BaseRequest, path_params: dict, method_name: str, limits: Limits = None
+) -> dict:
+    method_params = {}
+    form = None
+
+    for binding in plan:
+        source = binding.source
+
+        if source == QUERY:
+            # camelCase requests read the query string as sent, only the declared parameters are looked up
+            if req.use_camel_case:
+                value = first(req.raw_query, binding.aliases)
+                values = first(req.raw_multi_query, binding.aliases) if binding.many else None
+            else:
+                value = req.query.get(binding.key) if req.query else None
+                values = (req.multi_query or {}).get(binding.key) if binding.many else None
+
+            if binding.many:
+                value = values or (value.split(',') if value else None)
+        elif source == PATH:
+            value = path_params.get(binding.key)
+        elif source == HEADER:
+            if not req.headers:
+                value = None
+            elif binding.many:
+                value = req.headers.get_all(binding.key) or None
+            else:
+                value = req.headers.get(binding.key)
+        elif source == BODY:
+            if binding.many:
+                value = binding.convert(req)
+
+                if value is not None:
+                    method_params[binding.name] = value
+                    continue
+            else:
+                method_params[binding.name] = read_model(binding.convert, req)
+                continue
+        elif source == AUTHORIZER:
+            method_params[binding.name] = req.authorizer
+            continue
+        elif source == BINARY:
+            method_params[binding.name] = req.body if isinstance(req.body, BUFFERS) else None
+            continue
+        elif source == FORM:
+            if form is None:
+                form = form_data(req.form_body, limits)
+
+            value = form.get(binding.key)
+        else:
+            value = first(req.raw_query, binding.aliases) if req.use_camel_case else first(req.query, (binding.key,))
+
+            for values in (req.headers, path_params):
+                if value is not None:
+                    break
+                elif values:
+                    value = values.get(binding.key)
+
+        if value is None:
+            if binding.default is _empty:
+                raise BadRequest(f"{method_name}() missing 1 required positional argument: '{binding.name}'")
+        else:
+            method_params[binding.name] = binding.convert(value)
+
+    return method_params
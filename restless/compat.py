@@ -0,0 +1,126 @@
+import json
+from functools import lru_cache
+from typing import Iterable, Iterator, List, Union
+from pydantic import VERSION, BaseModel
+
+PYDANTIC_V2 = int(VERSION.split('.')[0]) >= 2
+
+if PYDANTIC_V2:
+    from pydantic import TypeAdapter, ValidationError
+else:
+    from pydantic import parse_obj_as
+    from pydantic.error_wrappers import ErrorWrapper, ValidationError
+
+
+NULL = {'type': 'null'}
+
+
+def drop_null(schema):
+    """
+    Rewrites the `anyOf: [..., {type: null}]` of optional fields as the schema of their type, the way pydantic v1
+    describes them, since OpenAPI 3.0 has no null type.
+    """
+    if isinstance(schema, list):
+        return [drop_null(item) for item in schema]
+    elif not isinstance(schema, dict):
+        return schema
+
+    schema = {key: drop_null(value) for key, value in schema.items()}
+    options = schema.get('anyOf')
+
+    if options and NULL in options:
+        options = [option for option in options if option != NULL]
+        del schema['anyOf']
+
+        if schema.get('default', NULL) is None:
+            del schema['default']
+
+        schema = {**options[0], **schema} if len(options) == 1 else {'anyOf': options, **schema}
+
+    return schema
+
+
+def model_schema(model, ref_template: str) -> dict:
+    if PYDANTIC_V2:
+        return drop_null(model.model_json_schema(ref_template=ref_template))
+
+    return model.schema(ref_template=ref_template)
+
+
+def error_details(e: ValidationError) -> list:
+    if PYDANTIC_V2:
+        # Contexts may hold the exception a validator raised, the JSON form is always serializable
+        return json.loads(e.json(include_url=False, include_input=False))
+
+    return e.errors()
+
+
+def validate_json(model, data: Union[str, bytes]) -> BaseModel:
+    """
+    Parses and validates a JSON document in a single pass through pydantic-core, only available with pydantic v2.
+    """
+    return model.model_validate_json(data)
+
+
+@lru_cache(maxsize=None)
+def type_adapter(annotation) -> 'TypeAdapter':
+    return TypeAdapter(annotation)
+
+
+def validate_models(model, data) -> list:
+    """
+    Validates a list of records as a whole, errors are located by the index of their record.
+    """
+    if PYDANTIC_V2:
+        return type_adapter(List[model]).validate_python(data)
+    elif not isinstance(data, list):
+        return parse_obj_as(List[model], data)
+
+    models, errors = [], []
+
+    for idx, record in enumerate(data):
+        try:
+            models.append(model.parse_obj(record))
+        except ValidationError as e:
+            errors.append(ErrorWrapper(e, loc=idx))
+
+    if errors:
+        raise ValidationError(errors, model)
+
+    return models
+
+
+def iter_models(model, records: Iterable) -> Iterator:
+    """
+    Validates records one at a time as they are consumed, the first invalid one raises its error located by its
+    index.
+    """
+    if PYDANTIC_V2:
+        yield from type_adapter(Iterable[model]).validate_python(records)
+        return
+
+    for idx, record in enumerate(records):
+        try:
+            yield model.parse_obj(record)
+        except ValidationError as e:
+            raise ValidationError([ErrorWrapper(e, loc=idx)], model)
+
+
+def dump_json(obj) -> bytes:
+    """
+    JSON encoding of a model or of a list of models of the same class by pydantic-core, with pydantic v2. None when
+    `obj` is anything else, or with pydantic v1.
+
+    Lists mixing classes are left out, their adapter would drop the fields of subclasses.
+    """
+    if not PYDANTIC_V2:
+        return None
+    elif isinstance(obj, BaseModel):
+        return type_adapter(type(obj)).dump_json(obj)
+    elif isinstance(obj, list) and obj and isinstance(obj[0], BaseModel):
+        cls = type(obj[0])
+
+        if all(type(item) is cls for item in obj):
+            return type_adapter(List[cls]).dump_json(obj)
+
+    return None
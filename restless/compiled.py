@@ -0,0 +1,205 @@
+import json
+import marshal
+from collections import namedtuple
+from functools import lru_cache
+from hashlib import sha1
+from inspect import _empty, unwrap
+from typing import Callable, Iterator, Optional, Tuple, get_args, get_origin
+from pydantic import BaseModel
+from restless.binding import Binding, Recipe, make_recipe, restore_binding
+from restless.compat import model_schema
+from restless.util import Formats, model_fields
+
+FORMAT = 2
+COMPILED = 'restless.compiled'
+Route = namedtuple('Route', 'fingerprint recipes')
+
+
+def describe(annotation) -> str:
+    if isinstance(annotation, dict):
+        return repr({k: describe(v) for k, v in annotation.items()})
+    elif isinstance(annotation, list):
+        return repr([describe(v) for v in annotation])
+    elif get_args(annotation):
+        # Generic aliases like List[Model] change along with the fields of their models
+        return repr([repr(get_origin(annotation)), *(describe(arg) for arg in get_args(annotation))])
+    elif not isinstance(annotation, type):
+        return repr(annotation)
+
+    return describe_type(annotation)
+
+
+@lru_cache(maxsize=None)
+def describe_type(annotation: type) -> str:
+    description = [
+        annotation.__module__, annotation.__qualname__, getattr(annotation, 'LOCATION', None),
+        getattr(annotation, 'TYPE', None), getattr(annotation, 'ENUM', None)
+    ]
+
+    if issubclass(annotation, BaseModel):
+        description.append(model_fields(annotation))
+
+    return repr(description)
+
+
+def fingerprint(f: Callable) -> str:
+    """
+    Hash of what the binding plan of a route is derived from: the endpoint's code, docstring, parameter names,
+    defaulted parameters, annotations and the fields of its models. It only reads attributes, the JSON schema of
+    the models is left to `schemas_key` when the spec is first served.
+    """
+    f = unwrap(f)
+    code = f.__code__
+    names = code.co_varnames[:code.co_argcount + code.co_kwonlyargcount]
+    parts = [f.__module__, f.__qualname__, repr(f.__doc__), repr(names), repr(sorted(defaults(f)))]
+    parts += [f'{name}={describe(annotation)}' for name, annotation in f.__annotations__.items()]
+    digest = sha1(code.co_code)
+    digest.update('\n'.join(parts).encode())
+
+    return digest.hexdigest()
+
+
+def annotation_models(annotation) -> Iterator[type]:
+    if isinstance(annotation, dict):
+        for value in annotation.values():
+            yield from annotation_models(value)
+    elif isinstance(annotation, (list, tuple)):
+        for value in annotation:
+            yield from annotation_models(value)
+    elif get_args(annotation):
+        yield from annotation_models(get_args(annotation))
+    elif isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        yield annotation
+
+
+def schemas_key(api_handler) -> str:
+    """
+    Hash of the JSON schema of every model the routes read or return, with their constraints, defaults and
+    docstrings and those of the models nested in them.
+    """
+    digest = sha1()
+
+    for path_handler in api_handler.router:
+        for model in annotation_models(list(unwrap(path_handler.method).__annotations__.values())):
+            try:
+                schema = model_schema(model, '{model}')
+            except (TypeError, ValueError):
+                # Fields without a JSON schema, the model can't be in the spec either
+                schema = None
+
+            digest.update(json.dumps([model.__qualname__, schema], sort_keys=True, default=repr).encode())
+
+    return digest.hexdigest()
+
+
+def defaults(f: Callable) -> dict:
+    code = f.__code__
+    positional = code.co_varnames[:code.co_argcount]
+    values = dict(zip(positional[len(positional) - len(f.__defaults__ or ()):], f.__defaults__ or ()))
+    values.update(f.__kwdefaults__ or {})
+
+    return values
+
+
+def spec_key(api_handler) -> str:
+    return repr([
+        [
+            getattr(api_handler, attribute, None)
+            for attribute in ['name', 'description', 'version', 'security', 'default_security', 'use_camel_case']
+        ],
+        [(h.path, h.http_method, h.tags, h.security) for _, _, h in api_handler.router.routes]
+    ])
+
+
+def compile_handler(api_handler) -> dict:
+    """
+    Builds the artifact of a handler out of plain tuples, strings and bytes: the binding recipe of every route, keyed
+    by method and path with the fingerprint of its endpoint, and the spec documents when the handler serves them.
+
+    The routing trie and the enum lookup tables are not part of it, they are rebuilt from the registered routes and
+    the restored recipes when the handler starts.
+    """
+    routes = {}
+
+    for tokens, method, path_handler in api_handler.router.routes:
+        routes[(method, '/' + '/'.join(tokens))] = tuple(Route(
+            fingerprint(path_handler.method),
+            tuple(tuple(make_recipe(name, p.annotation)) for name, p in path_handler.sig.parameters.items())
+        ))
+
+    artifact = {'format': FORMAT, 'routes': routes, 'spec_key': spec_key(api_handler), 'spec': {}}
+
+    if hasattr(api_handler, 'spec_document'):
+        artifact['schemas_key'] = schemas_key(api_handler)
+
+        for data_format in Formats:
+            artifact['spec'][data_format.value] = tuple(api_handler.spec_document(data_format))
+
+    return artifact
+
+
+def save(api_handler, file_name: str = COMPILED):
+    with open(file_name, 'wb') as dst:
+        marshal.dump(compile_handler(api_handler), dst)
+
+
+def load(file_name: str) -> Optional[dict]:
+    """
+    Reads an artifact written by `save`, returns None when it is missing, unreadable or from another format.
+
+    Artifacts are marshal data, reading one never runs code or imports modules. They are still trusted like the
+    application code itself: a tampered artifact can bind parameters differently or serve another spec.
+    """
+    try:
+        with open(file_name, 'rb') as src:
+            artifact = marshal.load(src)
+    except (OSError, EOFError, ValueError, TypeError):
+        return None
+
+    return artifact if isinstance(artifact, dict) and artifact.get('format') == FORMAT else None
+
+
+def restore_plan(artifact: dict, method: str, path: str, f: Callable) -> Optional[Tuple[Binding, ...]]:
+    """
+    Rebuilds the binding plan of a route from the artifact, None when the route is not in it or its endpoint
+    changed since it was compiled.
+    """
+    route = artifact['routes'].get((method.upper(), path))
+
+    if route is None or Route(*route).fingerprint != fingerprint(f):
+        return None
+
+    f = unwrap(f)
+    values = defaults(f)
+
+    return tuple(
+        restore_binding(Recipe(*recipe), f.__annotations__.get(recipe[0], _empty), values.get(recipe[0], _empty))
+        for recipe in Route(*route).recipes
+    )
+
+
+def stale_routes(artifact: dict, api_handler) -> list:
+    stale = []
+
+    for tokens, method, path_handler in api_handler.router.routes:
+        route = artifact['routes'].get((method, '/' + '/'.join(tokens)))
+
+        if route is None or Route(*route).fingerprint != fingerprint(path_handler.method):
+            stale.append((method, '/' + '/'.join(tokens)))
+
+    return stale
+
+
+def spec_documents(artifact: dict, api_handler) -> dict:
+    """
+    Returns the compiled spec documents when every registered route came from the artifact unchanged and the
+    schemas of their models are the ones it was compiled with.
+    """
+    if api_handler.stale or len(artifact['routes']) != len(api_handler.router.routes):
+        return {}
+    elif artifact['spec_key'] != spec_key(api_handler):
+        return {}
+    elif artifact.get('schemas_key') != schemas_key(api_handler):
+        return {}
+
+    return artifact['spec']
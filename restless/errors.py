@@ -12,3 +12,15 @@ class Missing(Exception):
 
 class BadRequest(Exception):
     pass
+
+
+class InvalidResponse(AssertionError):
+    pass
+
+
+class PayloadTooLarge(BadRequest):
+    pass
+
+
+class HeadersTooLarge(BadRequest):
+    pass
@@ -0,0 +1,120 @@
+import os
+from binascii import b2a_base64
+from io import RawIOBase, SEEK_CUR, SEEK_END, SEEK_SET
+from mmap import mmap
+from typing import IO, Iterator, Union
+
+CHUNK_SIZE = 64 * 1024
+BUFFERS = (bytes, bytearray, memoryview, mmap)
+
+
+class BufferReader(RawIOBase):
+    """
+    Read-only, seekable file over a buffer, reads copy only the requested slice.
+    """
+
+    def __init__(self, buffer):
+        self.view = memoryview(buffer).cast('B')
+        self.position = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def readinto(self, target) -> int:
+        chunk = self.view[self.position:self.position + len(target)]
+        target[:len(chunk)] = chunk
+        self.position += len(chunk)
+
+        return len(chunk)
+
+    def seek(self, offset: int, whence: int = SEEK_SET) -> int:
+        base = {SEEK_SET: 0, SEEK_CUR: self.position, SEEK_END: len(self.view)}[whence]
+        self.position = max(0, base + offset)
+
+        return self.position
+
+    def tell(self) -> int:
+        return self.position
+
+
+class FileBody:
+    """
+    Binary response body read from a path, an open binary file, an mmap or any other buffer.
+
+    Interfaces send it in chunks instead of loading it as bytes first: Flask through `wsgi.file_wrapper` with
+    `Range` support, AWS by base64 encoding one chunk at a time.
+    """
+
+    def __init__(
+            self, source: Union[str, os.PathLike, IO, bytes, bytearray, memoryview, mmap],
+            content_type: str = 'application/octet-stream', filename: str = None, chunk_size: int = CHUNK_SIZE
+    ):
+        self.source = source
+        self.content_type = content_type
+        self.filename = filename
+        self.chunk_size = chunk_size
+
+    @property
+    def headers(self) -> dict:
+        headers = {'Content-Type': self.content_type}
+
+        if self.filename:
+            headers['Content-Disposition'] = f'attachment; filename="{self.filename}"'
+
+        return headers
+
+    @property
+    def size(self) -> int:
+        if isinstance(self.source, BUFFERS):
+            return memoryview(self.source).nbytes
+        elif isinstance(self.source, (str, os.PathLike)):
+            return os.path.getsize(self.source)
+
+        position = self.source.tell()
+        size = self.source.seek(0, SEEK_END)
+        self.source.seek(position)
+
+        return size - position
+
+    def open(self) -> IO:
+        if isinstance(self.source, BUFFERS):
+            return BufferReader(self.source)
+        elif isinstance(self.source, (str, os.PathLike)):
+            return open(self.source, 'rb')
+
+        return self.source
+
+    def iter_chunks(self, chunk_size: int = None) -> Iterator[bytes]:
+        chunk_size = chunk_size or self.chunk_size
+
+        if isinstance(self.source, BUFFERS):
+            view = memoryview(self.source).cast('B')
+
+            for i in range(0, len(view), chunk_size):
+                yield view[i:i + chunk_size]
+        else:
+            with self.open() as file:
+                yield from iter(lambda: file.read(chunk_size), b'')
+
+    def b64encode(self) -> str:
+        """
+        Base64 encodes the body chunk by chunk, chunks are multiples of 3 bytes so they encode without padding.
+        """
+        encoded = bytearray()
+        chunk_size = self.chunk_size - self.chunk_size % 3
+        pending = b''
+
+        for chunk in self.iter_chunks(chunk_size):
+            if pending or len(chunk) % 3:
+                chunk = pending + bytes(chunk)
+                cut = len(chunk) - len(chunk) % 3
+                chunk, pending = chunk[:cut], chunk[cut:]
+
+            encoded += b2a_base64(chunk, newline=False)
+
+        encoded += b2a_base64(pending, newline=False)
+
+        return encoded.decode('ascii')
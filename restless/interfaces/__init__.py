@@ -1,18 +1,153 @@
 from dataclasses import dataclass
 from abc import abstractmethod
+from collections.abc import Mapping
+from functools import cached_property, lru_cache
+from typing import IO, List, Tuple, Union
+from restless.errors import BadRequest
+from restless.util import KEY_CACHE_SIZE, camel_to_snake, to_camel
+
+
+def header_key(name: str) -> str:
+    # X-Request-Id, x_request_id and xRequestId all resolve to the same header
+    return name.replace('-', '').replace('_', '').lower()
+
+
+@lru_cache(maxsize=KEY_CACHE_SIZE)
+def header_spellings(name: str) -> Tuple[str, ...]:
+    """
+    Usual spellings of a header declared as `name` (x_request_id: X-Request-Id, x-request-id, xRequestId), tried
+    before falling back to a case insensitive lookup.
+    """
+    dashed = name.replace('_', '-')
+
+    return tuple(dict.fromkeys([name, dashed.lower(), dashed.title(), to_camel(name)]))
+
+
+class Headers(Mapping):
+    """
+    Read-only view of the request headers ignoring case, dashes and underscores, so a header declared as
+    `x_request_id` or `xRequestId` reads `X-Request-Id`.
+
+    Lookups first try the usual spellings of the name, which bindings compute once per route, so reading the declared
+    headers does not depend on how many were sent. Only a name none of them match indexes every header by
+    `header_key`, once per request. Values repeated in `multi_value` (ex: API Gateway's multiValueHeaders) are kept
+    for `get_all`.
+    """
+    __slots__ = ('_headers', '_multi_value', '_index')
+
+    def __init__(self, headers: Mapping = None, multi_value: Mapping = None):
+        self._headers = headers or {}
+        self._multi_value = multi_value or {}
+        self._index = None
+
+    def _lookup(self, name: Union[str, Tuple[str, ...]]) -> tuple:
+        value = values = None
+
+        for spelling in header_spellings(name) if isinstance(name, str) else name:
+            value = self._headers.get(spelling) if value is None else value
+            values = self._multi_value.get(spelling) if values is None else values
+
+        if value is not None or values is not None:
+            return value, values
+
+        if self._index is None:
+            self._index = (
+                {header_key(k): v for k, v in self._headers.items()},
+                {header_key(k): v for k, v in self._multi_value.items()}
+            )
+
+        key = header_key(name if isinstance(name, str) else name[0])
+
+        return self._index[0].get(key), self._index[1].get(key)
+
+    def __getitem__(self, name: Union[str, Tuple[str, ...]]) -> str:
+        value, values = self._lookup(name)
+
+        if value is None:
+            if not values:
+                raise KeyError(name)
+
+            value = values[-1]
+
+        return value
+
+    def get_all(self, name: Union[str, Tuple[str, ...]]) -> List[str]:
+        """
+        Every value of a header, repeated headers and comma separated values are both split.
+        """
+        value, values = self._lookup(name)
+        values = values or ([] if value is None else [value])
+
+        return [v.strip() for item in values for v in item.split(',')]
+
+    def __iter__(self):
+        return iter(dict.fromkeys([*self._multi_value, *self._headers.keys()]))
+
+    def __bool__(self) -> bool:
+        return bool(self._headers) or bool(self._multi_value)
+
+    def __len__(self) -> int:
+        return len(set(self._multi_value) | set(self._headers.keys()))
+
+    def __repr__(self) -> str:
+        return f'Headers({dict(self)!r})'
 
 
 @dataclass
 class BaseRequest:
     path: str
-    body: (dict, bytes)
+    payload: (dict, bytes)
     method: str
     headers: dict
     query: dict
+    multi_query: dict = None
+    use_camel_case: bool = False
 
     def __init__(self, raw):
         self._raw = raw
 
+    def snake_case(self, values: dict) -> dict:
+        # Interfaces decode headers and query strings on first access, routes not reading them never convert them
+        return camel_to_snake(values) if self.use_camel_case else values
+
+    def loads(self, data: Union[str, bytes]):
+        # Malformed bodies are the client's fault, they are answered with a 400 rather than a server error
+        try:
+            return self.serializer.loads(data)
+        except ValueError:
+            raise BadRequest('The request body is not valid JSON') from None
+
+    @property
+    def raw_query(self) -> dict:
+        # Query string as the client sent it, camelCase routes look their declared parameters up in it rather than
+        # converting every key of `query`
+        return self.query
+
+    @property
+    def raw_multi_query(self) -> dict:
+        return self.multi_query
+
+    @cached_property
+    def body(self) -> (dict, bytes):
+        # Routes with body models read `payload` through the model aliases, the whole tree is only converted on demand
+        return camel_to_snake(self.payload) if self.use_camel_case else self.payload
+
+    @property
+    def size(self) -> int:
+        # Body size in bytes, None when the interface can not tell it
+        return None
+
+    @property
+    def form_body(self) -> Union[bytes, IO]:
+        # Multipart body for FormData, interfaces with a file-like input stream hand it over instead of buffering it
+        return self.body
+
+    @property
+    def json_body(self) -> Union[str, bytes]:
+        # Undecoded JSON body, so its nesting can be checked before it is decoded. None when there is none or the
+        # interface can not tell
+        return None
+
     @property
     @abstractmethod
     def authorizer(self) -> dict:
@@ -0,0 +1,253 @@
+from restless import Handler, SpecMixin
+from restless.serializers import Serializer, get_serializer
+from restless.errors import PayloadTooLarge
+from restless.files import BUFFERS, FileBody
+from restless.limits import Limits
+from restless.interfaces import BaseRequest, Headers
+from functools import cached_property
+from typing import Iterator
+from urllib.parse import parse_qs, unquote
+from pydantic import BaseModel
+
+MAX_MEMORY = 1024 * 1024
+
+
+async def read_body(receive, max_memory: int = MAX_MEMORY, max_size: int = None):
+    """
+    Reads the request body from the ASGI `receive` channel as it arrives. Bodies bigger than `max_memory` are
+    written to a temporary file and returned as a read-only mmap of it, bodies bigger than `max_size` raise
+    PayloadTooLarge as soon as they get there.
+    """
+    body, file, size = bytearray(), None, 0
+
+    while True:
+        message = await receive()
+
+        if message['type'] == 'http.disconnect':
+            raise ConnectionError('Client disconnected')
+
+        chunk = message.get('body', b'')
+        size += len(chunk)
+
+        if max_size is not None and size > max_size:
+            if file is not None:
+                file.close()
+
+            raise PayloadTooLarge(f'The request body can not be larger than {max_size} bytes')
+        elif file is not None:
+            file.write(chunk)
+        elif len(body) + len(chunk) > max_memory:
+            from tempfile import TemporaryFile
+
+            file = TemporaryFile()
+            file.write(body)
+            file.write(chunk)
+            body = None
+        else:
+            body += chunk
+
+        if not message.get('more_body'):
+            break
+
+    if file is None:
+        return bytes(body)
+
+    from mmap import mmap, ACCESS_READ
+
+    file.flush()
+    buffer = mmap(file.fileno(), 0, access=ACCESS_READ)
+    file.close()
+
+    return buffer
+
+
+class Request(BaseRequest):
+    """
+    Request built from an ASGI http scope and the body read from its `receive` channel, headers, query string and
+    JSON bodies are parsed on first access.
+    """
+
+    @property
+    def authorizer(self) -> dict:
+        return dict(token=self.headers.get("authorization", ''))
+
+    @property
+    def size(self) -> int:
+        return len(self._raw['body'] or b'')
+
+    @cached_property
+    def json_body(self) -> bytes:
+        body = self._raw['body']
+
+        if not body or 'json' not in self.content_type:
+            return None
+
+        # Spooled bodies are mmaps, JSON decoders only take str and bytes
+        return body if isinstance(body, bytes) else bytes(body)
+
+    def __init__(self, raw, use_camel_case=True, serializer: Serializer = None):
+        super().__init__(raw)
+        scope = raw['scope']
+
+        self.serializer = get_serializer(serializer)
+        self.path = unquote(scope['path'])
+        self.method = scope['method']
+        self.use_camel_case = use_camel_case
+
+    @cached_property
+    def headers(self) -> Headers:
+        headers = {}
+
+        for key, value in self._raw['scope'].get('headers', []):
+            key, value = key.decode('latin-1').lower(), value.decode('latin-1')
+            headers[key] = f'{headers[key]},{value}' if key in headers else value
+
+        return Headers(headers)
+
+    @cached_property
+    def content_type(self) -> str:
+        return self.headers.get('content-type', '')
+
+    @cached_property
+    def raw_multi_query(self) -> dict:
+        return parse_qs(self._raw['scope'].get('query_string', b'').decode('latin-1'))
+
+    @cached_property
+    def raw_query(self) -> dict:
+        return {k: v[0] for k, v in self.raw_multi_query.items()}
+
+    @cached_property
+    def multi_query(self) -> dict:
+        return self.snake_case(self.raw_multi_query)
+
+    @cached_property
+    def query(self) -> dict:
+        return {k: v[0] for k, v in self.multi_query.items()}
+
+    @cached_property
+    def payload(self):
+        body = self._raw['body']
+
+        if not body:
+            return None
+        elif 'json' in self.content_type:
+            return self.loads(self.json_body)
+
+        return body
+
+
+class Response:
+    """
+    ASGI response: the status and headers are sent first, then the body one chunk at a time, so streamed routes and
+    FileBody responses never have to be held in memory.
+    """
+
+    def __init__(self, body="", status_code=200, headers=None, use_camel_case=True, serializer: Serializer = None):
+        serializer = get_serializer(serializer)
+        self.status_code = status_code
+        self.headers = dict(headers or {})
+        self.size = None
+
+        if isinstance(body, FileBody):
+            self.headers = {**body.headers, 'Content-Length': str(body.size), **self.headers}
+            self.chunks = (bytes(chunk) for chunk in body.iter_chunks())
+            self.size = body.size
+        elif isinstance(body, BUFFERS):
+            self.chunks = iter([bytes(body)])
+            self.size = len(body)
+        elif isinstance(body, str):
+            data = body.encode()
+            self.chunks = iter([data])
+            self.size = len(data)
+        elif isinstance(body, (dict, BaseModel, list, tuple)):
+            self.headers.setdefault('Content-Type', 'application/json')
+            data = serializer.dumpb_body(body, use_camel_case)
+            self.chunks = iter([data])
+            self.size = len(data)
+        elif isinstance(body, Iterator):
+            self.headers.setdefault('Content-Type', 'application/json')
+            self.chunks = (chunk.encode() for chunk in serializer.iter_json(body, use_camel_case))
+        else:
+            raise Exception("Unsupported")
+
+    @property
+    def raw_headers(self) -> list:
+        return [(k.lower().encode('latin-1'), str(v).encode('latin-1')) for k, v in self.headers.items()]
+
+    async def __call__(self, send):
+        await send({'type': 'http.response.start', 'status': self.status_code, 'headers': self.raw_headers})
+
+        for chunk in self.chunks:
+            if chunk:
+                await send({'type': 'http.response.body', 'body': chunk, 'more_body': True})
+
+        await send({'type': 'http.response.body', 'body': b'', 'more_body': False})
+
+
+class AsgiHandler(SpecMixin, Handler):
+    """
+    Exposes the handler as an ASGI 3 application through `app`, to run under uvicorn, hypercorn or any other ASGI
+    server. Requests are dispatched with `call_async`.
+    """
+
+    def __init__(
+            self, name, description, version, security=None, default_security=None, camel_case_interface=True,
+            request_class=Request, response_class=Response, serializer='json', max_workers: int = None,
+            max_memory: int = MAX_MEMORY, compiled: str = None, timing_hooks=None, server_timing=False,
+            limits: Limits = None
+    ):
+        self.security = security or []
+        self.default_security = default_security or []
+        self.name = name
+        self.description = description
+        self.version = version
+        self.max_memory = max_memory
+
+        super().__init__(
+            request=request_class, response=response_class, use_camel_case=camel_case_interface,
+            serializer=serializer, max_workers=max_workers, compiled=compiled, timing_hooks=timing_hooks,
+            server_timing=server_timing, limits=limits
+        )
+
+        self.add_spec_route()
+
+    async def lifespan(self, receive, send):
+        while True:
+            message = await receive()
+
+            if message['type'] == 'lifespan.startup':
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                if self._executor is not None:
+                    self._executor.shutdown(wait=False)
+                    self._executor = None
+
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+    async def app(self, scope, receive, send):
+        if scope['type'] == 'lifespan':
+            return await self.lifespan(receive, send)
+
+        assert scope['type'] == 'http', f"Unsupported ASGI scope '{scope['type']}'"
+
+        # Routed ahead of reading the body: missing routes do not wait for it and limits stop reading it early
+        match = self.route(unquote(scope['path']), scope['method'])
+        path_handler = match[0]
+        limits = path_handler.limits if path_handler is not None else None
+
+        try:
+            body = b'' if path_handler is None else await read_body(
+                receive, self.max_memory, limits.max_body_size if limits else None
+            )
+        except PayloadTooLarge as e:
+            return await self.error_response(e)(send)
+
+        try:
+            response = await self.call_async({'scope': scope, 'body': body}, match)
+        except Exception:
+            response = self.make_response({"error": "Internal Server Error"}, status_code=500)
+            await response(send)
+            raise
+
+        await response(send)
@@ -1,9 +1,24 @@
-from restless.util import camel_to_snake, snake_to_camel, UniversalEncoder
-from restless.interfaces import BaseRequest
+from restless.interfaces import BaseRequest, Headers
+from restless.serializers import Serializer, get_serializer
+from restless.files import BUFFERS, FileBody
+from restless.timing import Timings
 import json
+import sys
+from functools import cached_property
+from io import BytesIO
+from time import time
 from urllib.parse import unquote_plus
-from base64 import b64decode, b64encode
-from typing import Iterable
+from base64 import b64decode
+from binascii import a2b_base64
+from typing import Iterable, Iterator, TextIO
+
+
+def body_size(body: str, base64: bool) -> int:
+    # Bytes of a body as the client sends or receives them, API Gateway decodes base64 bodies on the way
+    if base64:
+        return len(body) * 3 // 4 - body.count('=', -2)
+
+    return len(body) if body.isascii() else len(body.encode())
 
 
 class Request(BaseRequest):
@@ -11,34 +26,71 @@ class Request(BaseRequest):
     def authorizer(self) -> dict:
         return self._raw.get("requestContext", {}).get("authorizer")
 
-    def __init__(self, raw, use_camel_case=True):
+    @property
+    def size(self) -> int:
+        # Bytes the client sent, without decoding the body
+        return body_size(self._raw.get("body") or '', self._raw.get('isBase64Encoded'))
+
+    @property
+    def json_body(self) -> str:
+        return None if self._raw.get('isBase64Encoded') else self._raw.get("body") or None
+
+    def __init__(self, raw, use_camel_case=True, serializer: Serializer = None):
         super().__init__(raw)
         self.path = unquote_plus(raw.get("path") or raw.get("rawPath"))
+        self.method = raw.get("httpMethod") or raw.get('requestContext', {}).get("http", {}).get("method")
+        self.use_camel_case = use_camel_case
+        self.serializer = get_serializer(serializer)
 
-        if raw.get('isBase64Encoded'):
-            self.body = b64decode(raw["body"].encode()) if raw.get("body") else None
-        else:
-            self.body = json.loads(raw["body"]) if raw.get("body") else None
+    @cached_property
+    def payload(self) -> (dict, bytes):
+        if not self._raw.get("body"):
+            return None
+        elif self._raw.get('isBase64Encoded'):
+            return a2b_base64(self._raw["body"])
 
-        self.method = raw.get("httpMethod") or raw.get('requestContext', {}).get("http", {}).get("method")
-        self.headers = raw.get("headers", {})
-        self.query = raw.get("queryStringParameters") or {}
+        return self.loads(self._raw["body"])
+
+    @cached_property
+    def headers(self) -> Headers:
+        return Headers(self._raw.get("headers"), self._raw.get("multiValueHeaders"))
+
+    @property
+    def raw_query(self) -> dict:
+        return self._raw.get("queryStringParameters") or {}
+
+    @property
+    def raw_multi_query(self) -> dict:
+        return self._raw.get("multiValueQueryStringParameters") or {}
+
+    @cached_property
+    def query(self) -> dict:
+        return self.snake_case(self.raw_query)
 
-        if use_camel_case:
-            for member in ['body', 'headers', 'query']:
-                setattr(self, member, camel_to_snake(getattr(self, member)))
+    @cached_property
+    def multi_query(self) -> dict:
+        return self.snake_case(self.raw_multi_query)
 
 
 class Response(dict):
-    def __init__(self, body="", status_code=200, headers=None, use_camel_case=True):
+    def __init__(self, body="", status_code=200, headers=None, use_camel_case=True, serializer: Serializer = None):
+        serializer = get_serializer(serializer)
         super().__init__(
             statusCode=status_code,
             headers=headers or {}
         )
 
-        if isinstance(body, bytes):
+        if isinstance(body, BUFFERS):
             self["isBase64Encoded"] = True
-            self["body"] = b64encode(body).decode()
+            self["body"] = FileBody(body).b64encode()
+        elif isinstance(body, FileBody):
+            self["isBase64Encoded"] = True
+            self["headers"] = {**body.headers, **self["headers"]}
+            self["body"] = body.b64encode()
+        elif isinstance(body, Iterator):
+            self["isBase64Encoded"] = False
+            self["headers"].setdefault("Content-Type", "application/json")
+            self["body"] = ''.join(serializer.iter_json(body, use_camel_case))
         elif isinstance(body, (dict, Iterable)):
             self["isBase64Encoded"] = False
 
@@ -48,11 +100,130 @@ class Response(dict):
                 if "Content-Type" not in self["headers"]:
                     self["headers"]["Content-Type"] = "application/json"
 
-                if use_camel_case:
-                    body_ = snake_to_camel(body)
-                else:
-                    body_ = body
-
-                self["body"] = json.dumps(body_, cls=UniversalEncoder)
+                self["body"] = serializer.dumps_body(body, use_camel_case)
         else:
             raise Exception("Unsupported")
+
+    @property
+    def status_code(self) -> int:
+        return self["statusCode"]
+
+    @property
+    def headers(self) -> dict:
+        return self["headers"]
+
+    @property
+    def size(self) -> int:
+        return body_size(self.get("body") or '', self.get("isBase64Encoded"))
+
+
+class StreamingResponse:
+    """
+    Response for Lambda response streaming (function URLs with InvokeMode RESPONSE_STREAM).
+
+    Follows the HTTP integration format: a JSON prelude with the status code and headers, 8 null bytes and then the
+    body, written chunk by chunk to the runtime's response stream as the endpoint produces records.
+    """
+    CONTENT_TYPE = "application/vnd.awslambda.http-integration-response"
+    DELIMITER = b"\x00" * 8
+
+    def __init__(self, body="", status_code=200, headers=None, use_camel_case=True, serializer: Serializer = None):
+        self.status_code = status_code
+        self.headers = headers or {}
+
+        if isinstance(body, Iterator):
+            self.headers.setdefault("Content-Type", "application/json")
+            self.chunks = (chunk.encode() for chunk in get_serializer(serializer).iter_json(body, use_camel_case))
+        elif isinstance(body, (FileBody, *BUFFERS)):
+            if isinstance(body, FileBody):
+                self.headers = {**body.headers, **self.headers}
+            else:
+                body = FileBody(body)
+
+            self.chunks = (bytes(chunk) for chunk in body.iter_chunks())
+        else:
+            buffered = Response(body, status_code, self.headers, use_camel_case, serializer)
+            self.headers = buffered["headers"]
+            self.chunks = iter([
+                b64decode(buffered["body"]) if buffered["isBase64Encoded"] else buffered["body"].encode()
+            ])
+
+    @property
+    def prelude(self) -> bytes:
+        return json.dumps({"statusCode": self.status_code, "headers": self.headers}).encode()
+
+    def __iter__(self) -> Iterator[bytes]:
+        yield self.prelude + self.DELIMITER
+        yield from self.chunks
+
+    def write_to(self, response_stream):
+        for chunk in self:
+            response_stream.write(chunk)
+
+        response_stream.close()
+
+
+class LocalResponseStream(BytesIO):
+    """
+    Stand-in for the runtime's response stream, keeps what was written so it can be inspected locally.
+    """
+    content_type = None
+
+    def set_content_type(self, content_type: str):
+        self.content_type = content_type
+
+    def close(self):
+        self.result = self.getvalue()
+        super().close()
+
+    @property
+    def response(self) -> dict:
+        prelude, body = self.result.split(StreamingResponse.DELIMITER, 1)
+        return dict(json.loads(prelude), body=body)
+
+
+def streaming(handler):
+    """
+    Wraps a Handler built with StreamingResponse as a `(event, response_stream, context)` streaming entry point.
+    """
+    def entry_point(event, response_stream, context=None):
+        response_stream.set_content_type(StreamingResponse.CONTENT_TYPE)
+        handler(event).write_to(response_stream)
+
+    return entry_point
+
+
+class EmbeddedMetrics:
+    """
+    Timing hook writing the timings of every request as a CloudWatch Embedded Metric Format line to stdout, which
+    Lambda ships to CloudWatch Logs where each stage becomes a metric in milliseconds, along with the request and
+    response sizes in bytes, with the route as dimension:
+
+        handler = Handler(Request, Response, timing_hooks=[EmbeddedMetrics('orders-api')])
+    """
+
+    def __init__(self, namespace: str = 'restless', stream: TextIO = None):
+        self.namespace = namespace
+        self.stream = stream
+
+    def document(self, timings: Timings) -> dict:
+        metrics = dict(timings.stages, total=timings.total)
+        definitions = [{'Name': name, 'Unit': 'Milliseconds'} for name in metrics]
+
+        for name, size in [('request_size', timings.request_size), ('response_size', timings.response_size)]:
+            if size is not None:
+                metrics[name] = size
+                definitions.append({'Name': name, 'Unit': 'Bytes'})
+
+        return {
+            '_aws': {
+                'Timestamp': int(time() * 1000),
+                'CloudWatchMetrics': [{'Namespace': self.namespace, 'Dimensions': [['Route']], 'Metrics': definitions}]
+            },
+            'Route': timings.route or 'unmatched',
+            'Status': timings.status,
+            **metrics
+        }
+
+    def __call__(self, timings: Timings):
+        (self.stream or sys.stdout).write(json.dumps(self.document(timings)) + '\n')
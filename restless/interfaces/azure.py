@@ -1,18 +1,27 @@
-import json
 from azure.functions import HttpRequest, HttpResponse
-from restless.util import snake_to_camel, camel_to_snake, UniversalEncoder
+from restless.util import snake_to_camel
+from restless.serializers import Serializer, get_serializer
+from restless.files import BUFFERS, FileBody
 import re
+from functools import cached_property
 from urllib.parse import unquote_plus
-from restless.interfaces import BaseRequest
-from typing import Iterable
+from restless.interfaces import BaseRequest, Headers
+from typing import Iterable, Iterator
 
 
-def to_camel(body: [str, bytes]):
+def to_camel(body: [str, bytes], serializer: Serializer = None):
+    """
+    camelCases the keys of an already encoded JSON body, returns the same type it was given.
+    """
+    serializer = get_serializer(serializer)
+
     try:
-        return json.dumps(snake_to_camel(json.loads(body)), cls=UniversalEncoder)
-    except json.decoder.JSONDecodeError:
+        converted = snake_to_camel(serializer.loads(body))
+    except ValueError:
         return body
 
+    return serializer.dumpb(converted) if isinstance(body, bytes) else serializer.dumps(converted)
+
 
 class Request(BaseRequest):
     BASE_PATH_RE = re.compile('https://.*/api')
@@ -21,49 +30,78 @@ class Request(BaseRequest):
     def authorizer(self) -> dict:
         return self._raw.params.get('code')
 
-    def __init__(self, req: HttpRequest, use_camel_case=False):
+    @property
+    def size(self) -> int:
+        return len(self._raw.get_body() or b'')
+
+    @property
+    def json_body(self) -> bytes:
+        return (self._raw.get_body() or None) if 'json' in self.headers.get('content-type', '') else None
+
+    def __init__(self, req: HttpRequest, use_camel_case=False, serializer: Serializer = None):
         super().__init__(req)
         self.method = req.method
-        self.headers = dict(**req.headers)
-        self.query = dict(**req.params)
         self.path = unquote_plus(self.BASE_PATH_RE.sub('', req.url).split('?')[0])
 
-        try:
-            self.body = req.get_json()
-
-            if use_camel_case:
-                self.body = camel_to_snake(self.body)
-        except ValueError:
-            self.body = req.get_body()
+        self.use_camel_case = use_camel_case
+        self.serializer = get_serializer(serializer)
 
+    @cached_property
+    def headers(self) -> Headers:
+        return Headers(self._raw.headers)
 
-class Response(HttpResponse):
-    def __init__(self, *args, use_camel_case=False, **kwargs):
-        if 'body' in kwargs:
-            args = [kwargs['body']]
-            del kwargs['body']
-        else:
-            args = list(args)
+    @cached_property
+    def query(self) -> dict:
+        return dict(**self._raw.params)
 
-            if not args:
-                args[0] = b''
+    @cached_property
+    def payload(self) -> (dict, bytes):
+        # Only parsed when a bound parameter needs it
+        try:
+            return self.serializer.loads(self._raw.get_body())
+        except ValueError:
+            return self._raw.get_body()
 
-        if isinstance(args[0], (dict, Iterable)) and not isinstance(args[0], (str, bytes)):
-            args[0] = json.dumps(args[0], cls=UniversalEncoder)
 
-            if 'headers' not in kwargs:
-                kwargs['headers'] = {}
+class Response(HttpResponse):
+    def __init__(self, *args, use_camel_case=False, serializer: Serializer = None, **kwargs):
+        serializer = get_serializer(serializer)
+        args = list(args)
 
+        if 'body' in kwargs:
+            args = [kwargs.pop('body')]
+        elif not args:
+            args = [b'']
+
+        body = args[0]
+
+        if isinstance(body, FileBody):
+            # Azure Functions only takes the whole body as bytes
+            kwargs['headers'] = {**body.headers, **(kwargs.get('headers') or {})}
+            body = b''.join(body.iter_chunks())
+        elif isinstance(body, BUFFERS):
+            body = bytes(body)
+
+        if isinstance(body, (dict, Iterable)) and not isinstance(body, (str, bytes)):
+            if isinstance(body, Iterator):
+                # Azure Functions buffers the whole body, records are still encoded without an intermediate list
+                body = ''.join(serializer.iter_json(body, use_camel_case)).encode()
+            else:
+                body = serializer.dumpb_body(body, use_camel_case)
+
+            kwargs['headers'] = kwargs.get('headers') or {}
             kwargs['headers']["Content-Type"] = "application/json"
+        elif use_camel_case and (kwargs.get('headers') or {}).get("Content-Type") == "application/json":
+            body = to_camel(body, serializer)
 
-        if use_camel_case and kwargs.get('headers', {}).get("Content-Type") == "application/json":
-            args[0] = json.dumps(snake_to_camel(json.loads(args[0])), cls=UniversalEncoder)
-
-        if not isinstance(args[0], bytes):
-            args[0] = args[0].encode('utf-8')
+        args[0] = body.encode('utf-8') if isinstance(body, str) else body
 
         super().__init__(*args, **kwargs)
 
+    @property
+    def size(self) -> int:
+        return len(self.get_body())
+
     @property
     def dict(self) -> dict:
         return {
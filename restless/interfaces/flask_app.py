@@ -1,19 +1,22 @@
-from restless import Handler
-from restless.util import camel_to_snake, snake_to_camel
-from restless.openapi import make_spec, Formats
-import json
+from restless import Handler, SpecMixin
+from restless.util import Formats
+from restless.serializers import Serializer, get_serializer
 from urllib.parse import unquote_plus
 from flask import Response as FResponse
-from flask import Flask, request
+from flask import Flask, request, has_request_context
+from werkzeug.wsgi import wrap_file
 import os
-from werkzeug.exceptions import BadRequest
+from functools import cached_property
+from typing import IO, Iterator, Union
 from pydantic import BaseModel
-from restless.parameters import PathParameter
+from restless.interfaces import BaseRequest, Headers
+from restless.files import BUFFERS, FileBody
+from restless.limits import Limits
 
 THIS_FOLDER = os.path.dirname(__file__)
 
 
-class Request:
+class Request(BaseRequest):
     IN = "body"
     TYPE = dict
 
@@ -21,61 +24,124 @@ class Request:
     def authorizer(self) -> dict:
         return dict(token=self.headers.get("Authorization", ''))
 
-    def __init__(self, value, use_camel_case=True):
-        self.path = unquote_plus(value.full_path.strip('?'))
+    @property
+    def size(self) -> int:
+        return self._raw.content_length
 
-        try:
-            self.body = value.get_json(force=True)
-        except BadRequest:
-            self.body = value.data
+    @property
+    def json_body(self) -> bytes:
+        return (self._raw.get_data() or None) if self._raw.is_json else None
 
-        self.body = value.data
+    def __init__(self, value, use_camel_case=True, serializer: Serializer = None):
+        super().__init__(value)
+        self.path = unquote_plus(value.path)
         self.method = value.method
-        self.headers = value.headers
-        self.query = value.args
+        self.use_camel_case = use_camel_case
+        self.serializer = get_serializer(serializer)
+
+    @property
+    def form_body(self) -> Union[bytes, IO]:
+        # The input stream is bounded by the Content-Length, unless `payload` already read it
+        if 'payload' in self.__dict__ or self._raw.mimetype != 'multipart/form-data':
+            return self.payload
 
-        if use_camel_case:
-            for member in ['body', 'headers', 'query']:
-                setattr(self, member, camel_to_snake(getattr(self, member)))
+        return self._raw.stream
+
+    @cached_property
+    def payload(self) -> (dict, bytes):
+        # Read before werkzeug parses form data, multipart bodies are left to FormData
+        data = self._raw.get_data()
+
+        if not data:
+            return None
+        elif self._raw.is_json:
+            return self.loads(data)
+
+        return data
+
+    @cached_property
+    def headers(self) -> Headers:
+        return Headers(self._raw.headers)
+
+    @property
+    def raw_query(self) -> dict:
+        return self._raw.args
+
+    @cached_property
+    def raw_multi_query(self) -> dict:
+        return self._raw.args.to_dict(flat=False)
+
+    @cached_property
+    def query(self) -> dict:
+        return self.snake_case(self.raw_query)
+
+    @cached_property
+    def multi_query(self) -> dict:
+        return self.snake_case(self.raw_multi_query)
 
 
 class Response(FResponse):
-    def __init__(self, body="", status_code=200, headers=None, use_camel_case=True):
+    def __init__(self, body="", status_code=200, headers=None, use_camel_case=True, serializer: Serializer = None):
+        serializer = get_serializer(serializer)
         self.status_code = status_code
         self.headers = headers
 
-        if isinstance(body, (bytes, str)):
+        if isinstance(body, BUFFERS) and not isinstance(body, bytes):
+            body = FileBody(body)
+
+        if isinstance(body, FileBody):
+            environ = request.environ if has_request_context() else {}
+            super().__init__(
+                response=wrap_file(environ, body.open(), body.chunk_size),
+                status=status_code,
+                headers={**body.headers, **(headers or {})},
+                direct_passthrough=True
+            )
+            self.content_length = body.size
+            self.body = self.response
+
+            if has_request_context():
+                self.make_conditional(environ, accept_ranges=True, complete_length=body.size)
+        elif isinstance(body, (bytes, str)):
             super().__init__(
                 response=body,
                 status=status_code,
                 headers=headers
             )
             self.body = body
-        elif isinstance(body, dict):
+        elif isinstance(body, (dict, BaseModel, list, tuple)):
             super().__init__(
-                response=snake_to_camel(body) if use_camel_case else json.dumps(body),
+                response=serializer.dumpb_body(body, use_camel_case),
                 status=status_code,
-                headers=headers
+                headers=headers,
+                mimetype="application/json"
             )
             self.body = self.response
-        elif isinstance(body, BaseModel):
+        elif isinstance(body, Iterator):
             super().__init__(
-                response=json.dumps(snake_to_camel(body.dict())) if use_camel_case else json.dumps(body.dict()),
+                response=serializer.iter_json(body, use_camel_case),
                 status=status_code,
-                headers=headers
+                headers=headers,
+                mimetype="application/json"
             )
             self.body = self.response
 
         else:
             raise Exception("Unsupported")
 
+    @property
+    def size(self) -> int:
+        # Unknown for streamed records
+        return self.content_length
+
 
-class FlaskHandler(Handler):
+class FlaskHandler(SpecMixin, Handler):
     DATA_FORMAT = 'yml'
 
     def __init__(
             self, name, description, version, security=None, default_security=None, camel_case_interface=True,
-            request_class=Request, response_class=Response
+            request_class=Request, response_class=Response, serializer='json', compiled: str = None,
+            timing_hooks=None, server_timing=False, limits: Limits = None
     ):
         self.security = security or []
         self.default_security = default_security or []
@@ -84,25 +150,33 @@ class FlaskHandler(Handler):
         self.version = version
 
         super().__init__(
-            request=request_class, response=response_class, use_camel_case=camel_case_interface
+            request=request_class, response=response_class, use_camel_case=camel_case_interface,
+            serializer=serializer, compiled=compiled, timing_hooks=timing_hooks, server_timing=server_timing,
+            limits=limits
         )
 
         self.schemes = ["http", "https"]
 
         app = Flask(__name__)
 
-        @self.handle("get", "/spec/swagger.<extension>")
-        def spec(extension: PathParameter.enum(Formats)) -> {200: str}:
-            return make_spec(
-                self.name,
-                self.description,
-                self.version,
-                self,
-                security=self.security,
-                default_security=self.default_security,
-                file_name=None,
-                data_format=extension
-            )
+        self.add_spec_route()
+
+        @app.route('/spec/swagger.<extension>')
+        def spec_document(extension):
+            if extension not in Formats.__members__:
+                return self(request)
+
+            document = self.spec_document(Formats[extension])
+            gzipped = 'gzip' in request.accept_encodings
+
+            response = FResponse(document.gzipped if gzipped else document.data, mimetype=document.content_type)
+            response.set_etag(document.etag + ('-gzip' if gzipped else ''))
+            response.vary.add('Accept-Encoding')
+
+            if gzipped:
+                response.content_encoding = 'gzip'
+
+            return response.make_conditional(request)
 
         @app.route('/', defaults={'path': ''})
         @app.route('/<path:path>')
@@ -0,0 +1,84 @@
+import re
+from collections import namedtuple
+from typing import Union
+from restless.errors import BadRequest, HeadersTooLarge, PayloadTooLarge
+
+STRING_RE = re.compile(rb'"[^"]*"')
+NOT_STRUCTURE = bytes(b for b in range(256) if b not in b'"[]{}')
+SQUARE = bytes.maketrans(b'{}', b'[]')
+
+
+def json_depth(data: Union[str, bytes], limit: int) -> int:
+    """
+    Nesting depth of a JSON document worked out from its brackets without decoding it, counted up to `limit + 1`.
+
+    Escaped backslashes and quotes are dropped first, then everything but quotes and brackets. What is left of
+    strings goes along with the brackets they hold, then every pass removes the innermost level of brackets. Brackets
+    left unbalanced, when a pass removes nothing or the remaining ones do not pair up, are a BadRequest.
+    """
+    data = data.encode() if isinstance(data, str) else bytes(data)
+
+    if b'\\' in data:
+        data = data.replace(b'\\\\', b'').replace(b'\\"', b'')
+
+    data = data.translate(None, NOT_STRUCTURE).replace(b'""', b'')
+
+    if b'"' in data:
+        data = STRING_RE.sub(b'', data).replace(b'"', b'')
+
+    data = data.translate(SQUARE)
+
+    if b'[' * (limit + 1) in data:
+        return limit + 1
+
+    depth = 0
+
+    while data and depth <= limit:
+        reduced = data.replace(b'[]', b'')
+
+        if len(reduced) == len(data):
+            break
+
+        data = reduced
+        depth += 1
+
+    if data and (depth <= limit or data.count(b'[') != data.count(b']')):
+        raise BadRequest('The request body is malformed')
+
+    return depth
+
+
+class Limits(namedtuple(
+    'Limits', 'max_body_size max_json_depth max_form_parts max_file_size max_headers', defaults=(None,) * 5
+)):
+    """
+    Bounds of what a request may send, None leaves a bound out. They are checked once the route is known and before
+    anything is decoded, so oversized requests are rejected without reading their body:
+
+    - max_body_size: bytes of the body as the client sent it (the decoded bytes of base64 API Gateway bodies), 413
+      above it
+    - max_json_depth: nesting of JSON bodies, 400 above it, only checked on routes reading the body
+    - max_form_parts, max_file_size: parts of a multipart body and bytes of each of its files, 413 above them
+    - max_headers: number of distinct headers, 431 above it
+    """
+    __slots__ = ()
+
+    def merge(self, limits: 'Limits') -> 'Limits':
+        # Bounds set on `limits` take precedence
+        if limits is None:
+            return self
+
+        return Limits(*(mine if theirs is None else theirs for mine, theirs in zip(self, limits)))
+
+    def check(self, req, reads_body: bool = True):
+        if self.max_headers is not None and req.headers and len(req.headers) > self.max_headers:
+            raise HeadersTooLarge(f'The request can not send more than {self.max_headers} headers')
+
+        if self.max_body_size is not None and (req.size or 0) > self.max_body_size:
+            raise PayloadTooLarge(f'The request body can not be larger than {self.max_body_size} bytes')
+
+        if self.max_json_depth is not None and reads_body:
+            data = req.json_body
+
+            if data and json_depth(data, self.max_json_depth) > self.max_json_depth:
+                raise BadRequest(f'The request body can not be nested deeper than {self.max_json_depth} levels')
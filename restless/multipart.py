@@ -0,0 +1,221 @@
+import re
+from collections import namedtuple
+from typing import IO, Iterable, Iterator, Union
+from restless.errors import PayloadTooLarge
+
+CHUNK_SIZE = 64 * 1024
+MAX_MEMORY = 1024 * 1024
+MAX_HEADER_SIZE = 16 * 1024
+DISPOSITION_RE = re.compile(r'^content-disposition:(.*)$', re.I | re.M)
+CONTENT_TYPE_RE = re.compile(r'^content-type:(.*)$', re.I | re.M)
+PARAMS_RE = re.compile(r';\s*(\w+)="([^"]*)"')
+PREAMBLE, HEADERS, BODY, DONE = range(4)
+
+
+class File(namedtuple('File', 'name file content_type')):
+    """
+    An uploaded file, `file` is a file-like object positioned at its start. Files bigger than the FormData
+    `max_memory` threshold are spooled to a temporary file.
+    """
+    __slots__ = ()
+
+    @property
+    def data(self) -> bytes:
+        self.file.seek(0)
+        return self.file.read()
+
+
+def iter_chunks(payload: Union[bytes, IO, Iterable[bytes]], chunk_size: int = CHUNK_SIZE) -> Iterator:
+    if hasattr(payload, 'read'):
+        return iter(lambda: payload.read(chunk_size), b'')
+    elif isinstance(payload, (bytes, bytearray, memoryview)):
+        view = memoryview(payload)
+        return (view[i:i + chunk_size] for i in range(0, len(view), chunk_size))
+
+    return iter(payload)
+
+
+class FormData(dict):
+    """
+    Incremental multipart/form-data parser, fields are stored as str and files as `File`.
+
+    The payload is read in chunks (bytes are sliced through a memoryview, file-like objects are read), only the
+    bytes that may hold a part delimiter are kept around between chunks. When `payload` is None, chunks can be
+    passed to `feed` as they arrive, followed by `close`. The boundary is taken from the first line of the payload
+    unless it is given.
+
+    Payloads with more than `max_parts` parts or a file bigger than `max_file_size` bytes raise PayloadTooLarge as
+    soon as the parser gets there, without reading the rest.
+    """
+    LOCATION = 'formData'
+    File = File
+
+    def __init__(
+            self, payload: Union[bytes, IO, Iterable[bytes]] = None, boundary: Union[str, bytes] = None,
+            max_memory: int = MAX_MEMORY, chunk_size: int = CHUNK_SIZE, max_parts: int = None,
+            max_file_size: int = None
+    ):
+        super().__init__()
+        self.max_memory = max_memory
+        self.max_parts = max_parts
+        self.max_file_size = max_file_size
+        self._parts = 0
+        self._file_size = 0
+        self._delimiter = None
+        self._separator = None
+        self._buffer = bytearray()
+        self._state = PREAMBLE
+        self._part = None
+
+        if boundary:
+            self._set_delimiter(b'--' + (boundary.encode() if isinstance(boundary, str) else boundary))
+
+        if payload is not None:
+            for chunk in iter_chunks(payload, chunk_size):
+                self.feed(chunk)
+
+            self.close()
+
+    def _set_delimiter(self, delimiter: bytes):
+        self._delimiter = delimiter
+        self._separator = b'\r\n' + delimiter
+
+    def _start_part(self, headers: str):
+        self._parts += 1
+
+        if self.max_parts is not None and self._parts > self.max_parts:
+            raise PayloadTooLarge(f'The form can not have more than {self.max_parts} parts')
+
+        self._file_size = 0
+        disposition = DISPOSITION_RE.search(headers)
+        params = dict(PARAMS_RE.findall(disposition.group(1))) if disposition else {}
+
+        if 'filename' in params:
+            from tempfile import SpooledTemporaryFile
+
+            content_type = CONTENT_TYPE_RE.search(headers)
+            content_type = content_type.group(1).strip() if content_type else 'application/octet-stream'
+            sink = SpooledTemporaryFile(max_size=self.max_memory)
+            write = sink.write
+        else:
+            sink, content_type = bytearray(), None
+            write = sink.extend
+
+        self._part = (params.get('name'), params.get('filename'), content_type, sink, write)
+
+    def _write(self, start: int, end: int):
+        if self.max_file_size is not None and self._part[1] is not None:
+            self._file_size += end - start
+
+            if self._file_size > self.max_file_size:
+                raise PayloadTooLarge(f'Files can not be larger than {self.max_file_size} bytes')
+
+        if end > start:
+            with memoryview(self._buffer) as view, view[start:end] as data:
+                self._part[4](data)
+
+    def _finish_part(self, start: int, end: int):
+        name, filename, content_type, sink, _ = self._part
+
+        if filename is None and not sink:
+            self[name] = self._buffer[start:end].decode()
+        else:
+            self._write(start, end)
+
+            if filename is None:
+                self[name] = sink.decode()
+            else:
+                sink.seek(0)
+                self[name] = self.File(filename, sink, content_type)
+
+        self._part = None
+
+    def feed(self, chunk: Union[bytes, memoryview]):
+        buffer = self._buffer
+        buffer += chunk
+        pos, state = 0, self._state
+
+        while state != DONE:
+            if state == PREAMBLE:
+                end = buffer.find(b'\r\n', pos)
+
+                if end < 0:
+                    if len(buffer) - pos > MAX_HEADER_SIZE:
+                        raise ValueError('Multipart delimiter not found')
+
+                    break
+
+                line = bytes(buffer[pos:end])
+                pos = end + 2
+
+                if self._delimiter is None:
+                    if not line:
+                        # Blank preamble, as some clients send before the first delimiter
+                        continue
+                    elif not line.startswith(b'--'):
+                        raise ValueError('The payload is not multipart/form-data')
+
+                    self._set_delimiter(line)
+                elif line != self._delimiter:
+                    continue
+
+                state = HEADERS
+            elif state == HEADERS:
+                end = pos if buffer.startswith(b'\r\n', pos) else buffer.find(b'\r\n\r\n', pos)
+
+                if end < 0:
+                    if len(buffer) - pos > MAX_HEADER_SIZE:
+                        raise ValueError('Multipart part headers are too long')
+
+                    break
+
+                self._start_part(buffer[pos:end].decode())
+                pos = end + (2 if end == pos else 4)
+                state = BODY
+            else:
+                separator = self._separator
+                end = buffer.find(separator, pos)
+
+                if end < 0:
+                    end = max(pos, len(buffer) - len(separator) + 1)
+                    self._write(pos, end)
+                    pos = end
+                    break
+
+                if len(buffer) < end + len(separator) + 2:
+                    self._write(pos, end)
+                    pos = end
+                    break
+
+                self._finish_part(pos, end)
+                end += len(separator)
+                tail = buffer[end:end + 2]
+
+                if tail == b'--':
+                    state = DONE
+                elif tail == b'\r\n':
+                    pos = end + 2
+                    state = HEADERS
+                else:
+                    raise ValueError('Malformed multipart delimiter')
+
+        self._state = state
+
+        if state == DONE:
+            buffer.clear()
+        else:
+            del buffer[:pos]
+
+    def close(self):
+        """
+        Drops the part left incomplete by a truncated payload.
+        """
+        if self._part and self._part[1] is not None:
+            self._part[3].close()
+
+        self._part = None
+
+        if self._delimiter is None:
+            raise ValueError('The payload is not multipart/form-data')
+
+        self._buffer.clear()
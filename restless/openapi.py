@@ -1,22 +1,35 @@
 import json
-import yaml
+import gzip
+from collections import namedtuple
+from hashlib import sha256
+from functools import lru_cache
+from threading import Lock
 from restless import Handler
-from datetime import datetime
-from collections import Hashable
+from datetime import date, datetime
+from decimal import Decimal
+from uuid import UUID
+from collections.abc import Hashable
 from inspect import _empty
 from restless.parameters import BinaryParameter
+from restless.files import FileBody
 from restless.security import Security
-from typing import List, Union
-from restless.util import snake_to_camel
+from typing import List, Union, get_args
 from enum import Enum
-
-
-class Formats(Enum):
-    yaml = 'yaml'
-    json = 'json'
+from restless.binding import body_models, list_type
+from restless.compat import model_schema
+from restless.util import Formats, snake_to_camel
 
 
 OPENAPI = "3.0.0"
+SCHEMAS = '#/components/schemas/'
+ERROR_RESPONSES = [
+    ('400', 'BadRequest', 'Bad Request'),
+    ('401', 'Unauthorized', 'Unauthorized'),
+    ('403', 'Forbidden', 'Forbidden'),
+    ('404', 'NotFound', 'Not Found')
+]
+SCHEMA_CACHE_SIZE = 1024
+SpecDocument = namedtuple('SpecDocument', 'data gzipped etag content_type')
 
 TYPE_MAPPING = {
     str: "string",
@@ -30,6 +43,102 @@ TYPE_MAPPING = {
     dict: "object"
 }
 
+PARAMETER_MAPPING = {
+    str: {"type": "string"},
+    int: {"type": "integer"},
+    float: {"type": "number"},
+    Decimal: {"type": "number"},
+    bool: {"type": "boolean"},
+    UUID: {"type": "string", "format": "uuid"},
+    datetime: {"type": "string", "format": "date-time"},
+    date: {"type": "string", "format": "date"}
+}
+
+
+def parameter_schema(type_) -> dict:
+    if list_type(type_):
+        return {
+            'type': 'array',
+            'items': parameter_schema((get_args(type_) or (str,))[0])
+        }
+    elif isinstance(type_, type) and issubclass(type_, Enum):
+        return {
+            'type': 'string',
+            'enum': [k.strip('_') for k in type_.__members__]
+        }
+
+    return dict(PARAMETER_MAPPING.get(type_, PARAMETER_MAPPING[str]))
+
+
+@lru_cache(maxsize=SCHEMA_CACHE_SIZE)
+def model_schemas(model, use_camel_case: bool) -> dict:
+    """
+    Schemas of a model and of the models nested in it, keyed by the name pydantic gives them. Nested models reference
+    each other through `$ref` instead of being written inline.
+
+    Memoized per model across builds, the result is shared and must not be changed in place.
+    """
+    schema = model_schema(model, SCHEMAS + '{model}')
+    schemas = {**schema.pop('definitions', {}), **schema.pop('$defs', {})}
+    schemas[model.__name__] = schema
+
+    if use_camel_case:
+        schemas = {name: snake_to_camel(schema) for name, schema in schemas.items()}
+
+    return schemas
+
+
+def retarget(schema, names: dict):
+    # Copy of a schema with its `$ref`s pointing to the components `names` renamed them to
+    if isinstance(schema, list):
+        return [retarget(item, names) for item in schema]
+    elif not isinstance(schema, dict):
+        return schema
+    elif '$ref' in schema:
+        name = schema['$ref'][len(SCHEMAS):]
+        return {**schema, '$ref': SCHEMAS + names.get(name, name)}
+
+    return {key: retarget(value, names) for key, value in schema.items()}
+
+
+def schema_ref(model, spec: dict, seen: dict, use_camel_case: bool) -> dict:
+    """
+    Adds the schemas of a model to the spec's components the first time it is seen, returns its reference.
+
+    Models named like a different component already in the spec, such as two `Item` classes from different modules,
+    get the first free numbered name (`Item2`, ...) and the references between their schemas follow.
+    """
+    if model not in seen:
+        components = spec['components']['schemas']
+        schemas = model_schemas(model, use_camel_case)
+        names = {}
+
+        while True:
+            renamed = {}
+
+            for name, schema in schemas.items():
+                schema, idx = retarget(schema, names) if names else schema, 1
+                target = name
+
+                while components.get(target, schema) != schema:
+                    idx += 1
+                    target = f'{name}{idx}'
+
+                if target != name:
+                    renamed[name] = target
+
+            if renamed == names:
+                break
+
+            names = renamed
+
+        for name, schema in schemas.items():
+            components[names.get(name, name)] = retarget(schema, names)
+
+        seen[model] = names.get(model.__name__, model.__name__)
+
+    return {'$ref': SCHEMAS + seen[model]}
+
 
 def make_security(security: List[Union[List[str], str]], spec: dict):
     for sec in security or []:
@@ -45,27 +154,15 @@ def make_security(security: List[Union[List[str], str]], spec: dict):
     ]
 
 
-def get_handlers(handlers):
-    if isinstance(handlers, dict):
-        for v in handlers.values():
-            for found in get_handlers(v):
-                yield found
-
-    else:
-        yield handlers
-
-
-def make_spec(
+def build_spec(
         title,
         description,
         version,
         api_handler: Handler,
-        file_name='spec.yaml',
         servers=None,
         security: List[Security] = None,
-        default_security: List[Union[List[str], str]] = None,
-        data_format: Formats = None
-):
+        default_security: List[Union[List[str], str]] = None
+) -> dict:
     spec = {
         'openapi': OPENAPI,
         'tags': [],
@@ -94,9 +191,23 @@ def make_spec(
                         'error'
                     ]
                 }
+            },
+            'responses': {
+                name: {
+                    'description': description,
+                    'content': {
+                        'application/json': {
+                            'schema': {
+                                '$ref': SCHEMAS + 'Error'
+                            }
+                        }
+                    }
+                }
+                for _, name, description in ERROR_RESPONSES
             }
         }
     }
+    seen = {}
 
     if default_security:
         spec['security'] = make_security(default_security, spec)
@@ -108,7 +219,7 @@ def make_spec(
             for s in sec:
                 assert s in spec['components']['securitySchemes']
 
-    for handler in get_handlers(api_handler.handlers):
+    for handler in api_handler.handlers:
         if handler.path not in spec['paths']:
             spec['paths'][handler.path] = {}
 
@@ -131,22 +242,7 @@ def make_spec(
 
         target['description'] = handler.method.__doc__ or handler.method.__name__
         target['responses'] = {
-            code: {
-                'description': description,
-                'content': {
-                    'application/json': {
-                        'schema': {
-                            '$ref': '#/components/schemas/Error'
-                        }
-                    }
-                }
-            }
-            for code, description in [
-                ('400', 'Bad Request'),
-                ('401', 'Unauthorized'),
-                ('403', 'Forbidden'),
-                ('404', 'Not Found')
-            ]
+            code: {'$ref': '#/components/responses/' + name} for code, name, _ in ERROR_RESPONSES
         }
         target['parameters'] = []
 
@@ -163,6 +259,17 @@ def make_spec(
         returns = handler.sig.return_annotation if isinstance(handler.sig.return_annotation, dict) else {}
 
         for code, model in returns.items():
+            if isinstance(model, type) and issubclass(model, FileBody):
+                target['responses'][str(code)] = {
+                    'description': description,
+                    'content': {
+                        'application/octet-stream': {
+                            'schema': {'type': 'string', 'format': 'binary'}
+                        }
+                    }
+                }
+                continue
+
             if isinstance(model, list):
                 schema = {
                     "type": "array",
@@ -178,13 +285,7 @@ def make_spec(
             if isinstance(model, Hashable) and model in TYPE_MAPPING:
                 t['type'] = TYPE_MAPPING[model]
             elif hasattr(model, 'schema'):
-                t['$ref'] = '#/components/schemas/' + model.__name__
-                spec['components']['schemas'][model.__name__] = model.schema()
-
-                if api_handler.use_camel_case:
-                    spec['components']['schemas'][model.__name__] = snake_to_camel(
-                        spec['components']['schemas'][model.__name__]
-                    )
+                t.update(schema_ref(model, spec, seen, api_handler.use_camel_case))
 
             target['responses'][str(code)] = {
                 'description': description,
@@ -202,9 +303,7 @@ def make_spec(
                     'in': getattr(model, "LOCATION", "body"),
                     'required': handler.sig.parameters[param].default == _empty,
                     'description': model.__doc__ or param,
-                    'schema': {
-                        'type': 'string'
-                    }
+                    'schema': parameter_schema(getattr(model, 'TYPE', None) or str)
                 }
 
                 if getattr(model, 'ENUM', None):
@@ -215,20 +314,19 @@ def make_spec(
                 if 'requestBody' not in target:
                     target['requestBody'] = {"content": {}}
 
-                if hasattr(model, 'schema'):
-                    spec['components']['schemas'][model.__name__] = model.schema()
-
-                    if api_handler.use_camel_case:
-                        spec['components']['schemas'][model.__name__] = snake_to_camel(
-                            spec['components']['schemas'][model.__name__]
-                        )
-
+                if body_models(model):
                     target['requestBody']['content']['application/json'] = {
                         'schema': {
-                            '$ref': '#/components/schemas/' + model.__name__
+                            'type': 'array',
+                            'items': schema_ref(body_models(model)[0], spec, seen, api_handler.use_camel_case)
                         }
                     }
 
+                elif hasattr(model, 'schema'):
+                    target['requestBody']['content']['application/json'] = {
+                        'schema': schema_ref(model, spec, seen, api_handler.use_camel_case)
+                    }
+
                 elif issubclass(model, BinaryParameter):
                     target['requestBody']['content']['application/octet-stream'] = {
                         'schema': {
@@ -257,17 +355,83 @@ def make_spec(
                             'format': 'binary'
                         }
 
-    data_format = data_format or Formats.__getitem__(file_name.split('.')[1])
+    return spec
+
 
+def dump_spec(spec: dict, data_format: Formats) -> str:
     if data_format == Formats.yaml:
-        data = yaml.dump(spec)
+        import yaml
+
+        return yaml.dump(spec)
     elif data_format == Formats.json:
-        data = json.dumps(spec)
-    else:
-        raise Exception("Bad Format")
+        return json.dumps(spec)
+
+    raise Exception("Bad Format")
+
+
+def make_spec(
+        title,
+        description,
+        version,
+        api_handler: Handler,
+        file_name='spec.yaml',
+        servers=None,
+        security: List[Security] = None,
+        default_security: List[Union[List[str], str]] = None,
+        data_format: Formats = None
+):
+    data_format = data_format or Formats.__getitem__(file_name.split('.')[1])
+    data = dump_spec(
+        build_spec(title, description, version, api_handler, servers, security, default_security), data_format
+    )
 
     if file_name:
         with open(file_name, 'w') as dst:
             dst.write(data)
     else:
         return data
+
+
+class SpecCache:
+    """
+    Spec documents served by FlaskHandler and AsgiHandler, built once per revision of the handler's route table.
+
+    The spec is walked once and dumped lazily in each format, every document keeps a gzip copy and a strong ETag.
+    The copy carries no timestamp, the same spec always compresses to the same bytes for its ETag.
+    """
+    CONTENT_TYPES = {Formats.json: 'application/json', Formats.yaml: 'application/yaml'}
+
+    def __init__(self, api_handler: Handler):
+        self.api_handler = api_handler
+        self.lock = Lock()
+        self.revision = None
+        self.spec = None
+        self.documents = {}
+
+    def get(self, data_format: Formats) -> SpecDocument:
+        with self.lock:
+            revision = self.api_handler.router.revision
+
+            if revision != self.revision:
+                self.revision, self.spec, self.documents = revision, None, {}
+
+            if not self.documents and getattr(self.api_handler, 'compiled', None):
+                from restless.compiled import spec_documents
+
+                for key, document in spec_documents(self.api_handler.compiled, self.api_handler).items():
+                    self.documents[Formats(key)] = SpecDocument(*document)
+
+            if data_format not in self.documents:
+                if self.spec is None:
+                    handler = self.api_handler
+                    self.spec = build_spec(
+                        handler.name, handler.description, handler.version, handler,
+                        security=handler.security, default_security=handler.default_security
+                    )
+
+                data = dump_spec(self.spec, data_format).encode()
+                self.documents[data_format] = SpecDocument(
+                    data, gzip.compress(data, mtime=0), sha256(data).hexdigest()[:32], self.CONTENT_TYPES[data_format]
+                )
+
+            return self.documents[data_format]
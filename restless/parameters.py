@@ -1,15 +1,39 @@
-from restless.util import FormData
+from restless.multipart import FormData
 from pydantic import BaseModel
 from enum import Enum
 from typing import ClassVar
 
+_SUBCLASSES = {}
+
 
 class StringParameter(str):
     ENUM: Enum = None
+    TYPE: type = None
+
+    @classmethod
+    def subclass(cls, attribute: str, value) -> ClassVar:
+        """
+        Returns the subclass of this parameter with the given attribute set, built once per value like typing's
+        generic aliases so that declaring many routes does not create a class per annotation.
+        """
+        try:
+            return _SUBCLASSES[(cls, attribute, value)]
+        except KeyError:
+            subclass = _SUBCLASSES[(cls, attribute, value)] = type(cls.__name__, (cls,), {attribute: value})
+        except TypeError:
+            subclass = type(cls.__name__, (cls,), {attribute: value})
+
+        return subclass
 
     @classmethod
     def enum(cls, enum: Enum) -> ClassVar:
-        return type(cls.__name__, (cls,), {'ENUM': enum})
+        return cls.subclass('ENUM', enum)
+
+    def __class_getitem__(cls, type_) -> ClassVar:
+        if isinstance(type_, type) and issubclass(type_, Enum):
+            return cls.enum(type_)
+
+        return cls.subclass('TYPE', type_)
 
     @classmethod
     def enum_keys(cls):
@@ -0,0 +1,134 @@
+import re
+
+
+class Node:
+    __slots__ = ('static', 'patterns', 'params', 'methods')
+
+    def __init__(self, static, patterns, params, methods):
+        self.static = static
+        self.patterns = patterns
+        self.params = params
+        self.methods = methods
+
+
+class Router:
+    """
+    Segment trie built from the registered routes.
+
+    Each node holds static children keyed by token, then segment patterns (ex: 'swagger.<extension>') and finally
+    plain parameters (ex: '<id>'). Lookups try them in that order and backtrack, so a static segment never hides a
+    parameterized route that would have matched. The compiled trie is never mutated, registering a route builds a
+    new one on the next lookup, and lookups never write to it whatever path they are given.
+    """
+    PARAMETER = re.compile(r'<([^/]+?)>')
+
+    def __init__(self):
+        self.routes = []
+        self.keys = set()
+        self.root = None
+        self.depth = 0
+        self.frozen = False
+        self.revision = 0
+
+    def add(self, path: str, method: str, handler):
+        assert not self.frozen, f"Can't add '{path}', the routes are frozen"
+
+        tokens = path.split('/')[1:]
+        key = (tuple(self.PARAMETER.sub('<>', token) for token in tokens), method.upper())
+
+        assert key not in self.keys, f"'{path}' already has the '{method}' method"
+
+        self.keys.add(key)
+        self.routes.append((tokens, method.upper(), handler))
+        self.root = None
+        self.revision += 1
+
+    def compile(self):
+        tree = {}
+
+        for tokens, method, handler in self.routes:
+            target = tree
+
+            for token in tokens:
+                target = target.setdefault(token, {})
+
+            target.setdefault(None, {})[method] = handler
+
+        self.depth = max((len(tokens) for tokens, *_ in self.routes), default=0)
+        self.root = self._build(tree)
+
+    def freeze(self):
+        self.compile()
+        self.frozen = True
+
+    @classmethod
+    def _build(cls, tree: dict) -> Node:
+        static, patterns, params = {}, [], []
+
+        for token, child in tree.items():
+            if token is None:
+                continue
+
+            match = cls.PARAMETER.fullmatch(token)
+
+            if match:
+                params.append((match.group(1), cls._build(child)))
+            elif cls.PARAMETER.search(token):
+                regex = re.compile(
+                    ''.join(
+                        f'(?P<{part}>[^/]+?)' if i % 2 else re.escape(part)
+                        for i, part in enumerate(cls.PARAMETER.split(token))
+                    )
+                )
+                patterns.append((regex, cls._build(child)))
+            else:
+                static[token] = cls._build(child)
+
+        return Node(static, tuple(patterns), tuple(params), tree.get(None, {}))
+
+    def match(self, path: str, method: str):
+        if self.root is None:
+            self.compile()
+
+        tokens = path.split('/')[1:]
+
+        if len(tokens) > self.depth:
+            return None, None
+
+        return self._match(self.root, tokens, 0, method.upper(), {})
+
+    def _match(self, node: Node, tokens: list, idx: int, method: str, captured: dict):
+        if idx == len(tokens):
+            handler = node.methods.get(method)
+            return (handler, captured) if handler else (None, None)
+
+        token = tokens[idx]
+        child = node.static.get(token)
+
+        if child is not None:
+            handler, params = self._match(child, tokens, idx + 1, method, captured)
+
+            if handler:
+                return handler, params
+
+        for regex, child in node.patterns:
+            match = regex.fullmatch(token)
+
+            if match:
+                handler, params = self._match(child, tokens, idx + 1, method, {**captured, **match.groupdict()})
+
+                if handler:
+                    return handler, params
+
+        if token:
+            for name, child in node.params:
+                handler, params = self._match(child, tokens, idx + 1, method, {**captured, name: token})
+
+                if handler:
+                    return handler, params
+
+        return None, None
+
+    def __iter__(self):
+        for *_, handler in self.routes:
+            yield handler
@@ -1,7 +1,7 @@
 from enum import Enum
 from functools import wraps
 from typing import Callable
-from inspect import signature
+from inspect import iscoroutinefunction, signature
 
 
 class Restrict:
@@ -17,6 +17,15 @@ class Restrict:
 
         assert all([p in sig.parameters for p in self.params])
 
+        if iscoroutinefunction(func):
+            @wraps(func)
+            async def restricted_async(*args, **kwargs):
+                self.check_function(**{p: kwargs[p] for p in self.params})
+
+                return await func(*args, **kwargs)
+
+            return restricted_async
+
         @wraps(func)
         def restricted(*args, **kwargs):
             self.check_function(**{p: kwargs[p] for p in self.params})
@@ -0,0 +1,162 @@
+import json
+from typing import Any, Iterable, Iterator, Union
+from restless.compat import dump_json
+from restless.util import UniversalEncoder, json_default, snake_to_camel
+
+CHUNK_SIZE = 16 * 1024
+
+
+class Serializer:
+    """
+    Parses request bodies and encodes response bodies.
+
+    Subclasses implement `loads` and either `dumps` (str) or `dumpb` (bytes), whichever the backend produces
+    natively, the other one is derived from it.
+    """
+    name: str = None
+    separator = ', '
+
+    def loads(self, data: Union[str, bytes]) -> Any:
+        raise NotImplementedError
+
+    def dumps(self, obj) -> str:
+        return self.dumpb(obj).decode()
+
+    def dumpb(self, obj) -> bytes:
+        return self.dumps(obj).encode()
+
+    def dumpb_body(self, obj, use_camel_case=False) -> bytes:
+        """
+        Encodes a response body. With pydantic v2, models and lists of models are encoded by pydantic-core unless
+        their keys are renamed to camelCase.
+        """
+        if use_camel_case:
+            return self.dumpb(snake_to_camel(obj))
+
+        encoded = dump_json(obj)
+
+        return self.dumpb(obj) if encoded is None else encoded
+
+    def dumps_body(self, obj, use_camel_case=False) -> str:
+        if use_camel_case:
+            return self.dumps(snake_to_camel(obj))
+
+        encoded = dump_json(obj)
+
+        return self.dumps(obj) if encoded is None else encoded.decode()
+
+    def iter_json(self, records: Iterable, use_camel_case=False, chunk_size=CHUNK_SIZE) -> Iterator[str]:
+        """
+        Encodes records as a JSON array, one chunk at a time.
+
+        The first record is flushed on its own so the response can start right away, the following ones are
+        buffered up to `chunk_size` characters.
+        """
+        buffer, size, separator = ['['], 1, ''
+
+        for record in records:
+            encoded = separator + self.dumps_body(record, use_camel_case)
+            buffer.append(encoded)
+            size += len(encoded)
+
+            if not separator or size >= chunk_size:
+                yield ''.join(buffer)
+                buffer, size, separator = [], 0, self.separator
+
+        buffer.append(']')
+        yield ''.join(buffer)
+
+
+class StdlibSerializer(Serializer):
+    name = 'json'
+
+    def __init__(self):
+        self.encoder = UniversalEncoder()
+
+    def loads(self, data: Union[str, bytes]) -> Any:
+        return json.loads(data)
+
+    def dumps(self, obj) -> str:
+        return self.encoder.encode(obj)
+
+
+class OrjsonSerializer(Serializer):
+    name = 'orjson'
+    separator = ','
+
+    def __init__(self):
+        import orjson
+
+        self.orjson = orjson
+        self.option = orjson.OPT_NON_STR_KEYS
+
+    def loads(self, data: Union[str, bytes]) -> Any:
+        return self.orjson.loads(data)
+
+    def dumpb(self, obj) -> bytes:
+        return self.orjson.dumps(obj, default=json_default, option=self.option)
+
+
+class UjsonSerializer(Serializer):
+    name = 'ujson'
+    separator = ','
+
+    def __init__(self):
+        import ujson
+
+        self.ujson = ujson
+
+    def loads(self, data: Union[str, bytes]) -> Any:
+        return self.ujson.loads(data)
+
+    def dumps(self, obj) -> str:
+        return self.ujson.dumps(obj, default=json_default)
+
+
+class MsgspecSerializer(Serializer):
+    name = 'msgspec'
+    separator = ','
+
+    def __init__(self):
+        import msgspec
+
+        self.error = msgspec.DecodeError
+        self.encoder = msgspec.json.Encoder(enc_hook=json_default)
+        self.decoder = msgspec.json.Decoder()
+
+    def loads(self, data: Union[str, bytes]) -> Any:
+        try:
+            return self.decoder.decode(data)
+        except self.error as e:
+            raise ValueError(*e.args)
+
+    def dumpb(self, obj) -> bytes:
+        return self.encoder.encode(obj)
+
+
+SERIALIZERS = {
+    serializer.name: serializer
+    for serializer in [StdlibSerializer, OrjsonSerializer, UjsonSerializer, MsgspecSerializer]
+}
+FASTEST = ['orjson', 'msgspec', 'ujson', 'json']
+JSON = StdlibSerializer()
+
+
+def get_serializer(serializer: Union[str, Serializer, None] = None) -> Serializer:
+    """
+    Returns a serializer instance given its name, 'auto' picks the fastest backend installed.
+    """
+    if isinstance(serializer, Serializer):
+        return serializer
+    elif serializer in (None, JSON.name):
+        return JSON
+    elif serializer == 'auto':
+        for name in FASTEST:
+            try:
+                return get_serializer(name)
+            except ImportError:
+                continue
+
+    assert serializer in SERIALIZERS, f"Unknown serializer '{serializer}', use one of {list(SERIALIZERS)}"
+
+    return SERIALIZERS[serializer]()
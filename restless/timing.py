@@ -0,0 +1,59 @@
+from time import perf_counter
+
+REQUEST = 'request'
+ROUTE = 'route'
+BIND = 'bind'
+ENDPOINT = 'endpoint'
+VALIDATE = 'validate'
+RESPONSE = 'response'
+STAGES = (REQUEST, ROUTE, BIND, ENDPOINT, VALIDATE, RESPONSE)
+
+
+class Timings:
+    """
+    Durations of the stages of a single request, in milliseconds and in the order they ran:
+
+    - request: building the interface's Request from the event, bodies, headers and query strings are only decoded
+      when bind first reads them
+    - route: matching the path to a route
+    - bind: reading and converting the endpoint's parameters
+    - endpoint: running the endpoint
+    - validate: checking the result against the return annotation
+    - response: building the interface's Response (streamed bodies are only encoded while being written)
+
+    Requests failing before a stage skip it, the error response is still timed. The route, status and the request
+    and response sizes in bytes are kept along, sizes are None when the interface can not tell them upfront.
+    """
+    __slots__ = ('stages', 'path_handler', 'status', 'request_size', 'response_size', '_last')
+
+    def __init__(self):
+        self.stages = {}
+        self.path_handler = None
+        self.status = None
+        self.request_size = None
+        self.response_size = None
+        self._last = perf_counter()
+
+    def mark(self, stage: str):
+        now = perf_counter()
+        self.stages[stage] = self.stages.get(stage, 0) + (now - self._last) * 1e3
+        self._last = now
+
+    @property
+    def total(self) -> float:
+        return sum(self.stages.values())
+
+    @property
+    def route(self) -> str:
+        if self.path_handler is None:
+            return None
+
+        return f'{self.path_handler.http_method.upper()} {self.path_handler.path}'
+
+    def server_timing(self) -> str:
+        """
+        Value of a Server-Timing header listing every stage and the total.
+        """
+        return ', '.join(
+            f'{stage};dur={duration:.3f}' for stage, duration in [*self.stages.items(), ('total', self.total)]
+        )
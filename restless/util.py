@@ -1,92 +1,238 @@
 import json
-from datetime import datetime
-from typing import Iterable
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+from enum import Enum
+from typing import Iterable, Tuple, Union, get_args, get_origin
+from uuid import UUID
 import re
 from collections import namedtuple
+from functools import lru_cache
+from pydantic import BaseModel
+from restless.multipart import FormData  # noqa: F401
 
 C2S1 = re.compile('(.)([A-Z][a-z]+)')
 C2S2 = re.compile('([a-z0-9])([A-Z])')
 S2C = re.compile('(.)_([a-zA-Z])')
+KEY_CACHE_SIZE = 4096
+MAX_CACHED_KEY = 64
+# Models created at runtime (ex: with create_model) would otherwise be kept forever
+MODEL_CACHE_SIZE = 1024
+SCALARS = (str, int, float, bool, type(None))
+PLAIN_TYPES = (str, int, float, bool, bytes, datetime, date, time, timedelta, UUID, Enum, Decimal)
+PLAIN, MODEL, MODELS, ANY = 'plain', 'model', 'models', 'any'
+Alias = namedtuple('Alias', 'name alias kind model')
+
+
+def _to_snake(key: str) -> str:
+    return C2S2.sub(r'\1_\2', C2S1.sub(r'\1_\2', key)).lower()
+
+
+def _to_camel(key: str) -> str:
+    return S2C.sub(lambda x: x[1] + x[2].upper(), key)
+
+
+_cached_to_snake = lru_cache(maxsize=KEY_CACHE_SIZE)(_to_snake)
+_cached_to_camel = lru_cache(maxsize=KEY_CACHE_SIZE)(_to_camel)
+
+
+def to_snake(key: str) -> str:
+    # Key names repeat across requests, long ones are most likely garbage and would only evict useful entries
+    return _cached_to_snake(key) if len(key) <= MAX_CACHED_KEY else _to_snake(key)
+
+
+def to_camel(key: str) -> str:
+    return _cached_to_camel(key) if len(key) <= MAX_CACHED_KEY else _to_camel(key)
+
+
+def convert_keys(obj, convert_key, convert_model=None):
+    """
+    Copies lists, tuples, sets and dicts with their keys renamed by `convert_key`.
+
+    Walks the tree with an explicit stack instead of recursion, scalars are copied as they are. With `convert_model`,
+    pydantic models are replaced by what it returns and anything else with a `dict` method is walked as a dict.
+    """
+    root = [obj]
+    stack = [(root, 0, obj)]
+
+    while stack:
+        container, slot, value = stack.pop()
+
+        if convert_model and not isinstance(value, (dict, list, tuple, set)):
+            if isinstance(value, BaseModel):
+                container[slot] = convert_model(value)
+                continue
+            elif hasattr(value, 'dict'):
+                value = value.dict()
+
+        if isinstance(value, dict):
+            converted = container[slot] = {}
+
+            for k, v in value.items():
+                k = convert_key(k) if isinstance(k, str) else k
+                converted[k] = v
+
+                if not isinstance(v, SCALARS):
+                    stack.append((converted, k, v))
+        elif isinstance(value, (list, tuple, set)):
+            converted = container[slot] = list(value)
+
+            for idx, v in enumerate(converted):
+                if not isinstance(v, SCALARS):
+                    stack.append((converted, idx, v))
+
+    return root[0]
 
 
 def camel_to_snake(obj):
-    if isinstance(obj, (list, set)):
-        return [
-            camel_to_snake(i)
-            if not isinstance(i, str) else i
-            for i in obj
-        ]
-    elif isinstance(obj, dict):
-        return {
-            camel_to_snake(k): camel_to_snake(v)
-            if not isinstance(v, str) else v
-            for k, v in obj.items()
-        }
-    elif isinstance(obj, str):
-        string = C2S1.sub(r'\1_\2', obj)
-        return C2S2.sub(r'\1_\2', string).lower()
+    if isinstance(obj, str):
+        return to_snake(obj)
 
-    return obj
+    return convert_keys(obj, to_snake)
 
 
 def snake_to_camel(obj):
-    if hasattr(obj, 'dict'):
-        obj = obj.dict()
-
-    if isinstance(obj, (list, set)):
-        return [
-            snake_to_camel(i)
-            if not isinstance(i, str) else i
-            for i in obj
-        ]
-    elif isinstance(obj, dict):
-        return {
-            snake_to_camel(k): snake_to_camel(v)
-            if not isinstance(v, str) else v
-            for k, v in obj.items()
-        }
+    if isinstance(obj, str):
+        return to_camel(obj)
+
+    return convert_keys(obj, to_camel, convert_model=camel_dict)
+
+
+def model_fields(model) -> dict:
+    if hasattr(model, 'model_fields'):
+        return {name: field.annotation for name, field in model.model_fields.items()}
+
+    return {name: field.outer_type_ for name, field in model.__fields__.items()}
+
+
+def field_kind(annotation) -> tuple:
+    origin = get_origin(annotation)
+
+    if origin is Union:
+        kinds = {field_kind(arg) for arg in get_args(annotation) if arg is not type(None)}
+        return kinds.pop() if len(kinds) == 1 else (ANY, None)
+    elif isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return MODEL, annotation
+    elif origin in (list, set, tuple, frozenset):
+        kinds = {field_kind(arg) for arg in get_args(annotation) if arg is not Ellipsis}
+
+        if kinds <= {(PLAIN, None)}:
+            return PLAIN, None
+        elif len(kinds) == 1 and next(iter(kinds))[0] == MODEL:
+            return MODELS, next(iter(kinds))[1]
+    elif isinstance(annotation, type) and issubclass(annotation, PLAIN_TYPES):
+        return PLAIN, None
+
+    return ANY, None
+
+
+@lru_cache(maxsize=MODEL_CACHE_SIZE)
+def model_aliases(model) -> Tuple[Alias, ...]:
+    """
+    camelCase alias, kind and nested model of every field, worked out once per model class.
+    """
+    return tuple(
+        Alias(name, _to_camel(name), *field_kind(annotation)) for name, annotation in model_fields(model).items()
+    )
+
+
+@lru_cache(maxsize=MODEL_CACHE_SIZE)
+def model_inputs(model) -> dict:
+    aliases = {}
+
+    for alias in model_aliases(model):
+        aliases[alias.name] = aliases[alias.alias] = alias
+
+    return aliases
+
+
+def warm_aliases(model):
+    for alias in model_aliases(model):
+        if alias.model:
+            warm_aliases(alias.model)
+
+    model_inputs(model)
+
+
+def camel_dict(obj: BaseModel) -> dict:
+    """
+    Fields of a model keyed by their camelCase aliases, nested models are converted the same way.
+    """
+    values = obj.__dict__
+    aliases = model_aliases(obj.__class__)
+    converted = {}
+
+    for name, alias, kind, _ in aliases:
+        value = values[name]
+
+        if kind == PLAIN or value is None:
+            converted[alias] = value
+        elif kind == MODEL:
+            converted[alias] = camel_dict(value)
+        elif kind == MODELS:
+            converted[alias] = [camel_dict(v) for v in value]
+        else:
+            converted[alias] = snake_to_camel(value)
+
+    if len(values) > len(aliases):
+        for name, value in values.items():
+            if name not in model_inputs(obj.__class__):
+                converted[to_camel(name)] = snake_to_camel(value)
+
+    return converted
+
+
+def from_camel(model, data):
+    """
+    Renames the camelCase keys of a request body to the field names of `model`, following nested models.
+    """
+    if not isinstance(data, dict):
+        return data
+
+    aliases = model_inputs(model)
+    renamed = {}
+
+    for key, value in data.items():
+        alias = aliases.get(key)
+
+        if alias is None:
+            renamed[to_snake(key)] = camel_to_snake(value)
+        elif alias.kind == PLAIN:
+            renamed[alias.name] = value
+        elif alias.kind == MODEL:
+            renamed[alias.name] = from_camel(alias.model, value)
+        elif alias.kind == MODELS and isinstance(value, list):
+            renamed[alias.name] = [from_camel(alias.model, v) for v in value]
+        else:
+            renamed[alias.name] = camel_to_snake(value)
+
+    return renamed
+
+
+def json_default(obj):
+    if isinstance(obj, BaseModel):
+        # Nested models come back through this hook, no need to copy the whole tree with .dict()
+        return obj.__dict__
+    elif isinstance(obj, (datetime, date)):
+        return obj.isoformat()
+    elif isinstance(obj, UUID):
+        return str(obj)
+    elif isinstance(obj, Enum):
+        return obj.value
+    elif hasattr(obj, 'dict'):
+        return obj.dict()
     elif isinstance(obj, str):
-        return S2C.sub(lambda x: x[1] + x[2].upper(), obj)
+        return obj
+    elif isinstance(obj, Iterable):
+        return list(obj)
+
+    raise TypeError(f'Object of type {obj.__class__.__name__} is not JSON serializable')
+
 
-    return obj
+class Formats(Enum):
+    yaml = 'yaml'
+    json = 'json'
 
 
 class UniversalEncoder(json.JSONEncoder):
     def default(self, obj):
-        if hasattr(obj, 'dict'):
-            return obj.dict()
-        elif isinstance(obj, datetime):
-            return obj.isoformat()
-        elif isinstance(obj, str):
-            return obj
-        elif isinstance(obj, Iterable):
-            return list(obj)
-
-        return json.JSONEncoder.default(self, obj)
-
-
-class FormData(dict):
-    LOCATION = 'formData'
-    DELIMITER = re.compile(b'(--.*?)\r\n')
-    FILE_RE = re.compile('name="(.*)"; filename="(.*)"\r\nContent-Type: (.*)')
-    KEY_VALUE_RE = re.compile('name="(.*)"')
-    File = namedtuple('File', 'name data content_type')
-
-    def __init__(self, payload: bytes):
-        super().__init__()
-        boundary = self.DELIMITER.match(payload).group(1)
-
-        data_re = re.compile(
-            boundary + b'\r\nContent-Disposition: form-data; (.*?)\r\n(?=' + boundary + b')', re.DOTALL
-        )
-
-        for part in data_re.findall(payload):
-            names, data = part.split(b'\r\n\r\n', 1)
-            names = names.decode()
-
-            if 'filename' in names:
-                name, filename, content_type = self.FILE_RE.search(names).groups()
-                self[name] = self.File(filename, data, content_type)
-            else:
-                name = self.KEY_VALUE_RE.match(names).group(1)
-                self[name] = data.decode()
+        return json_default(obj)
@@ -0,0 +1,74 @@
+from enum import Enum
+from random import sample
+from typing import Callable, Iterable, Iterator
+from pydantic import BaseModel
+from restless.errors import InvalidResponse
+from restless.files import BUFFERS
+
+
+class Validation(Enum):
+    full = 'full'
+    sampled = 'sampled'
+    off = 'off'
+
+
+class Validator:
+    """
+    Checks endpoint results against their return annotation.
+
+    `full` checks every record, `sampled` the first `sample_size` records plus `sample_size` random ones and `off`
+    skips the check. Streamed bodies are checked lazily while they are written, sampling only their first records.
+    Failures are passed to `on_invalid` when it is set (ex: to count them in a metric), otherwise they raise
+    InvalidResponse.
+    """
+
+    def __init__(self, mode: Validation = Validation.full, sample_size: int = 10, on_invalid: Callable = None):
+        self.mode = Validation(mode)
+        self.sample_size = sample_size
+        self.on_invalid = on_invalid
+
+    def invalid(self, path_handler, body, message: str):
+        if self.on_invalid:
+            self.on_invalid(path_handler, body, message)
+        else:
+            raise InvalidResponse(message)
+
+    def records(self, body: list) -> Iterable:
+        if self.mode == Validation.full or len(body) <= 2 * self.sample_size:
+            return body
+
+        return body[:self.sample_size] + sample(body[self.sample_size:], self.sample_size)
+
+    def stream(self, path_handler, body: Iterable, item_type: type) -> Iterator:
+        for idx, rec in enumerate(body):
+            if (self.mode == Validation.full or idx < self.sample_size) and not isinstance(rec, item_type):
+                self.invalid(path_handler, rec, f"All records should be of type '{item_type.__name__}'")
+
+            yield rec
+
+    def __call__(self, path_handler, body, status: int):
+        is_collection = isinstance(body, Iterable) and not isinstance(body, (dict, str, BaseModel, *BUFFERS))
+        streamed = is_collection and path_handler.stream and isinstance(body, Iterator)
+
+        if is_collection and not streamed:
+            body = list(body)
+
+        if self.mode == Validation.off:
+            return body
+
+        expected_type = path_handler.sig.return_annotation[status]
+
+        if streamed:
+            if not isinstance(expected_type, list):
+                self.invalid(path_handler, body, f"The body should be of type '{expected_type.__name__}'")
+            else:
+                body = self.stream(path_handler, body, expected_type[0])
+        elif isinstance(expected_type, list):
+            if not is_collection:
+                self.invalid(path_handler, body, f"The body should be a list of '{expected_type[0].__name__}'")
+            elif not all(isinstance(rec, expected_type[0]) for rec in self.records(body)):
+                self.invalid(path_handler, body, f"All records should be of type '{expected_type[0].__name__}'")
+        elif not isinstance(body, expected_type):
+            self.invalid(path_handler, body, f"The body should be of type '{expected_type.__name__}'")
+
+        return body
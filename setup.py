@@ -4,7 +4,10 @@ extras = {
     'azure': ['azure-functions'],
     'tests': ['requests', 'deepdiff'],
     'spec': ['pyyaml'],
-    'flask': ['flask']
+    'flask': ['flask'],
+    'orjson': ['orjson'],
+    'ujson': ['ujson'],
+    'msgspec': ['msgspec']
 }
 
 all_deps = set()
@@ -21,6 +24,9 @@ setup(
     description='A router for AWS Lambda and Azure Functions',
     packages=find_packages(),
     install_requires=['jsonschema', 'pydantic'],
+    entry_points={
+        'console_scripts': ['restless=restless.__main__:main']
+    },
     extras_require=dict(
         all=list(all_deps),
         **extras
@@ -0,0 +1,128 @@
+from unittest import TestCase
+import asyncio
+import json
+from restless.aio import run
+from restless.files import FileBody
+from restless.interfaces.asgi import AsgiHandler
+from restless.parameters import BinaryParameter, BodyParameter, QueryParameter
+
+
+class Message(BodyParameter):
+    text_value: str
+
+
+async def call(app, method: str, path: str, query: bytes = b'', headers: list = None, chunks: list = None):
+    chunks = chunks or [b'']
+    scope = {'type': 'http', 'method': method.upper(), 'path': path, 'query_string': query, 'headers': headers or []}
+    inbound = [
+        {'type': 'http.request', 'body': chunk, 'more_body': i < len(chunks) - 1}
+        for i, chunk in enumerate(chunks)
+    ]
+    sent = []
+
+    async def receive():
+        return inbound.pop(0)
+
+    async def send(message):
+        sent.append(message)
+
+    await app(scope, receive, send)
+
+    return sent
+
+
+class TestAsgi(TestCase):
+    def setUp(self) -> None:
+        self.handler = AsgiHandler('Test API', 'meh', '0.1')
+
+    def test_json(self):
+        @self.handler.handle('post', '/messages')
+        async def post_message(message: Message, prefix: QueryParameter = '') -> {200: Message}:
+            await asyncio.sleep(0)
+            return Message(text_value=prefix + message.text_value)
+
+        sent = run(call(
+            self.handler.app, 'post', '/messages', query=b'prefix=%3E',
+            headers=[(b'content-type', b'application/json')], chunks=[b'{"textVal', b'ue": "hi"}']
+        ))
+
+        self.assertEqual('http.response.start', sent[0]['type'])
+        self.assertEqual(200, sent[0]['status'])
+        self.assertIn((b'content-type', b'application/json'), sent[0]['headers'])
+        self.assertEqual({'textValue': '>hi'}, json.loads(b''.join(m.get('body', b'') for m in sent[1:])))
+        self.assertFalse(sent[-1]['more_body'])
+
+    def test_bad_body(self):
+        @self.handler.handle('post', '/messages')
+        def post_message(message: Message) -> {200: Message}:
+            return message
+
+        for body in [b'{"textValue": ', b'[{"textValue": "hi"}]', b'1']:
+            with self.subTest(body):
+                sent = run(call(
+                    self.handler.app, 'post', '/messages', headers=[(b'content-type', b'application/json')],
+                    chunks=[body]
+                ))
+
+                self.assertEqual(400, sent[0]['status'])
+
+    def test_stream(self):
+        @self.handler.handle('get', '/messages', stream=True)
+        def messages() -> {200: [Message]}:
+            for i in range(3):
+                yield Message(text_value=str(i))
+
+        sent = run(call(self.handler.app, 'get', '/messages'))
+
+        self.assertEqual(
+            [{'textValue': '0'}, {'textValue': '1'}, {'textValue': '2'}],
+            json.loads(b''.join(m.get('body', b'') for m in sent[1:]))
+        )
+        self.assertGreater(len(sent), 3)
+
+    def test_list(self):
+        @self.handler.handle('get', '/messages')
+        def messages() -> {200: [Message]}:
+            return [Message(text_value=str(i)) for i in range(3)]
+
+        sent = run(call(self.handler.app, 'get', '/messages'))
+
+        self.assertEqual([{'textValue': '0'}, {'textValue': '1'}, {'textValue': '2'}], json.loads(sent[1]['body']))
+        self.assertEqual(3, len(sent))
+
+    def test_large_body(self):
+        self.handler.max_memory = 10
+
+        @self.handler.handle('post', '/upload')
+        def upload(data: BinaryParameter) -> {200: FileBody}:
+            return FileBody(data)
+
+        sent = run(call(self.handler.app, 'post', '/upload', chunks=[b'0123456789', b'abcdef']))
+
+        self.assertEqual(200, sent[0]['status'])
+        self.assertIn((b'content-length', b'16'), sent[0]['headers'])
+        self.assertEqual(b'0123456789abcdef', b''.join(m.get('body', b'') for m in sent[1:]))
+
+    def test_large_json_body(self):
+        self.handler.max_memory = 10
+        matches = []
+        match = self.handler.router.match
+        self.handler.router.match = lambda *args: matches.append(args) or match(*args)
+
+        @self.handler.handle('post', '/messages')
+        def post_message(message: Message) -> {200: Message}:
+            return message
+
+        sent = run(call(
+            self.handler.app, 'post', '/messages', headers=[(b'content-type', b'application/json')],
+            chunks=[b'{"textValue": ', b'"' + b'x' * 100 + b'"}']
+        ))
+
+        self.assertEqual(200, sent[0]['status'])
+        self.assertEqual({'textValue': 'x' * 100}, json.loads(b''.join(m.get('body', b'') for m in sent[1:])))
+        self.assertEqual(1, len(matches))
+
+    def test_missing(self):
+        sent = run(call(self.handler.app, 'get', '/missing'))
+
+        self.assertEqual(404, sent[0]['status'])
@@ -0,0 +1,91 @@
+from unittest import TestCase
+import asyncio
+import threading
+import time
+import json
+from restless import Handler
+from restless.aio import get_loop, run
+from restless.errors import Forbidden
+from restless.interfaces.aws import Request, Response
+from restless.parameters import AuthorizerParameter, PathParameter
+from restless.security import Restrict
+
+
+class TestAsync(TestCase):
+    def setUp(self) -> None:
+        self.handler = Handler(Request, Response, max_workers=2)
+
+    def test_sync_call(self):
+        loops = []
+
+        @self.handler.handle('get', '/items/<item_id>')
+        async def get_item(item_id: PathParameter) -> {200: dict}:
+            loops.append(asyncio.get_running_loop())
+            await asyncio.sleep(0)
+            return {'item_id': item_id}
+
+        for i in range(2):
+            out = self.handler({'path': f'/items/{i}', 'httpMethod': 'get'})
+
+            self.assertEqual(200, out['statusCode'], out['body'])
+            self.assertEqual({'item_id': str(i)}, json.loads(out['body']))
+
+        self.assertIs(loops[0], loops[1])
+        self.assertIs(get_loop(), loops[0])
+
+    def test_concurrency(self):
+        @self.handler.handle('get', '/slow')
+        async def slow() -> {200: dict}:
+            await asyncio.sleep(0.2)
+            return {'done': True}
+
+        async def calls():
+            return await asyncio.gather(
+                *[self.handler.call_async({'path': '/slow', 'httpMethod': 'get'}) for _ in range(10)]
+            )
+
+        start = time.perf_counter()
+        outs = run(calls())
+
+        self.assertLess(time.perf_counter() - start, 1)
+        self.assertEqual([200] * 10, [out['statusCode'] for out in outs])
+
+    def test_executor(self):
+        threads = []
+
+        @self.handler.handle('get', '/blocking')
+        def blocking() -> {200: dict}:
+            threads.append(threading.current_thread().name)
+            time.sleep(0.1)
+            return {'done': True}
+
+        async def calls():
+            return await asyncio.gather(
+                *[self.handler.call_async({'path': '/blocking', 'httpMethod': 'get'}) for _ in range(4)]
+            )
+
+        start = time.perf_counter()
+        outs = run(calls())
+
+        self.assertGreaterEqual(time.perf_counter() - start, 0.2)
+        self.assertEqual([200] * 4, [out['statusCode'] for out in outs])
+        self.assertTrue(all(name.startswith('restless') for name in threads))
+        self.assertLessEqual(len(set(threads)), 2)
+
+    def test_errors(self):
+        def checker(auth: AuthorizerParameter):
+            if auth['role'] != 'admin':
+                raise Forbidden('User must be an Admin')
+
+        @self.handler.handle('get', '/admin')
+        @Restrict(checker)
+        async def admin(auth: AuthorizerParameter) -> {200: dict}:
+            return {}
+
+        out = run(self.handler.call_async(
+            {'path': '/admin', 'httpMethod': 'get', 'requestContext': {'authorizer': {'role': 'user'}}}
+        ))
+        self.assertEqual(403, out['statusCode'])
+
+        out = run(self.handler.call_async({'path': '/missing', 'httpMethod': 'get'}))
+        self.assertEqual(404, out['statusCode'])
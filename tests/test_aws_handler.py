@@ -1,6 +1,6 @@
 from unittest import TestCase
 from restless import Handler
-from restless.interfaces.aws import Response, Request
+from restless.interfaces.aws import Response, Request, StreamingResponse, LocalResponseStream, streaming
 from restless.parameters import PathParameter, QueryParameter, HeaderParameter, FormFile, FormParameter, \
     BinaryParameter, BodyParameter, AuthorizerParameter
 from restless.errors import Forbidden, Unauthorized, Missing
@@ -10,6 +10,7 @@ import json
 from datetime import datetime
 from typing import List, Optional
 from enum import Enum
+from uuid import UUID
 from restless.security import Restrict
 
 
@@ -100,9 +101,9 @@ class TestHandler(TestCase):
                 'statusCode': 200,
                 'headers': {'Content-Type': 'application/json'},
                 'isBase64Encoded': False,
-                'body': '{"id": "1", "auth_a": "B"}'
+                'body': {"id": "1", "auth_a": "B"}
             },
-            out
+            {**out, 'body': json.loads(out['body'])}
         )
 
     def testObjectReponse(self):
@@ -127,9 +128,9 @@ class TestHandler(TestCase):
                 'statusCode': 200,
                 'headers': {'Content-Type': 'application/json'},
                 'isBase64Encoded': False,
-                'body': '{"id": 1}'
+                'body': {"id": 1}
             },
-            out
+            {**out, 'body': json.loads(out['body'])}
         )
 
     def testHeaders(self):
@@ -196,6 +197,42 @@ class TestHandler(TestCase):
             }
         )
 
+    def testValidation(self):
+        invalid = []
+        handler = Handler(
+            Request, Response, validation='sampled', on_invalid_response=lambda *args: invalid.append(args[2])
+        )
+
+        @handler.handle('get', '/some/sampled')
+        def get_sampled() -> {200: [dict]}:
+            return ["not a dict"] + [{"id": i} for i in range(1000)]
+
+        @handler.handle('get', '/some/full', validation='full')
+        def get_full() -> {200: [dict]}:
+            return [{"id": i} for i in range(1000)] + ["not a dict"]
+
+        @handler.handle('get', '/some/off', validation='off')
+        def get_off() -> {200: dict}:
+            return "some string"
+
+        for endpoint, expected in [
+            ('sampled', ["All records should be of type 'dict'"]),
+            ('full', ["All records should be of type 'dict'"]),
+            ('off', [])
+        ]:
+            with self.subTest(endpoint):
+                invalid.clear()
+
+                out = handler(
+                    {
+                        "path": "/some/" + endpoint,
+                        "httpMethod": 'get'
+                    }
+                )
+
+                self.assertEqual(200, out['statusCode'])
+                self.assertEqual(expected, invalid)
+
     def testEnum(self):
         handler = Handler(Request, Response)
 
@@ -277,12 +314,62 @@ class TestHandler(TestCase):
             out
         )
 
+    def testStreamGenerator(self):
+        handler = Handler(Request, StreamingResponse, use_camel_case=True)
+        produced = []
+
+        @handler.handle('get', '/some/stream', stream=True)
+        def get_stream(count: QueryParameter[int]) -> {200: [dict]}:
+            for i in range(count):
+                produced.append(i)
+                yield {"record_id": i}
+
+        out = handler(
+            {
+                "path": "/some/stream",
+                "httpMethod": 'get',
+                "queryStringParameters": {
+                    "count": "3"
+                }
+            }
+        )
+
+        self.assertEqual([], produced)
+
+        chunks = iter(out)
+        self.assertEqual(
+            b'{"statusCode": 200, "headers": {"Content-Type": "application/json"}}' + b'\x00' * 8, next(chunks)
+        )
+        self.assertEqual(b'[{"recordId": 0}', next(chunks))
+        self.assertEqual([0], produced)
+
+        stream = LocalResponseStream()
+        streaming(handler)(
+            {
+                "path": "/some/stream",
+                "httpMethod": 'get',
+                "queryStringParameters": {
+                    "count": "3"
+                }
+            },
+            stream
+        )
+
+        self.assertEqual(
+            {
+                'statusCode': 200,
+                'headers': {'Content-Type': 'application/json'},
+                'body': b'[{"recordId": 0}, {"recordId": 1}, {"recordId": 2}]'
+            },
+            stream.response
+        )
+
     def testBodyParameter(self):
         handler = Handler(Request, Response)
 
         class User(BodyParameter):
             id: int
-            name = 'John Doe'
+            name: str = 'John Doe'
             signup_ts: Optional[datetime] = None
             friends: List[int] = []
 
@@ -329,12 +416,18 @@ class TestHandler(TestCase):
                 out["statusCode"]
             )
 
+        for name, body in [('MALFORMED', '{"id": 1'), ('ARRAY', '[{"id": 1}]'), ('SCALAR', '1')]:
+            with self.subTest(name):
+                out = handler({"path": "/some/body", "httpMethod": 'post', 'body': body})
+
+                self.assertEqual(400, out["statusCode"], out["body"])
+
     def testBodyParameterCamel(self):
         handler = Handler(Request, Response, use_camel_case=True)
 
         class User(BodyParameter):
             id: int
-            name = 'John Doe'
+            name: str = 'John Doe'
             signup_ts: Optional[datetime] = None
             friends: List[int] = []
 
@@ -363,7 +456,7 @@ class TestHandler(TestCase):
             )
 
             self.assertEqual(
-                '{"parameterValue": {"id": 123, "signupTs": "2019-06-01T12:22:00", "friends": [1, 2, 3], "name": "John Doe"}}',
+                '{"parameterValue": {"id": 123, "name": "John Doe", "signupTs": "2019-06-01T12:22:00", "friends": [1, 2, 3]}}',
                 out['body']
             )
 
@@ -530,6 +623,63 @@ class TestHandler(TestCase):
             out
         )
 
+    def testTypedParameters(self):
+        handler = Handler(Request, Response)
+
+        @handler.handle('get', '/some/path/<item_id>')
+        def get_typed(
+                item_id: PathParameter[UUID], limit: QueryParameter[int], ids: QueryParameter[List[int]],
+                since: QueryParameter[datetime] = None, verbose: HeaderParameter[bool] = False
+        ) -> {200: dict}:
+            return {"item_id": str(item_id), "limit": limit, "ids": ids, "since": since, "verbose": verbose}
+
+        with self.subTest('OK'):
+            out = handler(
+                {
+                    "path": "/some/path/12345678-1234-5678-1234-567812345678",
+                    "httpMethod": 'get',
+                    "headers": {
+                        "verbose": "true"
+                    },
+                    "queryStringParameters": {
+                        "limit": "10",
+                        "ids": "2",
+                        "since": "2020-01-01T00:00:00Z"
+                    },
+                    "multiValueQueryStringParameters": {
+                        "limit": ["10"],
+                        "ids": ["1", "2"],
+                        "since": ["2020-01-01T00:00:00Z"]
+                    }
+                }
+            )
+
+            self.assertEqual(
+                {
+                    "item_id": "12345678-1234-5678-1234-567812345678",
+                    "limit": 10,
+                    "ids": [1, 2],
+                    "since": "2020-01-01T00:00:00+00:00",
+                    "verbose": True
+                },
+                json.loads(out['body'])
+            )
+
+        with self.subTest('Bad'):
+            out = handler(
+                {
+                    "path": "/some/path/12345678-1234-5678-1234-567812345678",
+                    "httpMethod": 'get',
+                    "queryStringParameters": {
+                        "limit": "ten",
+                        "ids": "1,2"
+                    }
+                }
+            )
+
+            self.assertEqual(400, out['statusCode'])
+            self.assertEqual('{"error": "The value for limit must be a valid int"}', out['body'])
+
     def testHeaderParameter(self):
         handler = Handler(Request, Response)
 
@@ -557,6 +707,30 @@ class TestHandler(TestCase):
             out
         )
 
+    def testHeaderNames(self):
+        handler = Handler(Request, Response)
+
+        @handler.handle('get', '/some/path')
+        def get_basic(
+                x_request_id: HeaderParameter, user_agent: HeaderParameter = None,
+                accept: HeaderParameter[List[str]] = None
+        ) -> {200: dict}:
+            return {"request_id": x_request_id, "user_agent": user_agent, "accept": accept}
+
+        out = handler(
+            {
+                "path": "/some/path",
+                "httpMethod": 'get',
+                "headers": {"X-Request-Id": "abc", "user-agent": "curl", "Accept": "application/json"},
+                "multiValueHeaders": {"Accept": ["text/html", "application/json"]}
+            }
+        )
+
+        self.assertEqual(
+            {"request_id": "abc", "user_agent": "curl", "accept": ["text/html", "application/json"]},
+            json.loads(out['body'])
+        )
+
     def testQueryParameter(self):
         handler = Handler(Request, Response)
 
@@ -635,6 +809,27 @@ class TestHandler(TestCase):
             out
         )
 
+    def testLazyDecoding(self):
+        handler = Handler(Request, Response, use_camel_case=True)
+
+        @handler.handle('post', '/some/path/<parameter>')
+        def post_basic(parameter: PathParameter) -> {200: dict}:
+            return {"parameter_value": parameter}
+
+        event = {
+            "path": "/some/path/1",
+            "httpMethod": 'post',
+            "body": '{"not": json',
+            "headers": {"someHeader": "value"},
+            "queryStringParameters": {"someQuery": "value"}
+        }
+        req = Request(event)
+
+        self.assertEqual(set(), req.__dict__.keys() & {'payload', 'headers', 'query', 'multi_query'})
+        self.assertEqual('value', req.headers['some_header'])
+        self.assertEqual({'some_query': 'value'}, req.query)
+        self.assertEqual('{"parameterValue": "1"}', handler(event)['body'])
+
     def testNotFound(self):
         handler = Handler(Request, Response)
 
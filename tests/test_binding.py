@@ -0,0 +1,163 @@
+from unittest import TestCase
+from inspect import signature
+from enum import Enum
+from typing import Iterator, List
+import json
+from restless import Handler
+from restless.binding import make_plan, bind, PATH, QUERY, HEADER, BODY, AUTHORIZER, ANY
+from restless.compat import ValidationError
+from restless.interfaces.aws import Request, Response
+from restless.parameters import PathParameter, QueryParameter, HeaderParameter, BodyParameter, AuthorizerParameter
+from restless.errors import BadRequest
+
+
+class Item(BodyParameter):
+    id: int
+
+
+class Color(Enum):
+    red = 'red'
+
+
+def endpoint(
+        item_id: PathParameter, item: Item, auth: AuthorizerParameter, color: QueryParameter.enum(Color),
+        user_agent: HeaderParameter = 'unknown', other=None
+):
+    pass
+
+
+class TestBinding(TestCase):
+    def setUp(self) -> None:
+        self.plan = make_plan(signature(endpoint).parameters)
+
+    def test_plan(self):
+        self.assertEqual(
+            [
+                ('item_id', PATH),
+                ('item', BODY),
+                ('auth', AUTHORIZER),
+                ('color', QUERY),
+                ('user_agent', HEADER),
+                ('other', ANY)
+            ],
+            [(binding.name, binding.source) for binding in self.plan]
+        )
+
+    def test_bind(self):
+        req = Request(
+            {
+                'path': '/items/1',
+                'httpMethod': 'post',
+                'headers': {'unused': 'header'},
+                'queryStringParameters': {'color': 'red', 'other': 'value'},
+                'body': '{"id": 1}',
+                'requestContext': {'authorizer': {'role': 'admin'}}
+            },
+            use_camel_case=False
+        )
+
+        self.assertEqual(
+            {
+                'item_id': '1',
+                'item': Item(id=1),
+                'auth': {'role': 'admin'},
+                'color': Color.red,
+                'other': 'value'
+            },
+            bind(self.plan, req, {'item_id': '1'}, 'endpoint')
+        )
+
+    def test_camel_query(self):
+        def search(page_size: QueryParameter[int], tag_names: QueryParameter[List[str]], sort_order=None):
+            pass
+
+        plan = make_plan(signature(search).parameters)
+
+        for query in [{'pageSize': '10', 'sortOrder': 'asc'}, {'page_size': '10', 'sort_order': 'asc'}]:
+            with self.subTest(query):
+                req = Request(
+                    {
+                        'path': '/search',
+                        'httpMethod': 'get',
+                        'queryStringParameters': {**query, 'unused': 'x'},
+                        'multiValueQueryStringParameters': {'tagNames': ['a', 'b']}
+                    },
+                    use_camel_case=True
+                )
+
+                self.assertEqual(
+                    {'page_size': 10, 'tag_names': ['a', 'b'], 'sort_order': 'asc'},
+                    bind(plan, req, {}, 'search')
+                )
+                self.assertEqual(set(), req.__dict__.keys() & {'query', 'multi_query'})
+
+    def test_missing(self):
+        req = Request({'path': '/items/1', 'httpMethod': 'post', 'body': '{"id": 1}'}, use_camel_case=False)
+
+        with self.assertRaises(BadRequest) as context:
+            bind(self.plan, req, {'item_id': '1'}, 'endpoint')
+
+        self.assertEqual("endpoint() missing 1 required positional argument: 'color'", context.exception.args[0])
+
+    def test_parameter_classes(self):
+        self.assertIs(PathParameter[int], PathParameter[int])
+        self.assertIs(QueryParameter.enum(Color), QueryParameter[Color])
+        self.assertIsNot(PathParameter[int], QueryParameter[int])
+        self.assertEqual(int, PathParameter[int].TYPE)
+
+    def test_model_lists(self):
+        def bulk(items: List[Item]):
+            pass
+
+        def stream(items: Iterator[Item]):
+            pass
+
+        plan = make_plan(signature(bulk).parameters)
+
+        self.assertEqual([('items', BODY, True)], [(binding.name, binding.source, binding.many) for binding in plan])
+
+        for use_camel_case in (False, True):
+            with self.subTest(use_camel_case=use_camel_case):
+                req = Request({'path': '/items', 'httpMethod': 'post', 'body': '[{"id": 1}, {"id": "2"}]'},
+                              use_camel_case=use_camel_case)
+
+                self.assertEqual({'items': [Item(id=1), Item(id=2)]}, bind(plan, req, {}, 'bulk'))
+
+        with self.subTest('Errors'):
+            req = Request({'path': '/items', 'httpMethod': 'post', 'body': '[{"id": 1}, {}, {"id": "x"}]'})
+
+            with self.assertRaises(ValidationError) as context:
+                bind(plan, req, {}, 'bulk')
+
+            self.assertEqual([(1, 'id'), (2, 'id')], [tuple(error['loc']) for error in context.exception.errors()])
+
+        with self.subTest('Missing'):
+            with self.assertRaises(BadRequest):
+                bind(plan, Request({'path': '/items', 'httpMethod': 'post'}), {}, 'bulk')
+
+        with self.subTest('Lazy'):
+            req = Request({'path': '/items', 'httpMethod': 'post', 'body': '[{"id": 1}, {"id": "x"}]'})
+            items = bind(make_plan(signature(stream).parameters), req, {}, 'stream')['items']
+
+            self.assertEqual(Item(id=1), next(items))
+
+            with self.assertRaises(ValidationError) as context:
+                next(items)
+
+            self.assertEqual([(1, 'id')], [tuple(error['loc']) for error in context.exception.errors()])
+
+    def test_model_list_errors(self):
+        handler = Handler(Request, Response)
+
+        @handler.handle('post', '/items')
+        def post_items(items: Iterator[Item]) -> {200: dict}:
+            return {'count': sum(1 for _ in items)}
+
+        out = handler({'path': '/items', 'httpMethod': 'post', 'body': '[{"id": 1}, {"id": 2}]'})
+
+        self.assertEqual({'count': 2}, json.loads(out['body']))
+
+        out = handler({'path': '/items', 'httpMethod': 'post', 'body': '[{"id": 1}, {"id": "x"}]'})
+
+        self.assertEqual(400, out['statusCode'])
+        self.assertEqual([[1, 'id']], [error['loc'] for error in json.loads(out['body'])['details']])
@@ -0,0 +1,91 @@
+from unittest import TestCase
+from datetime import datetime
+from typing import List, Optional
+import json
+from restless import Handler
+from restless.compat import PYDANTIC_V2, dump_json, model_schema
+from restless.interfaces.aws import Request, Response
+from restless.parameters import BodyParameter
+
+
+class Tag(BodyParameter):
+    tag_name: str
+
+
+class Item(BodyParameter):
+    item_id: int
+    created: Optional[datetime] = None
+    tags: List[Tag] = []
+
+
+class SpecialItem(Item):
+    special: bool = True
+
+
+class TestCompat(TestCase):
+    def setUp(self) -> None:
+        self.handler = Handler(Request, Response)
+
+        @self.handler.handle('post', '/items')
+        def post_item(item: Item) -> {200: Item}:
+            return item
+
+        @self.handler.handle('get', '/items')
+        def get_items() -> {200: [Item]}:
+            return [Item(item_id=1), SpecialItem(item_id=2)]
+
+    def test_body(self):
+        camel_handler = Handler(Request, Response, use_camel_case=True)
+        camel_handler.router = self.handler.router
+
+        with self.subTest('Raw JSON'):
+            body = {'item_id': '1', 'created': '2020-01-01T00:00:00', 'tags': [{'tag_name': 'a'}]}
+            out = self.handler({'path': '/items', 'httpMethod': 'post', 'body': json.dumps(body)})
+
+            self.assertEqual(200, out['statusCode'])
+            self.assertEqual(
+                {'item_id': 1, 'created': '2020-01-01T00:00:00', 'tags': [{'tag_name': 'a'}]}, json.loads(out['body'])
+            )
+
+        with self.subTest('camelCase'):
+            body = {'itemId': '1', 'created': '2020-01-01T00:00:00', 'tags': [{'tagName': 'a'}]}
+            out = camel_handler({'path': '/items', 'httpMethod': 'post', 'body': json.dumps(body)})
+
+            self.assertEqual(200, out['statusCode'])
+            self.assertEqual(
+                {'itemId': 1, 'created': '2020-01-01T00:00:00', 'tags': [{'tagName': 'a'}]}, json.loads(out['body'])
+            )
+
+    def test_invalid_body(self):
+        out = self.handler({'path': '/items', 'httpMethod': 'post', 'body': json.dumps({'item_id': 'x'})})
+        error = json.loads(out['body'])
+
+        self.assertEqual(400, out['statusCode'])
+        self.assertEqual('Validation Error', error['error'])
+        self.assertEqual(['item_id'], [detail['loc'][-1] for detail in error['details']])
+
+    def test_mixed_list(self):
+        out = self.handler({'path': '/items', 'httpMethod': 'get'})
+
+        self.assertEqual(
+            [{'item_id': 1, 'created': None, 'tags': []},
+             {'item_id': 2, 'created': None, 'tags': [], 'special': True}],
+            json.loads(out['body'])
+        )
+
+    def test_dump_json(self):
+        item = Item(item_id=1, tags=[Tag(tag_name='a')])
+
+        if not PYDANTIC_V2:
+            self.assertIsNone(dump_json(item))
+            return
+
+        self.assertEqual(b'{"item_id":1,"created":null,"tags":[{"tag_name":"a"}]}', dump_json(item))
+        self.assertEqual(b'[{"tag_name":"a"},{"tag_name":"b"}]', dump_json([Tag(tag_name='a'), Tag(tag_name='b')]))
+        self.assertIsNone(dump_json([item, SpecialItem(item_id=2)]))
+        self.assertIsNone(dump_json({'item': item}))
+
+    def test_schema(self):
+        schema = model_schema(Item, '#/components/schemas/{model}')
+
+        self.assertEqual({'type': 'string', 'format': 'date-time', 'title': 'Created'}, schema['properties']['created'])
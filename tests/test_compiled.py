@@ -0,0 +1,171 @@
+from unittest import TestCase
+from enum import Enum
+from tempfile import TemporaryDirectory
+import json
+import os
+import pickle
+import sys
+from pydantic import Field
+from restless import Handler
+from restless.__main__ import main
+from restless.compiled import FORMAT, load, save
+from restless.interfaces.aws import Request, Response
+from restless.interfaces.flask_app import FlaskHandler
+from restless.parameters import BodyParameter, PathParameter, QueryParameter
+from restless.util import Formats
+
+APP = '''
+from restless import Handler
+from restless.interfaces.aws import Request, Response
+
+handler = Handler(Request, Response)
+
+
+@handler.handle('get', '/ping')
+def ping() -> {200: dict}:
+    return {'pong': True}
+'''
+
+
+class Color(Enum):
+    red = 'red'
+
+
+class Item(BodyParameter):
+    name: str
+
+
+def get_item(item_id: PathParameter[int], color: QueryParameter[Color] = None, limit: QueryParameter[int] = 10
+             ) -> {200: dict}:
+    return {'item_id': item_id, 'color': color.value if color else None, 'limit': limit}
+
+
+def post_item(item: Item) -> {200: Item}:
+    return item
+
+
+def register(handler: Handler, getter=get_item):
+    handler.handle('get', '/items/<item_id>')(getter)
+    handler.handle('post', '/items')(post_item)
+
+    return handler
+
+
+class TestCompiled(TestCase):
+    def setUp(self) -> None:
+        self.directory = TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'restless.compiled')
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+    def test_restore(self):
+        save(register(Handler(Request, Response)), self.path)
+        handler = register(Handler(Request, Response, compiled=self.path))
+
+        self.assertEqual([], handler.stale)
+        self.assertTrue(all('plan' not in path_handler.__dict__ for path_handler in handler.handlers))
+        self.assertTrue(all('sig' not in path_handler.__dict__ for path_handler in handler.handlers))
+
+        out = handler({'path': '/items/1', 'httpMethod': 'get', 'queryStringParameters': {'color': 'red'}})
+        self.assertEqual({'item_id': 1, 'color': 'red', 'limit': 10}, json.loads(out['body']))
+
+        out = handler({'path': '/items', 'httpMethod': 'post', 'body': '{"name": "x"}'})
+        self.assertEqual({'name': 'x'}, json.loads(out['body']))
+
+        out = handler({'path': '/items/x', 'httpMethod': 'get'})
+        self.assertEqual(400, out['statusCode'])
+
+    def test_stale(self):
+        save(register(Handler(Request, Response)), self.path)
+
+        def get_item(item_id: PathParameter[str]) -> {200: dict}:
+            return {'item_id': item_id}
+
+        handler = register(Handler(Request, Response, compiled=self.path), get_item)
+
+        self.assertEqual([('GET', '/items/<item_id>')], handler.stale)
+
+        out = handler({'path': '/items/x', 'httpMethod': 'get'})
+        self.assertEqual({'item_id': 'x'}, json.loads(out['body']))
+
+    def test_stale_schema(self):
+        def register_note(handler: Handler, default=..., max_length: int = 10, doc: str = None) -> Handler:
+            class Note(BodyParameter):
+                __doc__ = doc
+                text: str = Field(default, max_length=max_length)
+
+            def post_note(note: Note) -> {200: Note}:
+                return note
+
+            handler.handle('post', '/notes')(post_note)
+
+            return handler
+
+        save(register_note(FlaskHandler('Test API', 'meh', '0.1')), self.path)
+        handler = register_note(FlaskHandler('Test API', 'meh', '0.1', compiled=self.path))
+        handler.spec_document(Formats.json)
+
+        self.assertIsNone(handler._spec_cache.spec)
+
+        for name, changes in [
+            ('Constraint', {'max_length': 99}), ('Default', {'default': ''}), ('Docstring', {'doc': 'A note'})
+        ]:
+            with self.subTest(name):
+                handler = register_note(FlaskHandler('Test API', 'meh', '0.1', compiled=self.path), **changes)
+                spec = json.loads(handler.spec_document(Formats.json).data)
+
+                # The binding plan still comes from the artifact, only the spec is built again
+                self.assertEqual([], handler.stale)
+                self.assertIsNotNone(handler._spec_cache.spec)
+                self.assertEqual(
+                    handler._spec_cache.spec['components']['schemas']['Note'], spec['components']['schemas']['Note']
+                )
+
+    def test_stale_docstring(self):
+        save(register(Handler(Request, Response)), self.path)
+        get_item.__doc__ = 'Reads an item'
+
+        try:
+            handler = register(Handler(Request, Response, compiled=self.path))
+            self.assertEqual([('GET', '/items/<item_id>')], handler.stale)
+        finally:
+            get_item.__doc__ = None
+
+    def test_spec(self):
+        compiled = register(FlaskHandler('Test API', 'meh', '0.1'))
+        save(compiled, self.path)
+        handler = register(FlaskHandler('Test API', 'meh', '0.1', compiled=self.path))
+
+        out = handler.app.test_client().get('/spec/swagger.json')
+
+        self.assertEqual(compiled.spec_document(Formats.json).data, out.data)
+        self.assertIsNone(handler._spec_cache.spec)
+
+        with self.subTest('Stale'):
+            handler = register(FlaskHandler('Test API', 'meh', '0.2', compiled=self.path))
+
+            self.assertEqual('0.2', handler.app.test_client().get('/spec/swagger.json').json['info']['version'])
+
+    def test_invalid(self):
+        for data in [b'not an artifact', pickle.dumps({'format': FORMAT, 'routes': {}})]:
+            with open(self.path, 'wb') as dst:
+                dst.write(data)
+
+            self.assertIsNone(load(self.path))
+
+        self.assertIsNone(load(os.path.join(self.directory.name, 'missing')))
+
+    def test_command(self):
+        with open(os.path.join(self.directory.name, 'compiled_app.py'), 'w') as dst:
+            dst.write(APP)
+
+        sys.path.insert(0, self.directory.name)
+
+        try:
+            main(['compile', 'compiled_app:handler', '-o', self.path])
+        finally:
+            sys.path.remove(self.directory.name)
+            sys.modules.pop('compiled_app', None)
+
+        self.assertEqual({('GET', '/ping')}, set(load(self.path)['routes']))
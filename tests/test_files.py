@@ -0,0 +1,60 @@
+from unittest import TestCase
+from base64 import b64encode
+from io import BytesIO, SEEK_END
+from mmap import mmap
+from tempfile import NamedTemporaryFile
+from restless import Handler
+from restless.files import BufferReader, FileBody
+from restless.interfaces.aws import Request, Response
+
+DATA = bytes(range(256)) * 40 + b'tail'
+
+
+class TestFileBody(TestCase):
+    def test_b64encode(self):
+        with NamedTemporaryFile() as file:
+            file.write(DATA)
+            file.flush()
+
+            buffer = mmap(-1, len(DATA))
+            buffer.write(DATA)
+
+            for name, source in [
+                ('bytes', DATA), ('memoryview', memoryview(DATA)), ('mmap', buffer), ('path', file.name)
+            ]:
+                for chunk_size in [1, 10, 4096]:
+                    with self.subTest(name, chunk_size=chunk_size):
+                        self.assertEqual(len(DATA), FileBody(source).size)
+                        self.assertEqual(
+                            b64encode(DATA).decode(), FileBody(source, chunk_size=chunk_size).b64encode()
+                        )
+
+            with self.subTest('file'):
+                self.assertEqual(b64encode(DATA).decode(), FileBody(BytesIO(DATA), chunk_size=10).b64encode())
+
+    def test_buffer_reader(self):
+        reader = BufferReader(memoryview(DATA))
+
+        self.assertEqual(DATA[:10], reader.read(10))
+        self.assertEqual(len(DATA) - 4, reader.seek(-4, SEEK_END))
+        self.assertEqual(b'tail', reader.read())
+        self.assertEqual(b'', reader.read(10))
+
+    def test_aws(self):
+        handler = Handler(Request, Response)
+
+        @handler.handle('get', '/file')
+        def download() -> {200: FileBody}:
+            return FileBody(memoryview(DATA), content_type='image/png')
+
+        out = handler({'path': '/file', 'httpMethod': 'get'})
+
+        self.assertEqual(
+            {
+                'statusCode': 200,
+                'headers': {'Content-Type': 'image/png'},
+                'isBase64Encoded': True,
+                'body': b64encode(DATA).decode()
+            },
+            out
+        )
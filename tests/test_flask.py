@@ -1,8 +1,14 @@
 from restless.security import ApiKeyAuth
-from restless.parameters import BodyParameter
+from restless.parameters import BodyParameter, FormFile, FormParameter, PathParameter, QueryParameter
 from restless.interfaces.flask_app import FlaskHandler
+from restless.openapi import Formats, SpecCache
+from restless.files import FileBody
 from unittest import TestCase
+from unittest.mock import patch
+from io import BytesIO
+from flask import Request
 import os
+import gzip
 import json
 import yaml
 
@@ -40,6 +46,93 @@ class TestRouter(TestCase):
             json.loads(out.data)
         )
 
+    def test_request(self):
+        @self.handler.handle("get", "/messages/<message_id>")
+        def get_message(message_id: PathParameter[int], message: Message, prefix: QueryParameter = '') -> {200: dict}:
+            return {'message_id': message_id, 'text': prefix + message.text}
+
+        out = self.client.get('/messages/1?prefix=re:%20', json={'text': 'hi'})
+
+        self.assertEqual(200, out.status_code, out.data)
+        self.assertEqual({'messageId': 1, 'text': 're: hi'}, out.json)
+
+    def test_bad_body(self):
+        @self.handler.handle("get", "/messages")
+        def get_message(message: Message) -> {200: Message}:
+            return message
+
+        for body in [b'{"text": ', b'["hi"]', b'"hi"']:
+            with self.subTest(body):
+                out = self.client.get('/messages', data=body, content_type='application/json')
+
+                self.assertEqual(400, out.status_code, out.data)
+
+    def test_stream(self):
+        @self.handler.handle("get", "/messages", stream=True)
+        def messages() -> {200: [Message]}:
+            for i in range(3):
+                yield Message(text=str(i))
+
+        out = self.client.get('/messages', buffered=False)
+
+        self.assertTrue(out.is_streamed)
+        self.assertEqual(200, out.status_code, out.data)
+        self.assertEqual(
+            [{'text': '0'}, {'text': '1'}, {'text': '2'}],
+            json.loads(out.data)
+        )
+
+    def test_list(self):
+        @self.handler.handle("get", "/messages")
+        def messages() -> {200: [Message]}:
+            for i in range(3):
+                yield Message(text=str(i))
+
+        out = self.client.get('/messages')
+
+        self.assertEqual(str(len(out.data)), out.headers.get('Content-Length'))
+        self.assertEqual([{'text': '0'}, {'text': '1'}, {'text': '2'}], json.loads(out.data))
+
+    def test_form(self):
+        @self.handler.handle("get", "/uploads")
+        def upload(upload: FormFile, description: FormParameter = '') -> {200: dict}:
+            return {'size': len(upload.data), 'description': description}
+
+        data = {'upload': (BytesIO(b'x' * 100000), 'upload.bin'), 'description': 'some file'}
+
+        with patch.object(Request, 'get_data', side_effect=AssertionError('The body was buffered')):
+            out = self.client.get("/uploads", data=data, content_type="multipart/form-data")
+
+        self.assertEqual(200, out.status_code, out.data)
+        self.assertEqual({'size': 100000, 'description': 'some file'}, out.json)
+
+    def test_file(self):
+        data = bytes(range(256)) * 4
+
+        @self.handler.handle("get", "/file")
+        def download() -> {200: FileBody}:
+            return FileBody(memoryview(data), filename='data.bin')
+
+        with self.subTest('Full'):
+            out = self.client.get('/file')
+
+            self.assertEqual(200, out.status_code)
+            self.assertEqual(data, out.data)
+            self.assertEqual('bytes', out.headers['Accept-Ranges'])
+            self.assertEqual('attachment; filename="data.bin"', out.headers['Content-Disposition'])
+
+        with self.subTest('Range'):
+            out = self.client.get('/file', headers={'Range': 'bytes=10-19'})
+
+            self.assertEqual(206, out.status_code)
+            self.assertEqual(data[10:20], out.data)
+            self.assertEqual('bytes 10-19/1024', out.headers['Content-Range'])
+
+        with self.subTest('Not satisfiable'):
+            out = self.client.get('/file', headers={'Range': 'bytes=2000-'})
+
+            self.assertEqual(416, out.status_code)
+
     def test_spec(self):
         @self.handler.handle("get", "/")
         def root() -> {200: Message}:
@@ -58,6 +151,15 @@ class TestRouter(TestCase):
                                                     'required': ['text'],
                                                     'title': 'Message',
                                                     'type': 'object'}},
+                            'responses': {
+                                name: {'content': {'application/json': {
+                                    'schema': {'$ref': '#/components/schemas/Error'}}},
+                                    'description': description}
+                                for name, description in [
+                                    ('BadRequest', 'Bad Request'), ('Unauthorized', 'Unauthorized'),
+                                    ('Forbidden', 'Forbidden'), ('NotFound', 'Not Found')
+                                ]
+                            },
                             'securitySchemes': {'Authorization': {'in': 'header',
                                                                   'name': 'Authorization',
                                                                   'type': 'apiKey'}}},
@@ -68,18 +170,10 @@ class TestRouter(TestCase):
                                      'responses': {'200': {'content': {
                                          'application/json': {'schema': {'$ref': '#/components/schemas/Message'}}},
                                          'description': 'meh'},
-                                         '400': {'content': {'application/json': {
-                                             'schema': {'$ref': '#/components/schemas/Error'}}},
-                                             'description': 'Bad Request'},
-                                         '401': {'content': {'application/json': {
-                                             'schema': {'$ref': '#/components/schemas/Error'}}},
-                                             'description': 'Unauthorized'},
-                                         '403': {'content': {'application/json': {
-                                             'schema': {'$ref': '#/components/schemas/Error'}}},
-                                             'description': 'Forbidden'},
-                                         '404': {'content': {'application/json': {
-                                             'schema': {'$ref': '#/components/schemas/Error'}}},
-                                             'description': 'Not Found'}},
+                                         '400': {'$ref': '#/components/responses/BadRequest'},
+                                         '401': {'$ref': '#/components/responses/Unauthorized'},
+                                         '403': {'$ref': '#/components/responses/Forbidden'},
+                                         '404': {'$ref': '#/components/responses/NotFound'}},
                                      'tags': ['']}},
                        '/spec/swagger.{extension}': {'get': {'description': 'spec',
                                                              'parameters': [{'description': 'extension',
@@ -92,27 +186,53 @@ class TestRouter(TestCase):
                                                              'responses': {'200': {'content': {
                                                                  'application/json': {'schema': {'type': 'string'}}},
                                                                  'description': 'meh'},
-                                                                 '400': {'content': {'application/json': {
-                                                                     'schema': {
-                                                                         '$ref': '#/components/schemas/Error'}}},
-                                                                     'description': 'Bad '
-                                                                                    'Request'},
-                                                                 '401': {'content': {'application/json': {
-                                                                     'schema': {
-                                                                         '$ref': '#/components/schemas/Error'}}},
-                                                                     'description': 'Unauthorized'},
-                                                                 '403': {'content': {'application/json': {
-                                                                     'schema': {
-                                                                         '$ref': '#/components/schemas/Error'}}},
-                                                                     'description': 'Forbidden'},
-                                                                 '404': {'content': {'application/json': {
-                                                                     'schema': {
-                                                                         '$ref': '#/components/schemas/Error'}}},
-                                                                     'description': 'Not '
-                                                                                    'Found'}},
+                                                                 '400': {'$ref': '#/components/responses/BadRequest'},
+                                                                 '401': {'$ref': '#/components/responses/Unauthorized'},
+                                                                 '403': {'$ref': '#/components/responses/Forbidden'},
+                                                                 '404': {'$ref': '#/components/responses/NotFound'}},
                                                              'tags': ['spec']}}},
              'servers': [],
              'tags': []}
             ,
             yaml.load(out.data, Loader=yaml.SafeLoader)
         )
+
+    def test_spec_cache(self):
+        @self.handler.handle("get", "/")
+        def root() -> {200: Message}:
+            return Message(text="all cool")
+
+        out = self.client.get('/spec/swagger.json')
+        etag = out.headers['ETag']
+
+        self.assertEqual(200, out.status_code, out.data)
+        self.assertEqual('application/json', out.mimetype)
+
+        with self.subTest('Not modified'):
+            out = self.client.get('/spec/swagger.json', headers={'If-None-Match': etag})
+
+            self.assertEqual(304, out.status_code)
+            self.assertEqual(b'', out.data)
+
+        with self.subTest('Gzip'):
+            out = self.client.get('/spec/swagger.yaml', headers={'Accept-Encoding': 'gzip'})
+
+            self.assertEqual('gzip', out.headers['Content-Encoding'])
+            self.assertIn('/', yaml.load(gzip.decompress(out.data), Loader=yaml.SafeLoader)['paths'])
+
+            with patch('time.time', return_value=2e9):
+                self.assertEqual(out.data, SpecCache(self.handler).get(Formats.yaml).gzipped)
+
+        with self.subTest('Invalidated'):
+            @self.handler.handle("get", "/other")
+            def other() -> {200: Message}:
+                return Message(text="other")
+
+            out = self.client.get('/spec/swagger.json', headers={'If-None-Match': etag})
+
+            self.assertEqual(200, out.status_code)
+            self.assertNotEqual(etag, out.headers['ETag'])
+            self.assertIn('/other', json.loads(out.data)['paths'])
+
+        with self.subTest('Unknown format'):
+            self.assertEqual(400, self.client.get('/spec/swagger.xml').status_code)
@@ -0,0 +1,48 @@
+from unittest import TestCase
+import json
+import os
+import subprocess
+import sys
+
+BUDGET_MS = float(os.environ.get('RESTLESS_IMPORT_BUDGET_MS', 60))
+LAZY = ['yaml', 'restless.openapi', 'restless.aio', 'asyncio', 'concurrent.futures']
+STATEMENT = 'import restless, restless.interfaces.aws'
+# Applications define models before restless serves them, by then pydantic has imported its model machinery, tempfile
+# and with v2 asyncio on its own. Only what restless adds on top of that is timed and checked.
+PRELUDE = 'from pydantic import BaseModel\nclass Model(BaseModel): x: int\n'
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def import_time_ms() -> float:
+    out = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', PRELUDE + STATEMENT],
+        capture_output=True, text=True, check=True, cwd=ROOT
+    )
+    total = 0
+
+    for line in out.stderr.splitlines():
+        if not line.startswith('import time:'):
+            continue
+
+        _, _, cumulative, name = (part.strip() for part in line.replace(':', '|', 1).split('|'))
+
+        if name.startswith('restless') and not line.split('|')[-1].startswith('  '):
+            total += int(cumulative)
+
+    return total / 1e3
+
+
+class TestImportTime(TestCase):
+    def test_budget(self):
+        best = min(import_time_ms() for _ in range(3))
+
+        self.assertLess(best, BUDGET_MS, f"'{STATEMENT}' took {best:.0f}ms")
+
+    def test_lazy_modules(self):
+        script = (
+            'import sys, json\n' + PRELUDE + 'before = set(sys.modules); ' + STATEMENT +
+            f'; print(json.dumps([m for m in {LAZY!r} if m in sys.modules and m not in before]))'
+        )
+        out = subprocess.run([sys.executable, '-c', script], capture_output=True, text=True, check=True, cwd=ROOT)
+
+        self.assertEqual([], json.loads(out.stdout))
@@ -1,5 +1,5 @@
 from unittest import TestCase
-from restless.interfaces import azure, aws
+from restless.interfaces import Headers, azure, aws
 from base64 import b64encode
 
 
@@ -234,6 +234,28 @@ class TestAWS(TestCase):
         )
 
 
+class TestHeaders(TestCase):
+    def test_lookup(self):
+        headers = Headers(
+            {'X-Request-Id': 'abc', 'accept': 'application/json, text/plain', 'Content-Type': 'application/json'},
+            {'Accept': ['text/html', 'application/json, text/plain']}
+        )
+
+        for name in ['X-Request-Id', 'x-request-id', 'x_request_id', 'xRequestId', 'xrequestid']:
+            with self.subTest(name):
+                self.assertEqual('abc', headers[name])
+
+        self.assertEqual('application/json, text/plain', headers.get('Accept'))
+        self.assertEqual('application/json', headers['CONTENT-TYPE'])
+        self.assertEqual(['text/html', 'application/json', 'text/plain'], headers.get_all('accept'))
+        self.assertEqual(['application/json'], headers.get_all('content_type'))
+        self.assertEqual([], headers.get_all('missing'))
+        self.assertIsNone(headers.get('missing'))
+        self.assertNotIn('missing', headers)
+        self.assertEqual(4, len(headers))
+        self.assertEqual(['Accept', 'X-Request-Id', 'accept', 'Content-Type'], list(headers))
+
+
 class TestAzure(TestCase):
     def test_input(self):
         r = azure.Request(
@@ -0,0 +1,149 @@
+from unittest import TestCase
+from base64 import b64encode
+import asyncio
+import json
+import requests
+from restless import Handler
+from restless.errors import BadRequest, PayloadTooLarge
+from restless.interfaces.asgi import AsgiHandler
+from restless.interfaces.aws import Request, Response
+from restless.limits import Limits, json_depth
+from restless.multipart import FormData
+from restless.parameters import BodyParameter, FormFile, FormParameter
+
+
+class Item(BodyParameter):
+    name: str
+
+
+def register(handler: Handler) -> Handler:
+    @handler.handle('post', '/items')
+    def post_item(item: Item) -> {200: Item}:
+        return item
+
+    @handler.handle('post', '/uploads', limits=Limits(max_body_size=10 ** 6, max_form_parts=2))
+    def post_upload(upload: FormFile, description: FormParameter = '') -> {200: dict}:
+        return {'size': len(upload.data)}
+
+    return handler
+
+
+def multipart(parts: int, size: int) -> bytes:
+    files = {'upload': ('upload.bin', b'x' * size), **{f'field{i}': (None, 'value') for i in range(parts - 1)}}
+
+    return requests.Request(files=files, url='https://myapi', method='post').prepare().body
+
+
+class TestLimits(TestCase):
+    def setUp(self) -> None:
+        self.handler = register(Handler(Request, Response, limits=Limits(
+            max_body_size=100, max_json_depth=3, max_file_size=1000, max_headers=5
+        )))
+
+    def test_json_depth(self):
+        for document, depth in [
+            ('1', 0), ('[]', 1), ('{"a": [1, {"b": null}]}', 3), ('{"a": "]]}[[{"}', 1), (r'["\"[[", "\\"]', 1),
+            (r'[["\\\"{"]]', 2)
+        ]:
+            with self.subTest(document):
+                self.assertEqual(depth, json_depth(document, 10))
+                self.assertEqual(depth, json_depth(document.encode(), 10))
+
+        self.assertEqual(4, json_depth('[' * 1000 + ']' * 1000, 3))
+        self.assertEqual(3, json_depth('[[], [[], [[]]]]', 2))
+
+        for document in ['{bad', '{"a": [1}', '[]]', '][', '{"a": "x', '[[[]]' + ']' * 5]:
+            with self.subTest(document):
+                self.assertRaises(BadRequest, json_depth, document, 10)
+
+    def test_merge(self):
+        self.assertEqual(
+            Limits(max_body_size=10, max_json_depth=3), Limits(100, 3).merge(Limits(max_body_size=10))
+        )
+        self.assertEqual(Limits(100), Limits(100).merge(None))
+
+    def test_body(self):
+        with self.subTest('OK'):
+            out = self.handler({'path': '/items', 'httpMethod': 'post', 'body': '{"name": "x"}'})
+            self.assertEqual(200, out['statusCode'])
+
+        with self.subTest('Too large'):
+            out = self.handler({'path': '/items', 'httpMethod': 'post', 'body': json.dumps({'name': 'x' * 100})})
+            self.assertEqual(413, out['statusCode'])
+
+        with self.subTest('Non-ASCII'):
+            body = json.dumps({'name': 'é' * 44}, ensure_ascii=False)
+            self.assertEqual(100, len(body.encode()))
+
+            out = self.handler({'path': '/items', 'httpMethod': 'post', 'body': body})
+            self.assertEqual(200, out['statusCode'])
+
+            out = self.handler({'path': '/items', 'httpMethod': 'post', 'body': body.replace('}', ' }')})
+            self.assertEqual(413, out['statusCode'])
+
+        with self.subTest('Base64'):
+            for size in [98, 99, 100, 101]:
+                event = {'path': '/items', 'httpMethod': 'post', 'body': b64encode(b'x' * size).decode()}
+                self.assertEqual(size, Request({**event, 'isBase64Encoded': True}).size)
+
+            self.assertEqual(413, self.handler({**event, 'isBase64Encoded': True})['statusCode'])
+
+        with self.subTest('Too deep'):
+            out = self.handler({'path': '/items', 'httpMethod': 'post', 'body': '{"name": [[["x"]]]}'})
+            self.assertEqual(400, out['statusCode'])
+            self.assertIn('nested deeper than 3', json.loads(out['body'])['error'])
+
+        with self.subTest('Unbalanced'):
+            out = self.handler({'path': '/items', 'httpMethod': 'post', 'body': '{"name": [["x"]}'})
+            self.assertEqual(400, out['statusCode'])
+            self.assertIn('malformed', json.loads(out['body'])['error'])
+
+        with self.subTest('Headers'):
+            headers = {f'X-Header-{i}': 'x' for i in range(6)}
+            out = self.handler({'path': '/items', 'httpMethod': 'post', 'body': '{"name": "x"}', 'headers': headers})
+            self.assertEqual(431, out['statusCode'])
+
+        with self.subTest('Missing route'):
+            out = self.handler({'path': '/nope', 'httpMethod': 'post', 'body': 'not json' * 100})
+            self.assertEqual(404, out['statusCode'])
+
+    def test_form(self):
+        def upload(parts: int, size: int) -> dict:
+            return self.handler({
+                'path': '/uploads',
+                'httpMethod': 'post',
+                'body': b64encode(multipart(parts, size)).decode(),
+                'isBase64Encoded': True
+            })
+
+        self.assertEqual({'size': 1000}, json.loads(upload(2, 1000)['body']))
+        self.assertEqual(413, upload(3, 10)['statusCode'])
+        self.assertEqual(413, upload(1, 1001)['statusCode'])
+
+        with self.assertRaises(PayloadTooLarge):
+            FormData(multipart(1, 100), max_file_size=99, chunk_size=16)
+
+    def test_asgi(self):
+        handler = register(AsgiHandler('Test API', 'meh', '0.1', limits=Limits(max_body_size=100)))
+        received = []
+
+        async def receive():
+            received.append(1)
+            return {'type': 'http.request', 'body': b'x' * 60, 'more_body': True}
+
+        def call(path: str) -> int:
+            sent = []
+
+            async def send(message):
+                sent.append(message)
+
+            received.clear()
+            scope = {'type': 'http', 'method': 'POST', 'path': path, 'query_string': b'', 'headers': []}
+            asyncio.run(handler.app(scope, receive, send))
+
+            return sent[0]['status']
+
+        self.assertEqual(404, call('/nope'))
+        self.assertEqual([], received)
+        self.assertEqual(413, call('/items'))
+        self.assertEqual(2, len(received))
@@ -0,0 +1,65 @@
+from unittest import TestCase
+from io import BytesIO
+import requests
+from restless.multipart import FormData
+
+
+def encode(files: dict = None, data: dict = None) -> bytes:
+    files = {**(files or {}), **{k: (None, v) for k, v in (data or {}).items()}}
+
+    return requests.Request(files=files, url='https://myapi', method='post').prepare().body
+
+
+class TestFormData(TestCase):
+    def test_parse(self):
+        payload = encode(
+            files={'file': ('test.dat', b'A\r\nB--C', 'application/octet-stream')},
+            data={'name': 'value', 'other': 'x\r\ny'}
+        )
+
+        for chunk_size in [1, 7, 64 * 1024]:
+            with self.subTest(chunk_size=chunk_size):
+                form = FormData(payload, chunk_size=chunk_size)
+
+                self.assertEqual({'file', 'name', 'other'}, set(form))
+                self.assertEqual('value', form['name'])
+                self.assertEqual('x\r\ny', form['other'])
+                self.assertEqual('test.dat', form['file'].name)
+                self.assertEqual('application/octet-stream', form['file'].content_type)
+                self.assertEqual(b'A\r\nB--C', form['file'].file.read())
+                self.assertEqual(b'A\r\nB--C', form['file'].data)
+
+    def test_preamble(self):
+        form = FormData(BytesIO(b'\r\n' + encode(data={'name': 'value'})), chunk_size=7)
+
+        self.assertEqual({'name': 'value'}, form)
+
+    def test_spill(self):
+        content = bytes(range(256)) * 1024
+        payload = encode(files={'small': ('s.bin', b'abc'), 'large': ('l.bin', content)})
+        form = FormData(BytesIO(payload), max_memory=1024)
+
+        self.assertFalse(form['small'].file._rolled)
+        self.assertTrue(form['large'].file._rolled)
+        self.assertEqual(content, form['large'].data)
+
+    def test_feed(self):
+        payload = encode(data={'name': 'value'})
+        boundary = payload[2:payload.index(b'\r\n')].decode()
+        form = FormData(boundary=boundary)
+
+        for i in range(0, len(payload), 5):
+            form.feed(payload[i:i + 5])
+
+        form.close()
+
+        self.assertEqual({'name': 'value'}, form)
+
+    def test_truncated(self):
+        payload = encode(data={'name': 'value', 'other': 'value'})
+
+        self.assertEqual({'name': 'value'}, FormData(payload[:-30]))
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            FormData(b'{"not": "multipart"}')
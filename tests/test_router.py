@@ -0,0 +1,145 @@
+from unittest import TestCase
+from restless import Handler
+from restless.errors import Missing
+from restless.interfaces.aws import Request, Response
+from restless.router import Router
+import random
+import string
+import gc
+import resource
+
+
+class TestRouter(TestCase):
+    def setUp(self) -> None:
+        self.router = Router()
+
+        for method, path in [
+            ('get', '/users/me'),
+            ('get', '/users/<user_id>'),
+            ('get', '/users/<user_id>/friends'),
+            ('get', '/users/me/settings'),
+            ('post', '/users/<user_id>'),
+            ('get', '/spec/swagger.<extension>'),
+            ('get', '/'),
+        ]:
+            self.router.add(path, method, (method, path))
+
+    def test_static(self):
+        self.assertEqual(
+            (('get', '/users/me'), {}),
+            self.router.match('/users/me', 'GET')
+        )
+
+    def test_parameter(self):
+        self.assertEqual(
+            (('get', '/users/<user_id>'), {'user_id': '12'}),
+            self.router.match('/users/12', 'get')
+        )
+
+    def test_backtracking(self):
+        for path, method, expected in [
+            ('/users/me/friends', 'get', (('get', '/users/<user_id>/friends'), {'user_id': 'me'})),
+            ('/users/me', 'post', (('post', '/users/<user_id>'), {'user_id': 'me'})),
+            ('/users/me/settings', 'get', (('get', '/users/me/settings'), {})),
+        ]:
+            with self.subTest(path):
+                self.assertEqual(expected, self.router.match(path, method))
+
+    def test_pattern(self):
+        self.assertEqual(
+            (('get', '/spec/swagger.<extension>'), {'extension': 'json'}),
+            self.router.match('/spec/swagger.json', 'get')
+        )
+
+    def test_root(self):
+        self.assertEqual(
+            (('get', '/'), {}),
+            self.router.match('/', 'get')
+        )
+
+    def test_missing(self):
+        for path, method in [
+            ('/users', 'get'),
+            ('/users/', 'get'),
+            ('/users/me/settings', 'post'),
+            ('/a/b/c/d/e/f', 'get'),
+            ('/spec/swagger.', 'get'),
+        ]:
+            with self.subTest(path):
+                self.assertEqual((None, None), self.router.match(path, method))
+
+    def test_duplicate(self):
+        self.assertRaises(AssertionError, self.router.add, '/users/<other>', 'get', None)
+
+    def test_recompile(self):
+        self.router.match('/users/me', 'get')
+        self.router.add('/users/<user_id>/photos', 'get', 'photos')
+
+        self.assertEqual(
+            ('photos', {'user_id': '1'}),
+            self.router.match('/users/1/photos', 'get')
+        )
+
+    def test_freeze(self):
+        self.router.freeze()
+
+        self.assertRaises(AssertionError, self.router.add, '/users/<user_id>/photos', 'get', None)
+        self.assertEqual(
+            (('get', '/users/me'), {}),
+            self.router.match('/users/me', 'get')
+        )
+
+
+def resident_memory() -> int:
+    try:
+        with open('/proc/self/statm') as statm:
+            return int(statm.read().split()[1]) * resource.getpagesize()
+    except OSError:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+class TestSoak(TestCase):
+    def test_random_paths(self):
+        handler = Handler(Request, Response, freeze_on_first_request=True)
+
+        for i in range(100):
+            @handler.handle('get', f'/resource{i}/<id>')
+            def endpoint(id: str) -> {200: dict}:
+                return {}
+
+        rand = random.Random(0)
+        alphabet = string.ascii_lowercase + string.digits
+
+        def segment() -> str:
+            return ''.join(rand.choices(alphabet, k=rand.randint(1, 8)))
+
+        # Paths as deep as the routes, so lookups walk the trie rather than stop at the depth check: most of them
+        # under a registered prefix, some under unknown ones and a few a segment too short or too long
+        paths = [
+            '/'.join([
+                '', f'resource{rand.randrange(100)}' if rand.random() < 0.8 else segment(),
+                *(segment() for _ in range(rand.choice([1, 1, 1, 1, 1, 1, 1, 1, 0, 2])))
+            ])
+            for _ in range(10_000)
+        ]
+
+        def send(count):
+            for i in range(count):
+                try:
+                    handler.select_handler(
+                        Request({'path': paths[i % len(paths)], 'httpMethod': 'get'}, use_camel_case=False)
+                    )
+                except Missing:
+                    pass
+
+        send(20_000)
+        gc.collect()
+        before = resident_memory()
+
+        send(100_000)
+        gc.collect()
+        after = resident_memory()
+
+        self.assertTrue(handler.router.frozen)
+        self.assertEqual(100, len(handler.router.routes))
+        self.assertLess(after - before, 2 * 1024 * 1024, f'Resident memory grew by {after - before} bytes')
@@ -0,0 +1,69 @@
+from unittest import TestCase
+from datetime import datetime
+from typing import List
+from restless import Handler
+from restless.interfaces.aws import Request, Response
+from restless.parameters import BodyParameter
+from restless.serializers import SERIALIZERS, get_serializer, JSON
+
+
+class Item(BodyParameter):
+    id: int
+    created: datetime
+    tags: List[str] = []
+
+
+class TestSerializers(TestCase):
+    def test_backends(self):
+        for name in SERIALIZERS:
+            with self.subTest(name):
+                try:
+                    serializer = get_serializer(name)
+                except ImportError:
+                    self.skipTest(f'{name} is not installed')
+
+                payload = {
+                    'item': Item(id=1, created=datetime(2020, 1, 1), tags=['a']),
+                    'records': (i for i in range(3)),
+                    'when': datetime(2020, 1, 1, 12)
+                }
+
+                self.assertEqual(
+                    {
+                        'item': {'id': 1, 'created': '2020-01-01T00:00:00', 'tags': ['a']},
+                        'records': [0, 1, 2],
+                        'when': '2020-01-01T12:00:00'
+                    },
+                    serializer.loads(serializer.dumps(payload))
+                )
+                self.assertEqual(
+                    [{'id': 0}, {'id': 1}],
+                    serializer.loads(''.join(serializer.iter_json(iter([{'id': 0}, {'id': 1}]))))
+                )
+                self.assertRaises(ValueError, serializer.loads, b'not json')
+
+    def test_default(self):
+        self.assertIs(JSON, get_serializer())
+        self.assertIs(JSON, get_serializer('json'))
+        self.assertIn(get_serializer('auto').name, SERIALIZERS)
+        self.assertRaises(AssertionError, get_serializer, 'yaml')
+
+    def test_handler(self):
+        try:
+            handler = Handler(Request, Response, serializer='orjson')
+        except ImportError:
+            self.skipTest('orjson is not installed')
+
+        @handler.handle('post', '/items')
+        def post_item(item: Item) -> {200: Item}:
+            return item
+
+        out = handler(
+            {
+                "path": "/items",
+                "httpMethod": 'post',
+                "body": '{"id": "1", "created": "2020-01-01T00:00:00"}'
+            }
+        )
+
+        self.assertEqual('{"id":1,"created":"2020-01-01T00:00:00","tags":[]}', out['body'])
@@ -5,16 +5,27 @@ from restless.parameters import PathParameter, QueryParameter, HeaderParameter,
     BinaryParameter, BodyParameter
 from datetime import datetime
 from typing import List, Optional
-from restless.openapi import make_spec
+from restless.openapi import make_spec, Formats
+from uuid import UUID
+import json
 from restless.security import ApiKeyAuth
 import yaml
 from deepdiff import DeepDiff
 import os
+from tempfile import TemporaryDirectory
+from pydantic import create_model
 
 os.chdir(os.path.dirname(__file__))
 
 
 class TestSpec(TestCase):
+    def setUp(self) -> None:
+        self.directory = TemporaryDirectory()
+        self.file_name = os.path.join(self.directory.name, 'new_aws.yaml')
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
     def testAWS(self):
         handler = Handler(Request, Response)
 
@@ -31,7 +42,7 @@ class TestSpec(TestCase):
 
         class User(BodyParameter):
             id: int
-            name = 'John Doe'
+            name: str = 'John Doe'
             signup_ts: Optional[datetime] = None
             friends: List[int] = []
 
@@ -76,10 +87,11 @@ class TestSpec(TestCase):
                     ApiKeyAuth(ApiKeyAuth.In.query, name='token')
                 ],
                 default_security=['Authorization'],
-                file_name='new_aws.yaml'
+                file_name=self.file_name,
+                data_format=Formats.yaml
             )
 
-            with open('spec.yaml') as fixture, open('new_aws.yaml') as test:
+            with open('spec.yaml') as fixture, open(self.file_name) as test:
                 difference = DeepDiff(
                     yaml.load(fixture, Loader=yaml.SafeLoader),
                     yaml.load(test, Loader=yaml.SafeLoader)
@@ -104,10 +116,11 @@ class TestSpec(TestCase):
                     ApiKeyAuth(ApiKeyAuth.In.query, name='token')
                 ],
                 default_security=['Authorization'],
-                file_name='new_aws.yaml'
+                file_name=self.file_name,
+                data_format=Formats.yaml
             )
 
-            with open('camel_spec.yaml') as fixture, open('new_aws.yaml') as test:
+            with open('camel_spec.yaml') as fixture, open(self.file_name) as test:
                 difference = DeepDiff(
                     yaml.load(fixture, Loader=yaml.SafeLoader),
                     yaml.load(test, Loader=yaml.SafeLoader)
@@ -118,3 +131,123 @@ class TestSpec(TestCase):
                 difference,
                 difference
             )
+
+    def testTypedParameters(self):
+        handler = Handler(Request, Response)
+
+        @handler.handle('get', '/some/path/<item_id>')
+        def get_typed(
+                item_id: PathParameter[UUID], ids: QueryParameter[List[int]], since: QueryParameter[datetime] = None
+        ) -> {200: dict}:
+            return {}
+
+        spec = json.loads(
+            make_spec('The API', 'Some description', '0.0.1', handler, file_name=None, data_format=Formats.json)
+        )
+
+        self.assertEqual(
+            {
+                'item_id': {'type': 'string', 'format': 'uuid'},
+                'ids': {'type': 'array', 'items': {'type': 'integer'}},
+                'since': {'type': 'string', 'format': 'date-time'}
+            },
+            {
+                param['name']: param['schema']
+                for param in spec['paths']['/some/path/{item_id}']['get']['parameters']
+            }
+        )
+
+    def testNestedModels(self):
+        class Address(BodyParameter):
+            street_name: str
+
+        class Customer(BodyParameter):
+            address: Address
+            previous_addresses: List[Address] = []
+
+        handler = Handler(Request, Response)
+
+        @handler.handle('post', '/customers')
+        def post_customer(customer: Customer) -> {200: Customer}:
+            return customer
+
+        @handler.handle('put', '/customers/<customer_id>')
+        def put_customer(customer_id: PathParameter, customer: Customer) -> {200: Customer}:
+            return customer
+
+        handler.use_camel_case = True
+        spec = json.loads(
+            make_spec('The API', 'Some description', '0.0.1', handler, file_name=None, data_format=Formats.json)
+        )
+        schemas = spec['components']['schemas']
+
+        self.assertEqual({'Error', 'Customer', 'Address'}, set(schemas))
+        self.assertEqual({'$ref': '#/components/schemas/Address'}, schemas['Customer']['properties']['address'])
+        self.assertEqual(
+            {'$ref': '#/components/schemas/Address'}, schemas['Customer']['properties']['previousAddresses']['items']
+        )
+        self.assertEqual(['streetName'], list(schemas['Address']['properties']))
+        self.assertNotIn('definitions', schemas['Customer'])
+
+        operation = spec['paths']['/customers/{customer_id}']['put']
+
+        self.assertEqual({'$ref': '#/components/responses/NotFound'}, operation['responses']['404'])
+        self.assertEqual(
+            {'$ref': '#/components/schemas/Customer'},
+            operation['requestBody']['content']['application/json']['schema']
+        )
+        self.assertEqual({'BadRequest', 'Unauthorized', 'Forbidden', 'NotFound'}, set(spec['components']['responses']))
+
+    def testModelLists(self):
+        class Record(BodyParameter):
+            record_id: int
+
+        handler = Handler(Request, Response)
+
+        @handler.handle('post', '/records')
+        def post_records(records: List[Record]) -> {200: [Record]}:
+            return records
+
+        spec = json.loads(
+            make_spec('The API', 'Some description', '0.0.1', handler, file_name=None, data_format=Formats.json)
+        )
+        operation = spec['paths']['/records']['post']
+        array = {'type': 'array', 'items': {'$ref': '#/components/schemas/Record'}}
+
+        self.assertEqual(array, operation['requestBody']['content']['application/json']['schema'])
+        self.assertEqual(array, operation['responses']['200']['content']['application/json']['schema'])
+        self.assertEqual([], operation['parameters'])
+
+    def testSameModelNames(self):
+        order_item = create_model('Item', __base__=BodyParameter, __module__='orders', sku=(str, ...))
+        user_item = create_model('Item', __base__=BodyParameter, __module__='users', label=(str, ...))
+        order = create_model('Order', __base__=BodyParameter, items=(List[order_item], ...))
+
+        handler = Handler(Request, Response)
+
+        @handler.handle('post', '/users/items')
+        def post_user_item(item: user_item) -> {200: user_item}:
+            return item
+
+        @handler.handle('post', '/orders')
+        def post_order(order: order) -> {200: order}:
+            return order
+
+        @handler.handle('post', '/orders/items')
+        def post_order_item(item: order_item) -> {200: order_item}:
+            return item
+
+        spec = json.loads(
+            make_spec('The API', 'Some description', '0.0.1', handler, file_name=None, data_format=Formats.json)
+        )
+        schemas = spec['components']['schemas']
+
+        def body(path: str) -> dict:
+            return spec['paths'][path]['post']['requestBody']['content']['application/json']['schema']
+
+        self.assertEqual({'Error', 'Item', 'Item2', 'Order'}, set(schemas))
+        self.assertEqual(['label'], list(schemas['Item']['properties']))
+        self.assertEqual(['sku'], list(schemas['Item2']['properties']))
+        self.assertEqual({'$ref': '#/components/schemas/Item'}, body('/users/items'))
+        self.assertEqual({'$ref': '#/components/schemas/Item2'}, body('/orders/items'))
+        self.assertEqual({'$ref': '#/components/schemas/Item2'}, schemas['Order']['properties']['items']['items'])
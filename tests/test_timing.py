@@ -0,0 +1,125 @@
+from unittest import TestCase
+from io import StringIO
+import asyncio
+import json
+from restless import Handler
+from restless.interfaces.asgi import AsgiHandler
+from restless.interfaces.aws import EmbeddedMetrics, Request, Response
+from restless.interfaces.flask_app import FlaskHandler
+from restless.parameters import BodyParameter, PathParameter
+from restless.timing import STAGES
+
+
+class Item(BodyParameter):
+    name: str
+
+
+def register(handler: Handler) -> Handler:
+    @handler.handle('post', '/items/<item_id>')
+    def post_item(item_id: PathParameter[int], item: Item) -> {200: Item}:
+        return item
+
+    return handler
+
+
+class TestTiming(TestCase):
+    def setUp(self) -> None:
+        self.timings = []
+        self.handler = register(Handler(Request, Response, timing_hooks=[self.timings.append]))
+
+    def test_stages(self):
+        out = self.handler({'path': '/items/1', 'httpMethod': 'post', 'body': '{"name": "x"}'})
+
+        self.assertEqual(200, out['statusCode'])
+        self.assertNotIn('Server-Timing', out['headers'])
+
+        timings, = self.timings
+
+        self.assertEqual(list(STAGES), list(timings.stages))
+        self.assertTrue(all(duration >= 0 for duration in timings.stages.values()))
+        self.assertAlmostEqual(sum(timings.stages.values()), timings.total)
+        self.assertEqual('POST /items/{item_id}', timings.route)
+        self.assertEqual(200, timings.status)
+        self.assertEqual(len('{"name": "x"}'), timings.request_size)
+        self.assertEqual(len(out['body']), timings.response_size)
+
+    def test_response_size(self):
+        self.assertEqual(20, Response('é' * 10).size)
+
+        for size in [98, 99, 100, 101]:
+            self.assertEqual(size, Response(b'x' * size).size)
+
+    def test_errors(self):
+        with self.subTest('Missing route'):
+            self.handler({'path': '/nope', 'httpMethod': 'get'})
+
+            self.assertEqual(['request', 'response'], list(self.timings[-1].stages))
+            self.assertIsNone(self.timings[-1].route)
+            self.assertEqual(404, self.timings[-1].status)
+
+        with self.subTest('Bad parameter'):
+            self.handler({'path': '/items/x', 'httpMethod': 'post', 'body': '{"name": "x"}'})
+
+            self.assertEqual(['request', 'route', 'response'], list(self.timings[-1].stages))
+            self.assertEqual(400, self.timings[-1].status)
+
+    def test_disabled(self):
+        handler = register(Handler(Request, Response))
+
+        self.assertIsNone(handler.start_timings())
+        out = handler({'path': '/items/1', 'httpMethod': 'post', 'body': '{"name": "x"}'})
+
+        self.assertEqual(200, out['statusCode'])
+        self.assertNotIn('Server-Timing', out['headers'])
+
+    def test_server_timing(self):
+        with self.subTest('AWS'):
+            self.handler.server_timing = True
+            out = self.handler({'path': '/items/1', 'httpMethod': 'post', 'body': '{"name": "x"}'})
+
+            self.assertEqual(
+                [*STAGES, 'total'], [entry.split(';')[0] for entry in out['headers']['Server-Timing'].split(', ')]
+            )
+
+        with self.subTest('Flask'):
+            handler = FlaskHandler('Test API', 'meh', '0.1', server_timing=True)
+            out = handler.app.test_client().get('/nope')
+            self.assertEqual(404, out.status_code)
+            self.assertTrue(out.headers['Server-Timing'].startswith('request;dur='))
+
+        with self.subTest('ASGI'):
+            handler = register(AsgiHandler('Test API', 'meh', '0.1', server_timing=True))
+            sent = []
+
+            async def receive():
+                return {'type': 'http.request', 'body': b'{"name": "x"}', 'more_body': False}
+
+            async def send(message):
+                sent.append(message)
+
+            scope = {'type': 'http', 'method': 'POST', 'path': '/items/1', 'query_string': b'',
+                     'headers': [(b'content-type', b'application/json')]}
+            asyncio.run(handler.app(scope, receive, send))
+
+            self.assertEqual(200, sent[0]['status'])
+            self.assertIn(b'server-timing', dict(sent[0]['headers']))
+
+    def test_embedded_metrics(self):
+        stream = StringIO()
+        self.handler.timing_hooks.append(EmbeddedMetrics('orders', stream=stream))
+
+        self.handler({'path': '/items/1', 'httpMethod': 'post', 'body': '{"name": "x"}'})
+        document = json.loads(stream.getvalue())
+        directive, = document['_aws']['CloudWatchMetrics']
+
+        self.assertEqual('orders', directive['Namespace'])
+        self.assertEqual([['Route']], directive['Dimensions'])
+        self.assertEqual('POST /items/{item_id}', document['Route'])
+        self.assertEqual(200, document['Status'])
+        units = {stage: 'Milliseconds' for stage in [*STAGES, 'total']}
+
+        self.assertEqual(
+            {**units, 'request_size': 'Bytes', 'response_size': 'Bytes'},
+            {metric['Name']: metric['Unit'] for metric in directive['Metrics']}
+        )
+        self.assertTrue(all(isinstance(document[metric['Name']], (int, float)) for metric in directive['Metrics']))
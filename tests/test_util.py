@@ -1,5 +1,11 @@
-from restless.util import camel_to_snake, snake_to_camel
+from restless.util import camel_to_snake, snake_to_camel, KEY_CACHE_SIZE, _cached_to_snake, from_camel, camel_dict, \
+    MODEL_CACHE_SIZE, model_aliases
+from restless.parameters import BodyParameter
 from unittest import TestCase
+from typing import List, Optional
+from datetime import datetime
+import uuid
+from pydantic import create_model
 
 
 class TestCases(TestCase):
@@ -42,3 +48,84 @@ class TestCases(TestCase):
                     case[0],
                     snake_to_camel(case[1])
                 )
+
+    def test_models_and_tuples(self):
+        class Child(BodyParameter):
+            some_value: int
+
+        self.assertEqual(
+            {
+                'childList': [{'someValue': 1}],
+                'firstChild': {'someValue': 2},
+                'pairs': [['a_b', {'keyName': 1}]]
+            },
+            snake_to_camel(
+                {
+                    'child_list': [Child(some_value=1)],
+                    'first_child': Child(some_value=2),
+                    'pairs': (('a_b', {'key_name': 1}),)
+                }
+            )
+        )
+
+    def test_deep_nesting(self):
+        document = {}
+        target = document
+
+        for _ in range(5000):
+            target['nextLevel'] = {}
+            target = target['nextLevel']
+
+        converted = camel_to_snake(document)
+
+        for _ in range(5000):
+            converted = converted['next_level']
+
+        self.assertEqual({}, converted)
+
+    def test_bounded_cache(self):
+        for _ in range(KEY_CACHE_SIZE * 2):
+            camel_to_snake({uuid.uuid4().hex[:16]: 1, 'someKey': 2, 'x' * 1000: 3})
+
+        self.assertLessEqual(_cached_to_snake.cache_info().currsize, KEY_CACHE_SIZE)
+
+        for i in range(MODEL_CACHE_SIZE + 10):
+            snake_to_camel(create_model(f'Model{i}', __base__=BodyParameter, field_name=(int, 1))())
+
+        self.assertLessEqual(model_aliases.cache_info().currsize, MODEL_CACHE_SIZE)
+
+    def test_aliases(self):
+        class Address(BodyParameter):
+            street_name: str
+
+        class User(BodyParameter):
+            user_id: int
+            home_address: Address
+            past_addresses: List[Address] = []
+            signup_ts: Optional[datetime] = None
+            extra_data: dict = {}
+
+        body = {
+            'userId': 1,
+            'homeAddress': {'streetName': 'Main'},
+            'pastAddresses': [{'streetName': 'Old'}],
+            'signupTs': '2020-01-01T00:00:00',
+            'extraData': {'someKey': 'someValue'}
+        }
+
+        user = User(**from_camel(User, body))
+
+        self.assertEqual(
+            User(
+                user_id=1,
+                home_address=Address(street_name='Main'),
+                past_addresses=[Address(street_name='Old')],
+                signup_ts=datetime(2020, 1, 1),
+                extra_data={'some_key': 'someValue'}
+            ),
+            user
+        )
+        self.assertEqual(
+            dict(body, signupTs=datetime(2020, 1, 1)),
+            camel_dict(user)
+        )